@@ -0,0 +1,107 @@
+import tracemalloc
+from multiprocessing import Process
+
+import numpy
+import pytest
+import torch
+
+import syft
+from syft import TorchHook
+from syft import serde
+
+TENSOR_STRATEGIES = {
+    "torch": (serde.torch_tensor_serializer, serde.torch_tensor_deserializer),
+    "numpy": (serde.numpy_tensor_serializer, serde.numpy_tensor_deserializer),
+    "numpy_mmap": (serde.numpy_tensor_serializer, serde.numpy_tensor_mmap_deserializer),
+    "raw": (serde.raw_tensor_serializer, serde.raw_tensor_deserializer),
+}
+
+COMPRESSION_SCHEMES = {
+    "none": serde.apply_no_compression,
+    "lz4": serde.apply_lz4_compression,
+    "zstd": serde.apply_zstd_compression,
+    "adaptive": serde.CompressionPolicy(),
+}
+
+
+@pytest.fixture()
+def start_proc():
+    """ helper function for spinning up a websocket participant """
+
+    def _start_proc(participant, kwargs):
+        def target():
+            server = participant(**kwargs)
+            server.start()
+
+        p = Process(target=target)
+        p.start()
+        return p
+
+    return _start_proc
+
+
+@pytest.fixture(scope="session", autouse=True)
+def hook():
+    hook = TorchHook(torch)
+    return hook
+
+
+@pytest.fixture()
+def workers(hook):
+    alice = syft.VirtualWorker(id="alice", hook=hook, is_client_worker=False)
+    bob = syft.VirtualWorker(id="bob", hook=hook, is_client_worker=False)
+    james = syft.VirtualWorker(id="james", hook=hook, is_client_worker=False)
+
+    yield {"me": hook.local_worker, "alice": alice, "bob": bob, "james": james}
+
+    alice.remove_worker_from_local_worker_registry()
+    bob.remove_worker_from_local_worker_registry()
+    james.remove_worker_from_local_worker_registry()
+
+
+@pytest.fixture(params=list(TENSOR_STRATEGIES))
+def tensor_strategy(request):
+    """Selects each tensor serialization strategy in turn"""
+    serde._serialize_tensor, serde._deserialize_tensor = TENSOR_STRATEGIES[request.param]
+    yield request.param
+    serde._serialize_tensor = serde.torch_tensor_serializer
+    serde._deserialize_tensor = serde.torch_tensor_deserializer
+
+
+@pytest.fixture(params=list(COMPRESSION_SCHEMES))
+def compression_scheme(request):
+    """Selects each compression scheme in turn"""
+    serde._apply_compress_scheme = COMPRESSION_SCHEMES[request.param]
+    yield request.param
+    serde._apply_compress_scheme = serde.apply_lz4_compression
+
+
+@pytest.fixture()
+def measure(benchmark):
+    """Benchmarks a function and adds to the report, in extra_info:
+    - the 50th, 95th and 99th percentiles of its latency (in seconds)
+    - its throughput (in bytes per second) if nbytes is given
+    - the peak of the memory allocated by python during one call (in bytes)
+    """
+
+    def _measure(function, *args, nbytes: int = None, **kwargs):
+        tracemalloc.start()
+        function(*args, **kwargs)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        benchmark.extra_info["peak_memory"] = peak
+
+        result = benchmark(function, *args, **kwargs)
+
+        # stats are not collected when benchmarks are disabled
+        if benchmark.stats is not None:
+            timings = benchmark.stats.stats.data
+            for percentile in (50, 95, 99):
+                benchmark.extra_info[f"p{percentile}"] = numpy.percentile(timings, percentile)
+            if nbytes is not None:
+                benchmark.extra_info["bytes"] = nbytes
+                benchmark.extra_info["throughput"] = nbytes / benchmark.stats.stats.median
+
+        return result
+
+    return _measure
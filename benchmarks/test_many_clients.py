@@ -0,0 +1,57 @@
+"""Load test of a WebsocketServerWorker serving many connected clients.
+
+The server processes the messages one at a time, whatever its number of
+threads: this measures how its throughput is shared between the clients, each
+with its own connection.
+
+Run with:
+    pytest benchmarks/test_many_clients.py
+"""
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import torch
+
+from syft.workers import WebsocketClientWorker
+from syft.workers import WebsocketServerWorker
+
+NB_CLIENTS = [1, 8, 32]
+NB_ROUND_TRIPS = 20
+
+
+@pytest.mark.parametrize("nb_clients", NB_CLIENTS)
+def test_many_clients(measure, hook, start_proc, nb_clients):
+    port = 8796 + NB_CLIENTS.index(nb_clients)
+    kwargs = {"id": f"bench_clients_{port}", "host": "localhost", "port": port, "hook": hook}
+    server = start_proc(WebsocketServerWorker, kwargs)
+    time.sleep(0.5)
+
+    # each client has its own id, hence its own connection (a client with the
+    # id of an existing one would share its connection). The commands of such
+    # clients can't name the server in their pointers, so they only send and get
+    clients = [
+        WebsocketClientWorker(**dict(kwargs, id=f"bench_clients_{port}_{i}"))
+        for i in range(nb_clients)
+    ]
+    assert len({id(client.ws) for client in clients}) == nb_clients
+    tensors = [torch.randn(256, 256) for _ in clients]
+
+    def round_trips(client, tensor):
+        for _ in range(NB_ROUND_TRIPS):
+            result = tensor.send(client).get()
+        return torch.equal(result, tensor)
+
+    def load():
+        with ThreadPoolExecutor(max_workers=nb_clients) as executor:
+            return list(executor.map(round_trips, clients, tensors))
+
+    results = measure(load)
+    assert all(results)
+
+    for client in clients:
+        client.ws.shutdown()
+    time.sleep(0.1)
+    for client in clients:
+        client.remove_worker_from_local_worker_registry()
+    server.terminate()
@@ -0,0 +1,72 @@
+"""Latency and throughput of sending a tensor to a worker and getting it back,
+with a VirtualWorker and with a local WebsocketServerWorker.
+
+Run with:
+    pytest benchmarks/test_round_trips.py
+"""
+import time
+
+import pytest
+import torch
+
+from syft.workers import WebsocketClientWorker
+from syft.workers import WebsocketServerWorker
+
+SIZES = {"command": (3,), "weights": (1024, 1024)}
+
+
+def _round_trip(tensor, worker):
+    return tensor.send(worker).get()
+
+
+@pytest.fixture()
+def websocket_worker(hook, start_proc):
+    kwargs = {"id": "bench_round_trip", "host": "localhost", "port": 8780, "hook": hook}
+    server = start_proc(WebsocketServerWorker, kwargs)
+    time.sleep(0.5)
+
+    worker = WebsocketClientWorker(**kwargs)
+    yield worker
+
+    worker.ws.shutdown()
+    time.sleep(0.1)
+    worker.remove_worker_from_local_worker_registry()
+    server.terminate()
+
+
+@pytest.mark.parametrize("out_of_band", [False, True], ids=["inline", "out_of_band"])
+@pytest.mark.parametrize("size", list(SIZES))
+def test_virtual_worker_round_trip(measure, workers, size, out_of_band):
+    bob = workers["bob"]
+    bob.out_of_band = out_of_band
+    tensor = torch.randn(*SIZES[size])
+
+    result = measure(_round_trip, tensor, bob, nbytes=2 * tensor.numel() * tensor.element_size())
+    assert torch.equal(result, tensor)
+
+
+@pytest.mark.parametrize("out_of_band", [False, True], ids=["inline", "out_of_band"])
+@pytest.mark.parametrize("size", list(SIZES))
+def test_websocket_worker_round_trip(measure, websocket_worker, size, out_of_band):
+    websocket_worker.out_of_band = out_of_band
+    tensor = torch.randn(*SIZES[size])
+
+    result = measure(
+        _round_trip, tensor, websocket_worker, nbytes=2 * tensor.numel() * tensor.element_size()
+    )
+    assert torch.equal(result, tensor)
+
+
+@pytest.mark.parametrize("pipelining", [False, True], ids=["blocking", "pipelined"])
+def test_websocket_worker_command_chain(measure, websocket_worker, pipelining):
+    websocket_worker.pipelining = pipelining
+    x = torch.randn(*SIZES["command"]).send(websocket_worker)
+
+    def chain():
+        y = x
+        for _ in range(20):
+            y = (y + 1) * 2 - x
+        return y.get()
+
+    result = measure(chain)
+    assert result.shape == SIZES["command"]
@@ -0,0 +1,53 @@
+"""Cost of serializing the messages exchanged by workers: responses made of
+pointers, plans and additive shared tensors.
+
+Run with:
+    pytest benchmarks/test_serde_messages.py
+"""
+import pytest
+import torch
+
+import syft as sy
+
+
+@pytest.fixture()
+def search_response(workers):
+    bob = workers["bob"]
+    for i in range(1000):
+        bob.set_obj(torch.tensor([i]).tag("#data"))
+    return bob.search("#data")
+
+
+@pytest.fixture()
+def plan(hook):
+    hook.local_worker.is_client_worker = False
+
+    @sy.func2plan
+    def plan_ops(data):
+        for _ in range(50):
+            data = (data + 1) * 2 - data.abs()
+        return data
+
+    plan_ops(torch.tensor([-1.0, 2.0, 3.0]))
+    hook.local_worker.is_client_worker = True
+    return plan_ops
+
+
+@pytest.fixture()
+def shared_tensor(workers):
+    alice, bob, james = workers["alice"], workers["bob"], workers["james"]
+    x = torch.randn(64, 64).fix_prec().share(alice, bob, crypto_provider=james)
+    # the AdditiveSharingTensor under the wrapper and the FixedPrecisionTensor
+    return x.child.child.child
+
+
+@pytest.mark.parametrize("name", ["search_response", "plan", "shared_tensor"])
+def test_serialize_message(measure, request, name):
+    message = request.getfixturevalue(name)
+    measure(sy.serde.serialize, message)
+
+
+@pytest.mark.parametrize("name", ["search_response", "plan", "shared_tensor"])
+def test_deserialize_message(measure, request, name):
+    message = sy.serde.serialize(request.getfixturevalue(name))
+    measure(sy.serde.deserialize, message, nbytes=len(message))
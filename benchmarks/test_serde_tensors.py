@@ -0,0 +1,79 @@
+"""Cost of serializing tensors with each tensor strategy and compression scheme.
+
+Run with:
+    pytest benchmarks/test_serde_tensors.py
+"""
+import pytest
+import torch
+
+import syft as sy
+
+SIZES = {
+    # typical argument of a remote command
+    "command": (3,),
+    "activations": (64, 256),
+    # a layer of weights of a mid-sized model
+    "weights": (1024, 1024),
+}
+
+DTYPES = [torch.float32, torch.float64, torch.int64]
+
+# tensors with a different compressibility
+PAYLOADS = {
+    "weights": lambda: torch.randn(1024, 1024),
+    "shares": lambda: torch.randint(-2 ** 62, 2 ** 62, (512, 1024)),
+    "sparse": lambda: torch.zeros(1024, 1024),
+}
+
+
+def _make_tensor(size, dtype):
+    if dtype.is_floating_point:
+        return torch.randn(*SIZES[size], dtype=dtype)
+    return torch.randint(-1000, 1000, SIZES[size], dtype=dtype)
+
+
+def _nbytes(tensor):
+    return tensor.numel() * tensor.element_size()
+
+
+@pytest.mark.parametrize("dtype", DTYPES, ids=str)
+@pytest.mark.parametrize("size", list(SIZES))
+def test_serialize_tensor(measure, tensor_strategy, size, dtype):
+    tensor = _make_tensor(size, dtype)
+    measure(sy.serde.serialize, tensor, nbytes=_nbytes(tensor))
+
+
+@pytest.mark.parametrize("dtype", DTYPES, ids=str)
+@pytest.mark.parametrize("size", list(SIZES))
+def test_deserialize_tensor(measure, tensor_strategy, size, dtype):
+    tensor = _make_tensor(size, dtype)
+    message = sy.serde.serialize(tensor)
+    result = measure(sy.serde.deserialize, message, nbytes=_nbytes(tensor))
+    assert torch.equal(result, tensor)
+
+
+@pytest.mark.parametrize("payload", list(PAYLOADS))
+def test_compress_tensor(benchmark, measure, compression_scheme, payload):
+    tensor = PAYLOADS[payload]()
+    message = measure(sy.serde.serialize, tensor, nbytes=_nbytes(tensor))
+    benchmark.extra_info["compressed_bytes"] = len(message)
+
+
+@pytest.mark.parametrize("payload", list(PAYLOADS))
+def test_decompress_tensor(measure, compression_scheme, payload):
+    tensor = PAYLOADS[payload]()
+    message = sy.serde.serialize(tensor)
+    result = measure(sy.serde.deserialize, message, nbytes=_nbytes(tensor))
+    assert torch.equal(result, tensor)
+
+
+def test_serialize_out_of_band(measure):
+    tensor = torch.randn(*SIZES["weights"])
+    measure(sy.serde.serialize_out_of_band, tensor, nbytes=_nbytes(tensor))
+
+
+def test_deserialize_out_of_band(measure):
+    tensor = torch.randn(*SIZES["weights"])
+    message = b"".join(sy.serde.serialize_out_of_band(tensor))
+    result = measure(sy.serde.deserialize, message, nbytes=_nbytes(tensor))
+    assert torch.equal(result, tensor)
@@ -0,0 +1,56 @@
+"""Cost of simplifying and detailing deeply nested messages.
+
+Run with:
+    pytest benchmarks/test_simplify_detail.py
+"""
+import msgpack
+import pytest
+import torch
+
+import syft as sy
+from syft import serde
+
+
+@pytest.fixture()
+def readable_plan(hook):
+    hook.local_worker.is_client_worker = False
+
+    @sy.func2plan
+    def plan_ops(data):
+        for _ in range(50):
+            data = (data + 1) * 2 - data.abs()
+        return data
+
+    plan_ops(torch.tensor([-1.0, 2.0, 3.0]))
+    hook.local_worker.is_client_worker = True
+    return plan_ops.readable_plan
+
+
+@pytest.fixture()
+def search_response(workers):
+    bob = workers["bob"]
+    for i in range(1000):
+        bob.set_obj(torch.tensor([i]).tag("#data"))
+    return bob.search("#data")
+
+
+def _round_trip(obj):
+    return msgpack.loads(msgpack.dumps(serde._simplify(obj)))
+
+
+def test_simplify_readable_plan(measure, readable_plan):
+    measure(serde._simplify, readable_plan)
+
+
+def test_detail_readable_plan(measure, readable_plan):
+    simple_objects = _round_trip(readable_plan)
+    measure(serde._detail, sy.local_worker, simple_objects)
+
+
+def test_simplify_search_response(measure, search_response):
+    measure(serde._simplify, search_response)
+
+
+def test_detail_search_response(measure, search_response):
+    simple_objects = _round_trip(search_response)
+    measure(serde._detail, sy.local_worker, simple_objects)
@@ -0,0 +1,63 @@
+"""Latency of small commands and throughput of tensor round trips over a
+SocketServerWorker, compared to a WebsocketServerWorker.
+
+Run with:
+    pytest benchmarks/test_socket_transport.py
+"""
+import time
+
+import pytest
+import torch
+
+import syft as sy
+from syft.workers import SocketClientWorker
+from syft.workers import SocketServerWorker
+from syft.workers import WebsocketClientWorker
+from syft.workers import WebsocketServerWorker
+
+TRANSPORTS = {
+    "websocket": (WebsocketServerWorker, WebsocketClientWorker),
+    "socket": (SocketServerWorker, SocketClientWorker),
+}
+
+# number of float32 elements of the payload tensors
+SIZES = [2 ** 16, 2 ** 22]
+
+
+@pytest.fixture(params=list(TRANSPORTS))
+def worker(request, hook, start_proc):
+    """Starts a server of each transport in turn and yields a client connected to it"""
+    server_type, client_type = TRANSPORTS[request.param]
+    port = 8802 + list(TRANSPORTS).index(request.param)
+    kwargs = {"id": f"bench_transport_{port}", "host": "localhost", "port": port, "hook": hook}
+    server = start_proc(server_type, kwargs)
+    time.sleep(0.5)
+
+    client = client_type(**kwargs)
+    yield client
+
+    if isinstance(client, WebsocketClientWorker):
+        client.ws.shutdown()
+    else:
+        client.close()
+    time.sleep(0.1)
+    client.remove_worker_from_local_worker_registry()
+    server.terminate()
+
+
+def test_small_command_latency(measure, worker):
+    ptr = torch.tensor([1.0, 2.0]).send(worker)
+
+    result = measure(ptr.__add__, ptr)
+    assert result.location is worker
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_tensor_throughput(measure, worker, size):
+    tensor = torch.randn(size)
+
+    def round_trip():
+        return tensor.send(worker).get()
+
+    result = measure(round_trip, nbytes=2 * len(sy.serde.serialize(tensor)))
+    assert torch.equal(result, tensor)
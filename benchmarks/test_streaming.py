@@ -0,0 +1,39 @@
+"""Peak memory of serialize versus serialize_stream for a large tensor.
+
+Run with:
+    pytest benchmarks/test_streaming.py
+"""
+import pytest
+import torch
+
+import syft as sy
+
+CHUNK_SIZE = 2 ** 20
+
+
+@pytest.fixture(scope="module")
+def large_tensor():
+    # 64 MB of float32
+    return torch.randn(16 * 2 ** 20)
+
+
+def _serialize_deserialize(tensor):
+    return sy.serde.deserialize(sy.serde.serialize(tensor))
+
+
+def _stream_serialize_deserialize(tensor):
+    stream = sy.serde.StreamDeserializer()
+    for chunk in sy.serde.serialize_stream(tensor, chunk_size=CHUNK_SIZE):
+        stream.feed(chunk)
+    return stream.result()
+
+
+@pytest.mark.parametrize(
+    "round_trip",
+    [_serialize_deserialize, _stream_serialize_deserialize],
+    ids=["serialize", "serialize_stream"],
+)
+def test_round_trip(measure, large_tensor, round_trip):
+    nbytes = large_tensor.numel() * large_tensor.element_size()
+    result = measure(round_trip, large_tensor, nbytes=nbytes)
+    assert torch.equal(result, large_tensor)
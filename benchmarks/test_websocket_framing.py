@@ -0,0 +1,55 @@
+"""Throughput of the websocket framings: hex-encoded text frames vs binary frames.
+
+Run with:
+    pytest benchmarks/test_websocket_framing.py
+"""
+import binascii
+import time
+
+import pytest
+import torch
+
+import syft as sy
+from syft.workers import WebsocketClientWorker
+from syft.workers import WebsocketServerWorker
+
+# number of float32 elements of the payload tensors
+SIZES = [2 ** 10, 2 ** 16, 2 ** 20]
+
+
+def _hex_encode_decode(message: bin) -> bin:
+    """What both peers do to a message with hex framing."""
+    frame = str(binascii.hexlify(message))
+    return binascii.unhexlify(frame[2:-1])
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_hex_framing_encoding(measure, size):
+    message = sy.serde.serialize(torch.randn(size))
+    result = measure(_hex_encode_decode, message, nbytes=len(message))
+    assert result == message
+
+
+@pytest.mark.parametrize("binary_framing", [False, True], ids=["hex", "binary"])
+@pytest.mark.parametrize("size", SIZES)
+def test_websocket_round_trip(measure, hook, start_proc, size, binary_framing):
+    port = 8790 + SIZES.index(size) * 2 + int(binary_framing)
+    kwargs = {"id": f"bench_ws_{port}", "host": "localhost", "port": port, "hook": hook}
+    server = start_proc(WebsocketServerWorker, kwargs)
+    time.sleep(0.5)
+
+    worker = WebsocketClientWorker(binary_framing=binary_framing, **kwargs)
+    assert worker.binary_framing == binary_framing
+
+    tensor = torch.randn(size)
+
+    def round_trip():
+        return tensor.send(worker).get()
+
+    result = measure(round_trip, nbytes=2 * len(sy.serde.serialize(tensor)))
+    assert (result == tensor).all()
+
+    worker.ws.shutdown()
+    time.sleep(0.1)
+    worker.remove_worker_from_local_worker_registry()
+    server.terminate()
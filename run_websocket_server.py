@@ -29,6 +29,13 @@ parser.add_argument("--host", type=str, default="localhost", help="host for the
 parser.add_argument(
     "--id", type=str, help="name (id) of the websocket server worker, e.g. --id alice"
 )
+parser.add_argument(
+    "--processes",
+    type=int,
+    default=1,
+    help="number of server processes sharing the port (using SO_REUSEPORT), e.g. --processes 4. "
+    "Clients whose connection drops can't reconnect to the process holding their objects.",
+)
 parser.add_argument(
     "--verbose",
     "-v",
@@ -44,5 +51,6 @@ kwargs = {
     "port": args.port,
     "hook": hook,
     "verbose": args.verbose,
+    "reuse_port": args.processes > 1,
 }
-server = start_proc(WebsocketServerWorker, kwargs)
+servers = [start_proc(WebsocketServerWorker, kwargs) for _ in range(args.processes)]
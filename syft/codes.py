@@ -8,6 +8,9 @@ class MSGTYPE(object):
     GET_SHAPE = 7
     SEARCH = 8
     FORCE_OBJ_DEL = 9
+    OBJ_CHUNK = 10
+    CMD_BATCH = 11
+    FORCE_OBJ_DEL_BATCH = 12
 
 
 # Build automatically the reverse map from codes to msg types
@@ -16,3 +19,18 @@ for code in dir(MSGTYPE):
     if "__" not in code:
         key = getattr(MSGTYPE, code)
         code2MSGTYPE[key] = code
+
+
+# Websocket subprotocol offered by peers which exchange serialized messages as
+# binary frames instead of hex-encoded text frames
+BINARY_FRAMING_SUBPROTOCOL = "syft.binary"
+
+# Websocket subprotocol offered by peers which exchange binary frames prefixed
+# with a request id, so that many requests can be in flight on a connection:
+# a response starts with the id of the request it answers
+MULTIPLEXED_SUBPROTOCOL = "syft.multiplexed"
+# struct format of the request id prefixing multiplexed frames
+REQUEST_ID_FORMAT = ">Q"
+
+# struct format of the length prefixing the messages exchanged by socket workers
+FRAME_LENGTH_FORMAT = ">Q"
@@ -151,6 +151,28 @@ class GetNotPermittedError(Exception):
     pass
 
 
+class QuotaExceededError(Exception):
+    """Raised when storing an object would make the client which created it use
+    more memory than its quota on the worker"""
+
+    def __init__(self, client_id=None, quota=None, usage=None):
+        self.client_id = client_id
+        self.quota = quota
+        self.usage = usage
+
+    def __str__(self):
+        return (
+            f"Client {self.client_id} would use {self.usage} bytes, "
+            f"exceeding its quota of {self.quota} bytes"
+        )
+
+    def get_attributes(self):
+        """
+        Specify all the attributes need to report an error correctly.
+        """
+        return {"client_id": self.client_id, "quota": self.quota, "usage": self.usage}
+
+
 class IdNotUniqueError(Exception):
     """Raised by the ID Provider when setting ids that have already been generated"""
 
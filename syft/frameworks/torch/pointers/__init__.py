@@ -3,5 +3,12 @@ from syft.frameworks.torch.pointers.callable_pointer import create_callable_poin
 from syft.frameworks.torch.pointers.callable_pointer import CallablePointer
 from syft.frameworks.torch.pointers.pointer_tensor import PointerTensor
 from syft.frameworks.torch.pointers.object_wrapper import ObjectWrapper
+from syft.frameworks.torch.pointers.tensor_descriptor import TensorDescriptor
 
-__all__ = ["ObjectPointer", "CallablePointer", "create_callable_pointer", "PointerTensor"]
+__all__ = [
+    "ObjectPointer",
+    "CallablePointer",
+    "create_callable_pointer",
+    "PointerTensor",
+    "TensorDescriptor",
+]
@@ -1,6 +1,5 @@
 import syft
 from syft.frameworks.torch.tensors.interpreters import abstract
-from syft.codes import MSGTYPE
 from syft import exceptions
 
 from typing import List
@@ -210,7 +209,7 @@ class ObjectPointer(abstract.AbstractObject):
         if hasattr(self, "owner") and self.garbage_collect_data:
             # attribute pointers are not in charge of GC
             if self.point_to_attr is None:
-                self.owner.send_msg(MSGTYPE.FORCE_OBJ_DEL, self.id_at_location, self.location)
+                self.owner.request_obj_del(self.id_at_location, self.location)
 
     @property
     def grad(self):
@@ -51,6 +51,7 @@ class PointerTensor(pointers.ObjectPointer, abstract.AbstractTensor):
         id: Union[str, int] = None,
         garbage_collect_data: bool = True,
         shape: torch.Size = None,
+        dtype: torch.dtype = None,
         point_to_attr: str = None,
         tags: List[str] = None,
         description: str = None,
@@ -71,6 +72,7 @@ class PointerTensor(pointers.ObjectPointer, abstract.AbstractTensor):
             garbage_collect_data: If true (default), delete the remote object when the
                 pointer is deleted.
             shape: size of the tensor the pointer points to
+            dtype: dtype of the tensor the pointer points to, if known
             point_to_attr: string which can tell a pointer to not point directly to\
                 an object, but to point to an attribute of that object such as .child or
                 .grad. Note the string can be a chain (i.e., .child.child.child or
@@ -92,6 +94,7 @@ class PointerTensor(pointers.ObjectPointer, abstract.AbstractTensor):
             description=description,
         )
         self._shape = shape
+        self.dtype = dtype
 
     def get_shape(self):
         """Request information about the shape to the remote worker"""
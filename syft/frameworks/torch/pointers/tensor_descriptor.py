@@ -0,0 +1,32 @@
+import torch
+
+
+class TensorDescriptor:
+    """The shape and dtype of a tensor held by a remote worker.
+
+    The response to a command describes the tensors it produced, so that the
+    pointers to them know their shape and dtype without a GET_SHAPE round trip.
+    """
+
+    def __init__(self, shape: torch.Size, dtype: torch.dtype):
+        """
+        Args:
+            shape: the shape of the tensor
+            dtype: the dtype of the tensor
+        """
+        self.shape = shape
+        self.dtype = dtype
+
+    @staticmethod
+    def describe(tensor: object) -> "TensorDescriptor":
+        """Returns the descriptor of a tensor, or None if the object is not a plain
+        torch tensor (e.g. a wrapper, whose shape is not the one of its child)."""
+        if not isinstance(tensor, torch.Tensor) or hasattr(tensor, "child"):
+            return None
+        return TensorDescriptor(tensor.shape, tensor.dtype)
+
+    def __str__(self):
+        return f"<TensorDescriptor shape:{tuple(self.shape)} dtype:{self.dtype}>"
+
+    def __repr__(self):
+        return str(self)
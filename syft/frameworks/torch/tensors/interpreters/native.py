@@ -64,6 +64,7 @@ class TorchTensor(AbstractTensor):
                 self.child.tags = set()
         else:
             self._tags = new_tags
+        self._update_search_index()
 
     @property
     def description(self):
@@ -80,6 +81,13 @@ class TorchTensor(AbstractTensor):
             self.child.description = new_desc
         else:
             self._description = new_desc
+        self._update_search_index()
+
+    def _update_search_index(self):
+        """Re-indexes the tensor in the search index of its owner, if it stores it."""
+        owner = getattr(self, "_owner", None)
+        if owner is not None and owner._objects.get(self.id) is self:
+            owner.search_index.add(self.id, self)
 
     @property
     def shape(self):
@@ -328,14 +336,28 @@ class TorchTensor(AbstractTensor):
 
         else:
 
-            children = list()
-            for loc in location:
-                children.append(self.clone().send(loc))
-
-            output = syft.frameworks.torch.tensors.interpreters.MultiPointerTensor(
-                children=children
+            if inplace and self._is_parameter():
+                raise NotImplementedError(
+                    "Sending a parameter inplace to several workers is not supported"
+                )
+
+            # the tensor is serialized once and sent to all the locations at once
+            output = self.owner.send(
+                self,
+                list(location),
+                local_autograd=local_autograd,
+                preinitialize_grad=preinitialize_grad,
             ).wrap()
 
+            for ptr in output.child.child.values():
+                ptr.description = self.description
+                ptr.tags = self.tags
+
+            if inplace:
+                self.set_()
+                self.child = output.child
+                return self
+
         return output
 
     def send_(self, *location):
@@ -1,3 +1,4 @@
+import hashlib
 from typing import Union
 from typing import Callable
 from typing import Any
@@ -159,6 +160,16 @@ class TorchAttributes(object):
         # Dict {method_name: <is_inplace:bool>
         self.inplace_methods = {}
 
+        # SECTION: Build the opcode table, so that workers sharing the same table can send
+        # command names as small integers instead of strings
+
+        self.opcodes = sorted(set(self.torch_modules_functions) | set(self.tensorvar_methods))
+        self.command_opcodes = {command: opcode for opcode, command in enumerate(self.opcodes)}
+
+        # Two workers can only exchange opcodes if their tables are the same, which
+        # depends on both the torch and the syft versions
+        self.opcodes_version = hashlib.sha1("\n".join(self.opcodes).encode("utf-8")).hexdigest()
+
     def _command_guard(
         self, command: str, torch_domain: str, get_native: bool = False
     ) -> Union[Callable[..., Any], str]:
@@ -182,6 +193,30 @@ class TorchAttributes(object):
             return self.native_commands[torch_domain][command]
         return command
 
+    def get_opcode(self, command: str) -> Union[int, str]:
+        """Returns the opcode of a command, or the command itself if it has none.
+
+        Args:
+            command: A string indicating the command name.
+
+        Returns:
+            The opcode of the command if it is in the opcode table, else the command name.
+        """
+        return self.command_opcodes.get(command, command)
+
+    def get_command(self, opcode: int) -> str:
+        """Returns the command name matching an opcode.
+
+        Args:
+            opcode: An integer from the opcode table.
+
+        Returns:
+            The command name.
+        """
+        if not 0 <= opcode < len(self.opcodes):
+            raise RuntimeError(f"Opcode {opcode} is not in the opcode table.")
+        return self.opcodes[opcode]
+
     def _is_command_valid_guard(self, command: str, torch_domain: str) -> bool:
         """Validates the command.
 
@@ -1,2 +1,4 @@
 from syft.generic.id_provider import IdProvider
+from syft.generic.memory_budget import MemoryBudget
 from syft.generic.object_storage import ObjectStorage
+from syft.generic.search_index import SearchIndex
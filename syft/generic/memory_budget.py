@@ -0,0 +1,183 @@
+import collections
+import logging
+import os
+import tempfile
+import threading
+from typing import Union
+
+import numpy
+import torch
+
+logger = logging.getLogger(__name__)
+
+# the dtypes numpy can represent, others (e.g. bfloat16) can't be mapped
+# from a file, nor serialized through numpy
+NUMPY_DTYPES = {
+    torch.bool,
+    torch.uint8,
+    torch.int8,
+    torch.int16,
+    torch.int32,
+    torch.int64,
+    torch.float16,
+    torch.float32,
+    torch.float64,
+    torch.complex64,
+    torch.complex128,
+}
+
+
+class MemoryBudget:
+    """Bounds the memory used by the tensors of an ObjectStorage.
+
+    The storage reports the tensors it stores, deletes and looks up. Once the
+    tensors use more than max_bytes, the least recently used ones are spilled:
+    their data is moved to a memory mapped file in spill_dir, which the OS
+    writes back to disk and pages out when memory is needed. The tensor objects
+    themselves stay in the storage, so they keep their id, tags and owner and
+    can still be read or modified in place. A spilled tensor is moved back to
+    memory when it's looked up again.
+
+    Only plain CPU tensors whose storage they don't share with another tensor
+    are spilled (moving the data of a view to a file would stop it from
+    reflecting the changes of the tensor it's a view of), and only if numpy
+    supports their dtype. A tensor which can't be written to spill_dir (e.g.
+    the disk is full) stays in memory, over budget.
+
+    Args:
+        max_bytes: the memory budget of the tensors, in bytes
+        spill_dir: the directory of the files of the spilled tensors. It must be
+            on a disk: the temporary directory is often a tmpfs, which is held
+            in memory, so spilling to it frees nothing.
+
+    Attributes:
+        stats: the number of lookups of tensors in memory ("hits"), of spilled
+            tensors ("misses"), the number of tensors spilled ("spills"), and the
+            bytes of the tensors in memory ("resident_bytes") and spilled
+            ("spilled_bytes").
+    """
+
+    def __init__(self, max_bytes: int, spill_dir: str):
+        self.max_bytes = max_bytes
+        self.spill_dir = spill_dir
+        self.stats = {"hits": 0, "misses": 0, "spills": 0, "resident_bytes": 0, "spilled_bytes": 0}
+
+        # tensors in memory, least recently used first, with their size
+        self._resident = collections.OrderedDict()
+        # spilled tensors, with their size
+        self._spilled = {}
+        self._lock = threading.Lock()
+
+    def add(self, obj_id: Union[str, int], obj: object):
+        """Accounts for an object added to the storage."""
+        if not self._is_spillable(obj):
+            return
+        with self._lock:
+            self._discard(obj_id)
+            self._resident[obj_id] = (obj, self._nbytes(obj))
+            self.stats["resident_bytes"] += self._resident[obj_id][1]
+            self._evict(obj_id)
+
+    def remove(self, obj_id: Union[str, int]):
+        """Accounts for an object removed from the storage."""
+        with self._lock:
+            self._discard(obj_id)
+
+    def touch(self, obj_id: Union[str, int]):
+        """Accounts for a lookup of an object, moving it back to memory if it
+        was spilled."""
+        with self._lock:
+            if obj_id in self._resident:
+                self.stats["hits"] += 1
+                self._resident.move_to_end(obj_id)
+            elif obj_id in self._spilled:
+                self.stats["misses"] += 1
+                obj, nbytes = self._spilled.pop(obj_id)
+                self.stats["spilled_bytes"] -= nbytes
+                self._page_in(obj)
+                self._resident[obj_id] = (obj, self._nbytes(obj))
+                self.stats["resident_bytes"] += self._resident[obj_id][1]
+                self._evict(obj_id)
+
+    def clear(self):
+        """Moves the spilled tensors back to memory and forgets all the objects."""
+        with self._lock:
+            for obj, _ in self._spilled.values():
+                self._page_in(obj)
+            self._resident.clear()
+            self._spilled.clear()
+            self.stats["resident_bytes"] = 0
+            self.stats["spilled_bytes"] = 0
+
+    def _discard(self, obj_id: Union[str, int]):
+        if obj_id in self._resident:
+            _, nbytes = self._resident.pop(obj_id)
+            self.stats["resident_bytes"] -= nbytes
+        elif obj_id in self._spilled:
+            _, nbytes = self._spilled.pop(obj_id)
+            self.stats["spilled_bytes"] -= nbytes
+
+    def _evict(self, keep_id: Union[str, int]):
+        """Spills the least recently used tensors until the budget is met,
+        except the tensor keep_id which was just used."""
+        while self.stats["resident_bytes"] > self.max_bytes and len(self._resident) > 1:
+            obj_id = next(iter(self._resident))
+            if obj_id == keep_id:
+                self._resident.move_to_end(obj_id)
+                continue
+            obj, resident_nbytes = self._resident[obj_id]
+            # tensors modified in place since they were added may have been
+            # resized or turned into views, the latter are not accounted for anymore
+            if not self._is_spillable(obj):
+                del self._resident[obj_id]
+                self.stats["resident_bytes"] -= resident_nbytes
+                continue
+            nbytes = self._nbytes(obj)
+            try:
+                self._spill(obj)
+            except (OSError, ValueError) as e:
+                # the next tensors would most likely fail the same way
+                logger.warning("Failed to spill a tensor to %s: %s", self.spill_dir, e)
+                return
+            del self._resident[obj_id]
+            self.stats["resident_bytes"] -= resident_nbytes
+            self._spilled[obj_id] = (obj, nbytes)
+            self.stats["spilled_bytes"] += nbytes
+            self.stats["spills"] += 1
+
+    def _spill(self, tensor: torch.Tensor):
+        """Moves the data of a tensor to a memory mapped file."""
+        data = tensor.detach().numpy()
+        fd, path = tempfile.mkstemp(prefix="syft-spill-", dir=self.spill_dir)
+        try:
+            os.close(fd)
+            data.tofile(path)
+            mapped_data = numpy.memmap(path, dtype=data.dtype, mode="r+", shape=data.shape)
+        finally:
+            # the mapping keeps the data of the file until it's unmapped
+            os.unlink(path)
+        with torch.no_grad():
+            tensor.set_(torch.from_numpy(mapped_data))
+
+    @staticmethod
+    def _page_in(tensor: torch.Tensor):
+        """Moves the data of a spilled tensor back to memory."""
+        with torch.no_grad():
+            tensor.set_(tensor.native_clone())
+
+    @staticmethod
+    def _nbytes(tensor: torch.Tensor) -> int:
+        return tensor.numel() * tensor.element_size()
+
+    @staticmethod
+    def _is_spillable(obj: object) -> bool:
+        return (
+            isinstance(obj, torch.Tensor)
+            and not hasattr(obj, "child")
+            and obj.device.type == "cpu"
+            and obj.dtype in NUMPY_DTYPES
+            and obj.is_contiguous()
+            and obj.storage_offset() == 0
+            and obj.storage().size() == obj.numel()
+            and obj.numel() > 0
+        )
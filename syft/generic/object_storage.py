@@ -1,9 +1,14 @@
+from contextlib import contextmanager
+import threading
 from typing import List
 from typing import Union
 
 import torch
 
+from syft.exceptions import QuotaExceededError
 from syft.frameworks.torch.tensors.interpreters import AbstractTensor
+from syft.generic.memory_budget import MemoryBudget
+from syft.generic.search_index import SearchIndex
 
 
 class ObjectStorage:
@@ -15,6 +20,140 @@ class ObjectStorage:
 
     def __init__(self):
         self._objects = {}
+        # indexes the objects stored by id, tag and description, see search
+        self.search_index = SearchIndex()
+        # bounds the memory used by the tensors stored, see set_memory_budget
+        self.memory_budget = None
+        # client on behalf of which the current thread stores objects, see acting_for
+        self._current_client = threading.local()
+        # maximum bytes of the objects stored per client, by client id, and for
+        # the clients without their own quota (see set_client_quota)
+        self.client_quotas = {}
+        self.default_client_quota = None
+        # bytes of the objects stored, by id of the client which stored them
+        self.client_usage = {}
+        # client which stored each object and the bytes it was charged, by object id
+        self._object_clients = {}
+        self._client_usage_lock = threading.Lock()
+
+    def set_memory_budget(self, max_bytes: int, spill_dir: str = None) -> MemoryBudget:
+        """Bounds the memory used by the tensors stored.
+
+        Once the tensors stored use more than max_bytes, the data of the least
+        recently used ones is moved to memory mapped files in spill_dir, until
+        they are looked up again (see MemoryBudget). This is transparent to the
+        users of the storage.
+
+        Args:
+            max_bytes: the memory budget of the tensors, in bytes, or None to
+                remove the budget
+            spill_dir: the directory of the files of the spilled tensors,
+                required with max_bytes. It must be on a disk, not on a tmpfs
+                like the temporary directory often is.
+
+        Returns:
+            The MemoryBudget, whose stats report the hits, misses and spills.
+        """
+        if max_bytes is not None and spill_dir is None:
+            raise ValueError("A spill_dir is required to set a memory budget")
+
+        if self.memory_budget is not None:
+            self.memory_budget.clear()
+            self.memory_budget = None
+
+        if max_bytes is not None:
+            self.memory_budget = MemoryBudget(max_bytes, spill_dir)
+            for obj_id, obj in self._objects.items():
+                self.memory_budget.add(obj_id, obj)
+        return self.memory_budget
+
+    @contextmanager
+    def acting_for(self, client_id: Union[str, int]):
+        """Attributes the objects stored by the current thread to a client, and
+        enforces its quota, until the end of the with block.
+
+        Args:
+            client_id: the id of the client, e.g. of its connection
+        """
+        previous_client_id = getattr(self._current_client, "id", None)
+        self._current_client.id = client_id
+        try:
+            yield
+        finally:
+            self._current_client.id = previous_client_id
+
+    def set_client_quota(self, client_id: Union[str, int], max_bytes: int):
+        """Sets the maximum bytes of the tensors a client can store.
+
+        Storing an object which would exceed the quota of its client raises a
+        QuotaExceededError, and the object is not stored.
+
+        Args:
+            client_id: the id of the client, or None to set the quota of the
+                clients which don't have their own
+            max_bytes: the quota in bytes, or None for no quota
+        """
+        if client_id is None:
+            self.default_client_quota = max_bytes
+        elif max_bytes is None:
+            self.client_quotas.pop(client_id, None)
+        else:
+            self.client_quotas[client_id] = max_bytes
+
+    def memory_usage(self, *args) -> dict:
+        """Returns the bytes of the objects stored by the current client and its quota.
+
+        Clients can call it remotely to know how much memory they use.
+        """
+        client_id = getattr(self._current_client, "id", None)
+        return {
+            "bytes": self.client_usage.get(client_id, 0),
+            "quota": self.client_quotas.get(client_id, self.default_client_quota),
+        }
+
+    def _charge_client(self, obj_id: Union[str, int], obj: object):
+        """Attributes an object to the current client, if any.
+
+        Raises:
+            QuotaExceededError: if the object would exceed the quota of the client
+        """
+        client_id = getattr(self._current_client, "id", None)
+        if client_id is None and obj_id not in self._object_clients:
+            return
+
+        with self._client_usage_lock:
+            # an object replacing another one with the same id replaces its charge
+            previous_client_id, previous_nbytes = self._object_clients.get(obj_id, (None, 0))
+            if client_id is not None:
+                nbytes = _nbytes(obj)
+                usage = self.client_usage.get(client_id, 0) + nbytes
+                if previous_client_id == client_id:
+                    usage -= previous_nbytes
+                quota = self.client_quotas.get(client_id, self.default_client_quota)
+                if quota is not None and usage > quota:
+                    raise QuotaExceededError(client_id, quota, usage)
+
+            self._release_client_charge(obj_id)
+            if client_id is not None:
+                self.client_usage[client_id] = self.client_usage.get(client_id, 0) + nbytes
+                self._object_clients[obj_id] = (client_id, nbytes)
+
+    def _release_client_charge(self, obj_id: Union[str, int]):
+        if obj_id in self._object_clients:
+            client_id, nbytes = self._object_clients.pop(obj_id)
+            self.client_usage[client_id] -= nbytes
+            # forget the clients which don't store anything anymore
+            if not self.client_usage[client_id]:
+                del self.client_usage[client_id]
+
+    def _untrack_obj(self, obj_id: Union[str, int]):
+        """Accounts for the removal of an object."""
+        self.search_index.remove(obj_id)
+        if self.memory_budget is not None:
+            self.memory_budget.remove(obj_id)
+        if obj_id in self._object_clients:
+            with self._client_usage_lock:
+                self._release_client_charge(obj_id)
 
     def register_obj(self, obj: object, obj_id: Union[str, int] = None):
         """Registers the specified object with the current worker node.
@@ -86,6 +225,8 @@ class ObjectStorage:
             else:
                 raise e
 
+        if self.memory_budget is not None:
+            self.memory_budget.touch(obj_id)
         return obj
 
     def set_obj(self, obj: Union[torch.Tensor, AbstractTensor]) -> None:
@@ -94,7 +235,11 @@ class ObjectStorage:
         Args:
             obj: A torch or syft tensor with an id.
         """
+        self._charge_client(obj.id, obj)
         self._objects[obj.id] = obj
+        self.search_index.add(obj.id, obj)
+        if self.memory_budget is not None:
+            self.memory_budget.add(obj.id, obj)
 
     def rm_obj(self, remote_key: Union[str, int]):
         """Removes an object.
@@ -107,6 +252,7 @@ class ObjectStorage:
         """
         if remote_key in self._objects:
             del self._objects[remote_key]
+            self._untrack_obj(remote_key)
 
     def force_rm_obj(self, remote_key: Union[str, int]):
         """Forces object removal.
@@ -123,3 +269,21 @@ class ObjectStorage:
             if hasattr(obj, "child"):
                 obj.child.garbage_collect_data = True
             del self._objects[remote_key]
+            self._untrack_obj(remote_key)
+
+    def force_rm_objs(self, remote_keys: List[Union[str, int]]):
+        """Forces the removal of several objects, see force_rm_obj.
+
+        Args:
+            remote_keys: A list of strings or integers representing the ids of
+                the objects to be removed.
+        """
+        for remote_key in remote_keys:
+            self.force_rm_obj(remote_key)
+
+
+def _nbytes(obj: object) -> int:
+    """Returns the bytes of the data of a tensor, 0 for other objects."""
+    if isinstance(obj, torch.Tensor) and not hasattr(obj, "child"):
+        return obj.numel() * obj.element_size()
+    return 0
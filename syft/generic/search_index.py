@@ -0,0 +1,122 @@
+import itertools
+import re
+import threading
+from typing import List
+from typing import Set
+from typing import Union
+
+import torch
+
+# the words of a description, which it is indexed by
+TOKEN_PATTERN = re.compile(r"\w+")
+
+
+class SearchIndex:
+    """Indexes the objects of an ObjectStorage by id, tag and description, so
+    that searching them doesn't scan all of them.
+
+    A query term matches an object if it is its id (as a string), one of its
+    tags, or a part of its description made of whole words (e.g. "MNIST
+    training" but not "MNI"). Only tensors are matched by tags and description.
+
+    The storage reports the objects it stores and deletes, and TorchTensor
+    reports the changes of the tags and description of stored tensors.
+    """
+
+    def __init__(self):
+        # ids of the objects by id as a string, by tag and by description word
+        self._ids_by_key = {}
+        self._ids_by_tag = {}
+        self._ids_by_token = {}
+        # the tags and description each object is indexed by, by object id
+        self._entries = {}
+        # insertion rank of the objects by id, the results are sorted by it
+        self._ranks = {}
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+
+    def add(self, obj_id: Union[str, int], obj: object):
+        """Indexes an object added to the storage, or re-indexes it after its
+        tags or description changed, or it was replaced. A re-indexed object
+        keeps its rank, like a key of a dict keeps its position."""
+        if isinstance(obj, torch.Tensor):
+            tags = set(obj.tags) if obj.tags is not None else set()
+            description = obj.description
+        else:
+            tags = set()
+            description = None
+
+        with self._lock:
+            rank = self._ranks.get(obj_id)
+            self._discard(obj_id)
+            self._ranks[obj_id] = next(self._counter) if rank is None else rank
+            self._entries[obj_id] = (tags, description)
+            self._ids_by_key.setdefault(str(obj_id), set()).add(obj_id)
+            for tag in tags:
+                self._ids_by_tag.setdefault(tag, set()).add(obj_id)
+            if description is not None:
+                for token in TOKEN_PATTERN.findall(description):
+                    self._ids_by_token.setdefault(token, set()).add(obj_id)
+
+    def remove(self, obj_id: Union[str, int]):
+        """Forgets an object removed from the storage."""
+        with self._lock:
+            self._discard(obj_id)
+
+    def clear(self):
+        """Forgets all the objects."""
+        with self._lock:
+            self._ids_by_key.clear()
+            self._ids_by_tag.clear()
+            self._ids_by_token.clear()
+            self._entries.clear()
+            self._ranks.clear()
+
+    def search(self, *query: str) -> List[Union[str, int]]:
+        """Returns the ids of the objects matching every query term, in the
+        order they were first indexed."""
+        with self._lock:
+            if not query:
+                ids = set(self._ranks)
+            else:
+                # the rarest terms first, to intersect small sets
+                matches = sorted((self._match(term) for term in query), key=len)
+                ids = matches[0].intersection(*matches[1:])
+            return sorted(ids, key=self._ranks.__getitem__)
+
+    def _match(self, term: str) -> Set[Union[str, int]]:
+        ids = set(self._ids_by_key.get(term, ()))
+        ids.update(self._ids_by_tag.get(term, ()))
+
+        tokens = TOKEN_PATTERN.findall(term)
+        if tokens:
+            candidates = [self._ids_by_token.get(token, set()) for token in tokens]
+            candidates = min(candidates, key=len).intersection(*candidates)
+        else:
+            candidates = self._entries
+        # the description must contain the words in the order of the term
+        for obj_id in candidates:
+            description = self._entries[obj_id][1]
+            if description is not None and term in description:
+                ids.add(obj_id)
+        return ids
+
+    def _discard(self, obj_id: Union[str, int]):
+        if obj_id not in self._entries:
+            return
+        tags, description = self._entries.pop(obj_id)
+        del self._ranks[obj_id]
+        _discard_id(self._ids_by_key, str(obj_id), obj_id)
+        for tag in tags:
+            _discard_id(self._ids_by_tag, tag, obj_id)
+        if description is not None:
+            for token in TOKEN_PATTERN.findall(description):
+                _discard_id(self._ids_by_token, token, obj_id)
+
+
+def _discard_id(index: dict, key: object, obj_id: Union[str, int]):
+    ids = index.get(key)
+    if ids is not None:
+        ids.discard(obj_id)
+        if not ids:
+            del index[key]
@@ -1,27 +1,57 @@
 from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError
+from concurrent.futures import as_completed
+import logging
+from typing import Iterator
 from typing import Tuple
 from typing import Dict
 
+logger = logging.getLogger(__name__)
+
 
 class VirtualGrid:
+    # maximum number of workers searched at once
+    max_workers = 32
+
     def __init__(self, *workers):
         self.workers = workers
 
     def search(
-        self, *query, verbose: bool = True, return_counter: bool = True
+        self,
+        *query,
+        verbose: bool = True,
+        return_counter: bool = True,
+        timeout: float = None,
+        limit: int = None,
     ) -> Tuple[Dict, Counter]:
         """Searches over a collection of workers, returning pointers to the results
-        grouped by worker."""
+        grouped by worker.
+
+        The workers are searched concurrently, see iter_search.
+
+        Args:
+            query: the terms the results must match, see BaseWorker.search
+            verbose: whether to print the number of results of each worker
+            return_counter: whether to also return how many results have each tag
+            timeout: seconds after which the workers which didn't answer are
+                left out of the results, no limit by default
+            limit: maximum number of results, the search stops once they're found
+        """
 
         tag_counter = Counter()
         result_counter = 0
 
         results = {}
-        for worker in self.workers:
+        for worker, worker_results in self.iter_search(*query, timeout=timeout, limit=limit):
 
-            worker_tag_ctr = Counter()
+            if worker_results is None:
+                if verbose:
+                    # (the string of a client worker is requested from its server)
+                    print("No answer from " + str(worker.id))
+                continue
 
-            worker_results = worker.search(*query)
+            worker_tag_ctr = Counter()
 
             if len(worker_results) > 0:
                 results[worker.id] = worker_results
@@ -54,3 +84,60 @@ class VirtualGrid:
             return results, tag_counter
         else:
             return results
+
+    def iter_search(self, *query, timeout: float = None, limit: int = None) -> Iterator[Tuple]:
+        """Searches all the workers at once, yielding the results of each worker
+        as soon as it answers.
+
+        Args:
+            query: the terms the results must match, see BaseWorker.search
+            timeout: seconds after which the workers which didn't answer are
+                given up on, no limit by default
+            limit: maximum number of results. Once they're found, the results
+                of the last worker are truncated and the other workers are not
+                waited for.
+
+        A worker which doesn't answer in time keeps searching in the background.
+        The client workers carry one request at a time on their connection, so
+        the next requests sent to it wait for the search to end instead of
+        receiving its response.
+
+        Yields:
+            (worker, results) pairs, in the order the workers answer, with None
+            as the results of the workers whose search failed, then (worker,
+            None) for each worker which didn't answer within timeout.
+        """
+        if not self.workers:
+            return
+
+        executor = ThreadPoolExecutor(max_workers=min(self.max_workers, len(self.workers)))
+        # the workers which didn't answer yet, by future of their search
+        pending = {executor.submit(worker.search, *query): worker for worker in self.workers}
+        timed_out = []
+        result_counter = 0
+        try:
+            for future in as_completed(list(pending), timeout=timeout):
+                worker = pending.pop(future)
+                try:
+                    worker_results = future.result()
+                except Exception as e:
+                    logger.warning("Search on worker %s failed: %s", worker.id, e)
+                    yield worker, None
+                    continue
+                if limit is not None:
+                    worker_results = worker_results[: limit - result_counter]
+                result_counter += len(worker_results)
+                yield worker, worker_results
+
+                if limit is not None and result_counter >= limit:
+                    break
+        except TimeoutError:
+            timed_out = list(pending.values())
+        finally:
+            # the workers still searching are not waited for
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=False)
+
+        for worker in timed_out:
+            yield worker, None
@@ -35,6 +35,8 @@ from tempfile import TemporaryFile
 from typing import Collection
 from typing import Dict
 from typing import Tuple
+from typing import List
+from typing import Union
 import torch
 import msgpack
 import lz4
@@ -42,12 +44,16 @@ from lz4 import (  # noqa: F401
     frame,
 )  # needed as otherwise we will get: module 'lz4' has no attribute 'frame'
 import io
+import struct
+import threading
 import numpy
 from tblib import Traceback
+import time
 import traceback
 from six import reraise
 import warnings
 import zstd
+import zstandard
 
 import syft
 import syft as sy
@@ -61,6 +67,7 @@ from syft.federated import Plan
 
 from syft.exceptions import CompressionNotFoundException
 from syft.exceptions import GetNotPermittedError
+from syft.exceptions import QuotaExceededError
 from syft.exceptions import ResponseSignatureError
 
 from syft.frameworks.torch.tensors.decorators import LoggingTensor
@@ -68,11 +75,46 @@ from syft.frameworks.torch.tensors.interpreters import AdditiveSharingTensor
 from syft.frameworks.torch.tensors.interpreters import MultiPointerTensor
 from syft.frameworks.torch.tensors.interpreters.abstract import initialize_tensor
 from syft.frameworks.torch import pointers
+from syft.generic.memory_budget import NUMPY_DTYPES
 
 # COMPRESSION SCHEME INT CODES
 NO_COMPRESSION = 40
 LZ4 = 41
 ZSTD = 42
+ZSTD_DICT = 43
+
+# ZSTD DICTIONARIES
+# compression level used with zstd dictionaries
+ZSTD_DICT_LEVEL = 3
+# default maximum size of the dictionaries trained by train_compression_dict
+DEFAULT_DICT_SIZE = 2 ** 14
+# dictionaries available to compress and decompress binaries, by dictionary id
+_compression_dicts = {}
+# zstd contexts using the dictionaries, which can't be shared between threads
+_compression_dict_contexts = threading.local()
+
+# OUT OF BAND
+# first byte of messages serialized with serialize_out_of_band
+OUT_OF_BAND = 50
+# minimum size of the tensors data sent out of band
+OUT_OF_BAND_MIN_SIZE = 2 ** 10
+
+# TENSORS
+# first bytes of the binaries written by torch.save (a zip archive)
+TORCH_SAVE_MAGIC = b"PK\x03\x04"
+
+# IN PROCESS
+# msgpack extension type code of the tensors passed by reference by serialize_in_process
+IN_PROCESS_TENSOR_EXT = 2
+
+# STREAMING
+# default size of the chunks produced by serialize_stream
+DEFAULT_CHUNK_SIZE = 2 ** 20
+# msgpack extension type code of the buffers sent apart from the stream header
+STREAM_BUFFER_EXT = 1
+
+# options of the serialization in progress in the current thread
+_serialization_options = threading.local()
 
 
 # High Level Public Functions (these are the ones you use)
@@ -82,6 +124,7 @@ def serialize(
     force_no_compression: bool = False,
     force_no_serialization: bool = False,
     force_full_simplification: bool = False,
+    compression_dict_id: int = None,
 ) -> bin:
     """This method can serialize any object PySyft needs to send or store.
 
@@ -108,6 +151,9 @@ def serialize(
             flag to True will cause a VirtualWorker to be serialized WITH all of its
             tensors while by default VirtualWorker objects only serialize a small
             amount of metadata.
+        compression_dict_id (int): if given, the binary is compressed with the
+            zstd dictionary of this id (see register_compression_dict) whatever
+            the module compression scheme.
 
     Returns:
         binary: the serialized form of the object.
@@ -144,7 +190,7 @@ def serialize(
     if force_no_compression:
         return binary
     else:
-        return _compress(binary)
+        return _compress(binary, compression_dict_id)
 
 
 def deserialize(binary: bin, worker: AbstractWorker = None, detail=True) -> object:
@@ -155,7 +201,9 @@ def deserialize(binary: bin, worker: AbstractWorker = None, detail=True) -> obje
     steps, Decompress, Deserialize, and Detail as described inline below.
 
     Args:
-        binary (bin): the serialized object to be deserialized.
+        binary (bin): the serialized object to be deserialized. The frames
+            returned by serialize_out_of_band (or their concatenation) are
+            accepted as well.
         worker (AbstractWorker): the worker which is acquiring the message content,
             for example used to specify the owner of a tensor received(not obvious
             for virtual workers)
@@ -169,13 +217,21 @@ def deserialize(binary: bin, worker: AbstractWorker = None, detail=True) -> obje
     if worker is None:
         worker = syft.torch.hook.local_worker
 
-    # 1) Decompress the binary if needed
-    binary = _decompress(binary)
+    if isinstance(binary, InProcessMessage):
+        # 1-2) Deserialize, the tensors were passed by reference
+        simple_objects = _loads_in_process(binary)
+    elif is_out_of_band(binary):
+        # 1-2) Decompress and deserialize the header, which references the
+        # binaries sent out of band
+        simple_objects = _loads_out_of_band(binary)
+    else:
+        # 1) Decompress the binary if needed
+        binary = _decompress(binary)
 
-    # 2) Deserialize
-    # This function converts the binary into the appropriate python
-    # object (or nested dict/collection of python objects)
-    simple_objects = msgpack.loads(binary)
+        # 2) Deserialize
+        # This function converts the binary into the appropriate python
+        # object (or nested dict/collection of python objects)
+        simple_objects = msgpack.loads(binary)
 
     if detail:
         # 3) Detail
@@ -191,6 +247,298 @@ def deserialize(binary: bin, worker: AbstractWorker = None, detail=True) -> obje
         return simple_objects
 
 
+def serialize_out_of_band(
+    obj: object, min_size: int = OUT_OF_BAND_MIN_SIZE, compression_dict_id: int = None
+) -> list:
+    """Serializes an object, keeping its large binaries out of the msgpack binary.
+
+    Tensors are serialized with raw_tensor_serializer, and the data of every
+    tensor of at least min_size bytes is replaced by a reference in the
+    serialized object. These binaries are returned as they are, as additional frames, so they are
+    neither copied into the msgpack binary nor compressed. The frames can be
+    sent with scatter/gather writes, and deserialize builds the tensors on top
+    of the received frames without copying them, as long as they are received
+    in writable buffers. The binaries of the concatenation of the frames are
+    copied.
+
+    The first frame starts with the OUT_OF_BAND byte, followed by the number
+    of binaries sent out of band and their sizes, and the compressed header.
+
+    Args:
+        obj (object): the object to be serialized
+        min_size (int): minimum size of the tensors data sent out of band
+        compression_dict_id (int): id of the zstd dictionary used to compress
+            the header, if any
+
+    Returns:
+        list: the frames, whose concatenation is a valid serialized object.
+    """
+    _serialization_options.raw_tensors = True
+    try:
+        simple_objects = _simplify(obj)
+    finally:
+        _serialization_options.raw_tensors = False
+
+    # only the memoryviews of the tensors data are sent out of band, other
+    # binaries are expected to be bytes when they are detailed
+    simple_objects, buffers = _extract_buffers(simple_objects, min_size, (memoryview,))
+
+    sizes = [len(buffer) for buffer in buffers]
+    table = struct.pack(f">BI{len(sizes)}Q", OUT_OF_BAND, len(sizes), *sizes)
+    header = _compress(msgpack.dumps(simple_objects), compression_dict_id)
+
+    return [table + header] + buffers
+
+
+def is_out_of_band(binary) -> bool:
+    """Tells whether a binary (or list of frames) was produced by serialize_out_of_band."""
+    if isinstance(binary, InProcessMessage):
+        return False
+    return isinstance(binary, list) or binary[0] == OUT_OF_BAND
+
+
+def _loads_out_of_band(frames) -> object:
+    """Deserializes the frames of serialize_out_of_band (or their concatenation)
+    into simple python objects referencing the binaries sent out of band."""
+    if not isinstance(frames, list):
+        frames = [frames]
+
+    first_frame = memoryview(frames[0])
+    (nb_buffers,) = struct.unpack_from(">I", first_frame, 1)
+    sizes = struct.unpack_from(f">{nb_buffers}Q", first_frame, 5)
+    header_start = 5 + 8 * nb_buffers
+
+    if len(frames) == 1:
+        # concatenated frames: the binaries follow the header. They are copied
+        # to buffers of their own, which are writable and aligned for any
+        # dtype, so that each tensor only keeps its own data alive
+        header_end = len(first_frame) - sum(sizes)
+        buffers = []
+        start = header_end
+        for size in sizes:
+            buffers.append(bytearray(first_frame[start : start + size]))
+            start += size
+    else:
+        # the frames received separately are used as they are, tensors are
+        # built on top of them if they are writable and aligned
+        header_end = len(first_frame)
+        buffers = frames[1:]
+
+    def ext_hook(code, data):
+        if code != STREAM_BUFFER_EXT:
+            return msgpack.ExtType(code, data)
+        index, _ = struct.unpack(">IQ", data)
+        return buffers[index]
+
+    header = _decompress(first_frame[header_start:header_end])
+    return msgpack.loads(header, ext_hook=ext_hook)
+
+
+class InProcessMessage:
+    """An object serialized by serialize_in_process.
+
+    Args:
+        binary: the msgpack binary of the simplified object
+        tensors: the copies of the tensors referenced by the binary
+    """
+
+    __slots__ = ("binary", "tensors")
+
+    def __init__(self, binary: bin, tensors: List[torch.Tensor]):
+        self.binary = binary
+        self.tensors = tensors
+
+
+def serialize_in_process(obj: object) -> InProcessMessage:
+    """Serializes an object for a worker living in the same process.
+
+    The object is simplified and packed with msgpack as usual, but the tensors
+    are copied instead of being serialized: the copies are passed by reference
+    along with the binary, which is not compressed. Deserializing it only
+    unpacks the binary and details the objects, so the worker receiving it
+    sees the same objects as with serialize, without the cost of torch.save,
+    compression and their inverse.
+
+    Each tensor is copied when it is serialized, so the sender and the
+    receiver never share the data of a tensor.
+
+    Args:
+        obj (object): the object to be serialized
+
+    Returns:
+        InProcessMessage: the serialized object, only valid in this process.
+    """
+    _serialization_options.in_process = True
+    try:
+        simple_objects = _simplify(obj)
+    finally:
+        _serialization_options.in_process = False
+
+    tensors = []
+
+    def default(tensor):
+        if not isinstance(tensor, torch.Tensor):
+            raise TypeError(f"can not serialize {type(tensor).__name__} object")
+        tensors.append(tensor)
+        return msgpack.ExtType(IN_PROCESS_TENSOR_EXT, struct.pack(">I", len(tensors) - 1))
+
+    return InProcessMessage(msgpack.dumps(simple_objects, default=default), tensors)
+
+
+def _loads_in_process(message: InProcessMessage) -> object:
+    """Deserializes the output of serialize_in_process into simple python objects."""
+
+    def ext_hook(code, data):
+        if code != IN_PROCESS_TENSOR_EXT:
+            return msgpack.ExtType(code, data)
+        (index,) = struct.unpack(">I", data)
+        return message.tensors[index]
+
+    return msgpack.loads(message.binary, ext_hook=ext_hook)
+
+
+def serialize_stream(obj: object, chunk_size: int = DEFAULT_CHUNK_SIZE, compress: bool = True):
+    """Serializes an object as a sequence of chunks of bounded size.
+
+    This is meant for very large objects (such as tensors of hundreds of MB)
+    for which serialize would hold several full copies of the object in memory.
+
+    The first chunk is the serialized object where every binary larger than
+    chunk_size (e.g. the content of a tensor) has been replaced by a reference.
+    The following chunks are the content of these binaries, split into pieces
+    of at most chunk_size bytes. Each chunk is compressed independently.
+
+    Args:
+        obj (object): the object to be serialized
+        chunk_size (int): maximum size of a chunk before compression
+        compress (bool): whether to compress the chunks, which is not needed
+            when they are sent in messages which are themselves compressed
+
+    Yields:
+        binary: the chunks, to be given in order to a StreamDeserializer.
+    """
+    simple_objects = _simplify(obj)
+    simple_objects, buffers = _extract_buffers(simple_objects, chunk_size)
+
+    encode = _compress if compress else bytes
+
+    yield encode(msgpack.dumps(simple_objects))
+
+    for buffer in buffers:
+        buffer = memoryview(buffer).cast("B")
+        for start in range(0, len(buffer), chunk_size):
+            yield encode(buffer[start : start + chunk_size])
+
+
+def _extract_buffers(
+    simple_objects: object, min_size: int, buffer_types: tuple = (bytes, bytearray, memoryview)
+) -> Tuple[object, list]:
+    """Replaces the binaries of at least min_size bytes of simplified objects by
+    msgpack extension types referencing them.
+
+    Args:
+        simple_objects: simplified objects
+        min_size: minimum size of the binaries to replace
+        buffer_types: types of the binaries to replace
+
+    Returns:
+        tuple: the simplified objects, where tuples have been converted to
+            lists, and the list of binaries which were replaced.
+    """
+    buffers = []
+    root = [simple_objects]
+    # collections to scan, with the list and index where they are stored
+    stack = [(root, 0)]
+
+    while stack:
+        parent, index = stack.pop()
+        pieces = list(parent[index])
+        parent[index] = pieces
+
+        for i, item in enumerate(pieces):
+            item_type = type(item)
+            if item_type in (list, tuple):
+                stack.append((pieces, i))
+            elif item_type in buffer_types:
+                size = memoryview(item).nbytes
+                if size >= min_size:
+                    reference = struct.pack(">IQ", len(buffers), size)
+                    pieces[i] = msgpack.ExtType(STREAM_BUFFER_EXT, reference)
+                    buffers.append(item)
+
+    return root[0], buffers
+
+
+class StreamDeserializer:
+    """Rebuilds an object from the chunks produced by serialize_stream.
+
+    The binaries sent apart from the first chunk are allocated once and filled
+    in place as the chunks arrive, so only one chunk is held in addition to
+    the object being received.
+
+    Args:
+        worker (AbstractWorker): the worker which is acquiring the object
+        compressed (bool): whether the chunks were compressed by serialize_stream
+
+    Attributes:
+        last_feed_time: the time.monotonic() time of the last chunk received
+    """
+
+    def __init__(self, worker: AbstractWorker = None, compressed: bool = True):
+        self.worker = worker
+        self.compressed = compressed
+        self.last_feed_time = time.monotonic()
+        self.simple_objects = None
+        self.buffers = {}
+        self._buffer_index = 0
+        self._offset = 0
+
+    @property
+    def done(self) -> bool:
+        """True when all the chunks have been received."""
+        return self.simple_objects is not None and self._buffer_index == len(self.buffers)
+
+    def feed(self, chunk: bin) -> bool:
+        """Adds the next chunk of the stream.
+
+        Returns:
+            bool: True when all the chunks have been received.
+        """
+        self.last_feed_time = time.monotonic()
+        if self.compressed:
+            chunk = _decompress(chunk)
+
+        if self.simple_objects is None:
+            self.simple_objects = msgpack.loads(chunk, ext_hook=self._allocate_buffer)
+        else:
+            buffer = self.buffers[self._buffer_index]
+            buffer[self._offset : self._offset + len(chunk)] = chunk
+            self._offset += len(chunk)
+            if self._offset == len(buffer):
+                self._buffer_index += 1
+                self._offset = 0
+
+        return self.done
+
+    def result(self) -> object:
+        """Returns the deserialized object once all the chunks have been received."""
+        if not self.done:
+            raise RuntimeError("The stream is incomplete, more chunks are expected")
+
+        worker = self.worker
+        if worker is None:
+            worker = syft.torch.hook.local_worker
+        return _detail(worker, self.simple_objects)
+
+    def _allocate_buffer(self, code: int, data: bin) -> object:
+        if code != STREAM_BUFFER_EXT:
+            return msgpack.ExtType(code, data)
+
+        index, size = struct.unpack(">IQ", data)
+        self.buffers[index] = bytearray(size)
+        return self.buffers[index]
+
+
 def _serialize_tensor(tensor) -> bin:
     """Serialize the tensor using as default Torch serialization strategy
     This function can be overridden to provide different tensor serialization strategies
@@ -230,20 +578,71 @@ def numpy_tensor_serializer(tensor: torch.Tensor) -> bin:
         tensor = tensor.detach()
 
     np_tensor = tensor.numpy()
-    outfile = TemporaryFile()
-    numpy.save(outfile, np_tensor)
-    # Simulate close and open by calling seek
-    outfile.seek(0)
-    return outfile.read()
+    outfile = io.BytesIO()
+    numpy.save(outfile, np_tensor, allow_pickle=False)
+    return outfile.getvalue()
+
+
+def _read_npy_header(tensor_bin) -> tuple:
+    """Parses the header of a binary in npy format.
+
+    Returns:
+        tuple: (shape, fortran_order, dtype, offset) where offset is the
+        position of the array data in the binary
+    """
+    stream = io.BytesIO(tensor_bin)
+    version = numpy.lib.format.read_magic(stream)
+    if version == (1, 0):
+        shape, fortran_order, dtype = numpy.lib.format.read_array_header_1_0(stream)
+    else:
+        shape, fortran_order, dtype = numpy.lib.format.read_array_header_2_0(stream)
+    return shape, fortran_order, dtype, stream.tell()
+
+
+def _numpy_to_tensor(np_tensor: numpy.ndarray, shape: tuple, fortran_order: bool) -> torch.Tensor:
+    """Builds a Torch tensor on the memory of a flat numpy array.
+
+    Torch tensors can be modified in place, so the array is copied unless its
+    memory is writable and aligned for its dtype: arrays backed by immutable
+    bytes (such as the binaries returned by msgpack) are never modified.
+    """
+    if not (np_tensor.flags.writeable and np_tensor.flags.aligned):
+        np_tensor = np_tensor.copy()
+
+    if fortran_order:
+        np_tensor = np_tensor.reshape(shape[::-1]).transpose()
+    else:
+        np_tensor = np_tensor.reshape(shape)
+
+    return torch.from_numpy(np_tensor)
 
 
 def numpy_tensor_deserializer(tensor_bin) -> torch.Tensor:
-    """"Strategy to deserialize a binary input in npy format into a Torch tensor"""
+    """"Strategy to deserialize a binary input in npy format into a Torch tensor
+
+    The tensor is built on top of tensor_bin if it is writable (e.g. a
+    bytearray), and on a copy of its data otherwise.
+    """
+    shape, fortran_order, dtype, offset = _read_npy_header(tensor_bin)
+    np_tensor = numpy.frombuffer(tensor_bin, dtype=dtype, offset=offset)
+    return _numpy_to_tensor(np_tensor, shape, fortran_order)
+
+
+def numpy_tensor_mmap_deserializer(tensor_bin) -> torch.Tensor:
+    """"Strategy to deserialize a binary input in npy format into a Torch tensor
+    backed by a memory mapped temporary file.
+
+    This is meant for very large payloads: once tensor_bin is released, the
+    tensor data can be paged out by the OS instead of being held in memory.
+    """
+    shape, fortran_order, dtype, offset = _read_npy_header(tensor_bin)
     input_file = TemporaryFile()
     input_file.write(tensor_bin)
-    # read data from file
-    input_file.seek(0)
-    return torch.from_numpy(numpy.load(input_file))
+    input_file.flush()
+
+    # copy-on-write mapping, so the tensor can be modified in place
+    np_tensor = numpy.memmap(input_file, dtype=dtype, mode="c", offset=offset)
+    return _numpy_to_tensor(np_tensor, shape, fortran_order)
 
 
 def torch_tensor_serializer(tensor) -> bin:
@@ -259,6 +658,56 @@ def torch_tensor_deserializer(tensor_bin) -> torch.Tensor:
     return torch.load(bin_tensor_stream)
 
 
+def raw_tensor_serializer(tensor: torch.Tensor) -> tuple:
+    """Strategy to serialize a tensor as its raw data buffer.
+
+    Instead of pickling the tensor, the dtype, shape and strides are sent along
+    with a memoryview on the contiguous data, which msgpack writes directly as
+    a binary field.
+
+    Only the dtypes numpy can represent are supported (see NUMPY_DTYPES), the
+    other tensors are serialized with torch_tensor_serializer.
+
+    Returns:
+        tuple: (numpy dtype string, shape, strides, requires_grad, data buffer)
+    """
+    requires_grad = tensor.requires_grad
+    tensor = tensor.detach().contiguous()
+
+    np_tensor = tensor.numpy()
+    data = memoryview(np_tensor.reshape(-1).view(numpy.uint8))
+    return (np_tensor.dtype.str, tuple(tensor.shape), tensor.stride(), requires_grad, data)
+
+
+def raw_tensor_deserializer(tensor_tuple) -> torch.Tensor:
+    """Strategy to deserialize the output of raw_tensor_serializer into a Torch tensor.
+
+    The tensor is built on top of the received buffer without copying it if
+    the buffer is writable, e.g. a frame received out of band, and on a copy
+    of it otherwise.
+    """
+    dtype, shape, strides, requires_grad, data = tensor_tuple
+    if isinstance(dtype, bytes):
+        dtype = dtype.decode("utf-8")
+
+    np_tensor = numpy.frombuffer(data, dtype=dtype)
+    tensor = _numpy_to_tensor(np_tensor, np_tensor.shape, False)
+
+    tensor = tensor.as_strided(tuple(shape), tuple(strides))
+    if requires_grad:
+        tensor.requires_grad_()
+    return tensor
+
+
+def _copy_tensor(tensor: torch.Tensor) -> torch.Tensor:
+    """Copies the data of a tensor, as torch.save would serialize it: wrappers
+    are not forwarded the copy to their child and requires_grad is kept."""
+    with torch.no_grad():
+        copy = tensor.native_clone()
+    copy.requires_grad = tensor.requires_grad
+    return copy
+
+
 # Chosen Compression Algorithm
 
 
@@ -308,20 +757,260 @@ def apply_no_compression(decompressed_input_bin) -> tuple:
     return decompressed_input_bin, NO_COMPRESSION
 
 
-def _compress(decompressed_input_bin: bin) -> bin:
+class CompressionPolicy:
+    """Compression scheme choosing the compression to apply per message.
+
+    An instance can be used as compression scheme with
+    syft.serde._apply_compress_scheme = CompressionPolicy(). For each binary:
+    - binaries smaller than min_size are not compressed,
+    - the byte entropy of a prefix of sample_size bytes is used to estimate
+      how compressible the binary is: above max_entropy bits per byte (random
+      looking data like additive shares or float weights) no compression is
+      applied, below zstd_max_entropy ZSTD is used as it has a better ratio,
+      LZ4 is used otherwise.
+
+    The time spent and bytes processed by each scheme are accumulated in
+    self.stats, see also bytes_saved().
+
+    Args:
+        min_size (int): size in bytes below which binaries are not compressed
+        sample_size (int): number of bytes used to estimate the entropy
+        max_entropy (float): entropy (bits per byte) above which binaries
+            are not compressed
+        zstd_max_entropy (float): entropy (bits per byte) below which
+            binaries are compressed with ZSTD instead of LZ4
+        zstd_level (int): compression level used with ZSTD
+    """
+
+    def __init__(
+        self,
+        min_size: int = 512,
+        sample_size: int = 4096,
+        max_entropy: float = 7.0,
+        zstd_max_entropy: float = 3.0,
+        zstd_level: int = 3,
+    ):
+        self.min_size = min_size
+        self.sample_size = sample_size
+        self.max_entropy = max_entropy
+        self.zstd_max_entropy = zstd_max_entropy
+        self.zstd_level = zstd_level
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.stats = {
+            scheme: {"calls": 0, "time": 0.0, "bytes_in": 0, "bytes_out": 0}
+            for scheme in (NO_COMPRESSION, LZ4, ZSTD)
+        }
+
+    def bytes_saved(self) -> Dict[int, int]:
+        """Returns the number of bytes saved by each compression scheme."""
+        return {
+            scheme: stats["bytes_in"] - stats["bytes_out"] for scheme, stats in self.stats.items()
+        }
+
+    def estimate_entropy(self, decompressed_input_bin) -> float:
+        """Returns the entropy in bits per byte of the beginning of a binary."""
+        sample = numpy.frombuffer(decompressed_input_bin[: self.sample_size], dtype=numpy.uint8)
+        counts = numpy.bincount(sample, minlength=256)
+        probabilities = counts[counts > 0] / len(sample)
+        return float(-(probabilities * numpy.log2(probabilities)).sum())
+
+    def choose_scheme(self, decompressed_input_bin) -> int:
+        if len(decompressed_input_bin) < self.min_size:
+            return NO_COMPRESSION
+
+        entropy = self.estimate_entropy(decompressed_input_bin)
+        if entropy > self.max_entropy:
+            return NO_COMPRESSION
+        elif entropy < self.zstd_max_entropy:
+            return ZSTD
+        else:
+            return LZ4
+
+    def __call__(self, decompressed_input_bin) -> tuple:
+        start = time.perf_counter()
+
+        scheme = self.choose_scheme(decompressed_input_bin)
+        if scheme == LZ4:
+            compress_stream = lz4.frame.compress(decompressed_input_bin)
+        elif scheme == ZSTD:
+            compress_stream = zstd.compress(decompressed_input_bin, self.zstd_level)
+        else:
+            compress_stream = decompressed_input_bin
+
+        stats = self.stats[scheme]
+        stats["calls"] += 1
+        stats["time"] += time.perf_counter() - start
+        stats["bytes_in"] += len(decompressed_input_bin)
+        # _compress sends the input as it is if compression doesn't reduce its size
+        stats["bytes_out"] += min(len(compress_stream), len(decompressed_input_bin))
+
+        return compress_stream, scheme
+
+
+def train_compression_dict(
+    samples: list, dict_size: int = DEFAULT_DICT_SIZE
+) -> zstandard.ZstdCompressionDict:
+    """
+    Trains a zstd dictionary on serialized messages.
+
+    Small messages sharing the same structure, like commands, are too small to
+    be compressed on their own but compress well with a dictionary. The
+    messages recorded by the workers created with log_msgs=True (see
+    worker.msg_history) are typical samples.
+
+    Args:
+        samples (list): serialized messages, as returned by serialize. Messages
+            serialized out of band or in process are skipped.
+        dict_size (int): maximum size in bytes of the dictionary
+
+    Returns:
+        zstandard.ZstdCompressionDict: the dictionary, to be registered with
+        register_compression_dict by every worker using it
+    """
+    samples = [
+        bytes(_decompress(sample))
+        for sample in samples
+        if isinstance(sample, (bytes, bytearray)) and not is_out_of_band(sample)
+    ]
+    return zstandard.train_dictionary(dict_size, samples)
+
+
+def register_compression_dict(compression_dict) -> int:
+    """
+    Makes a zstd dictionary available to compress and decompress binaries.
+
+    Args:
+        compression_dict: a zstandard.ZstdCompressionDict or its binary form,
+            as written by save_compression_dict
+
+    Returns:
+        int: the id of the dictionary, which identifies its version
+    """
+    if not isinstance(compression_dict, zstandard.ZstdCompressionDict):
+        compression_dict = zstandard.ZstdCompressionDict(compression_dict)
+
+    dict_id = compression_dict.dict_id()
+    if dict_id == 0:
+        raise ValueError("Only trained zstd dictionaries, which have an id, can be registered.")
+
+    compression_dict.precompute_compress(level=ZSTD_DICT_LEVEL)
+    _compression_dicts[dict_id] = compression_dict
+    return dict_id
+
+
+def save_compression_dict(compression_dict: zstandard.ZstdCompressionDict, path: str) -> None:
+    """
+    Writes a zstd dictionary to a file, to ship it with the workers using it.
+
+    Args:
+        compression_dict (zstandard.ZstdCompressionDict): the dictionary
+        path (str): the path of the file
+    """
+    with open(path, "wb") as f:
+        f.write(compression_dict.as_bytes())
+
+
+def load_compression_dict(path: str) -> int:
+    """
+    Reads and registers a zstd dictionary written by save_compression_dict.
+
+    Args:
+        path (str): the path of the file
+
+    Returns:
+        int: the id of the dictionary
+    """
+    with open(path, "rb") as f:
+        return register_compression_dict(f.read())
+
+
+def get_compression_dict_ids() -> List[int]:
+    """Returns the ids of the registered zstd dictionaries, the latest registered last."""
+    return list(_compression_dicts.keys())
+
+
+def get_compression_dict_id(binary) -> Union[int, None]:
+    """
+    Returns the id of the zstd dictionary a serialized object was compressed
+    with, or None if it wasn't compressed with a dictionary.
+
+    Args:
+        binary: the output of serialize or serialize_out_of_band
+    """
+    if isinstance(binary, InProcessMessage):
+        return None
+
+    if is_out_of_band(binary):
+        first_frame = memoryview(binary[0] if isinstance(binary, list) else binary)
+        (nb_buffers,) = struct.unpack_from(">I", first_frame, 1)
+        binary = first_frame[5 + 8 * nb_buffers :]
+
+    if binary[0] != ZSTD_DICT:
+        return None
+    return zstandard.get_frame_parameters(binary[1:]).dict_id
+
+
+def _get_compression_dict_context(dict_id: int, context_type: type):
+    """Returns the zstd compressor or decompressor of the current thread using a dictionary."""
+    try:
+        contexts = _compression_dict_contexts.contexts
+    except AttributeError:
+        contexts = _compression_dict_contexts.contexts = {}
+
+    try:
+        return contexts[dict_id, context_type]
+    except KeyError:
+        pass
+
+    try:
+        compression_dict = _compression_dicts[dict_id]
+    except KeyError:
+        raise CompressionNotFoundException(f"zstd dictionary {dict_id} is not registered")
+
+    if context_type is zstandard.ZstdCompressor:
+        context = zstandard.ZstdCompressor(level=ZSTD_DICT_LEVEL, dict_data=compression_dict)
+    else:
+        context = zstandard.ZstdDecompressor(dict_data=compression_dict)
+    contexts[dict_id, context_type] = context
+    return context
+
+
+def apply_zstd_dict_compression(decompressed_input_bin, dict_id: int) -> tuple:
+    """
+    Apply ZSTD compression with a registered dictionary to the input
+
+    Args:
+        :param decompressed_input_bin: the binary to be compressed
+        :param dict_id: the id of the dictionary
+        :return: a tuple (compressed_result, ZSTD_DICT)
+    """
+    compressor = _get_compression_dict_context(dict_id, zstandard.ZstdCompressor)
+    return compressor.compress(decompressed_input_bin), ZSTD_DICT
+
+
+def _compress(decompressed_input_bin: bin, compression_dict_id: int = None) -> bin:
     """
     This function compresses a binary using the function _apply_compress_scheme
     if the input has been already compressed in some step, it will return it as it is
 
     Args:
         decompressed_input_bin (bin): binary to be compressed
+        compression_dict_id (int): if given, the zstd dictionary of this id is
+            used instead of _apply_compress_scheme
 
     Returns:
         bin: a compressed binary
 
     """
 
-    compress_stream, compress_scheme = _apply_compress_scheme(decompressed_input_bin)
+    if compression_dict_id is not None:
+        compress_stream, compress_scheme = apply_zstd_dict_compression(
+            decompressed_input_bin, compression_dict_id
+        )
+    else:
+        compress_stream, compress_scheme = _apply_compress_scheme(decompressed_input_bin)
 
     if len(compress_stream) < len(decompressed_input_bin):
         return compress_scheme.to_bytes(1, byteorder="big") + compress_stream
@@ -351,6 +1040,10 @@ def _decompress(binary: bin) -> bin:
         return lz4.frame.decompress(binary)
     elif compress_scheme == ZSTD:
         return zstd.decompress(binary)
+    elif compress_scheme == ZSTD_DICT:
+        dict_id = zstandard.get_frame_parameters(binary).dict_id
+        decompressor = _get_compression_dict_context(dict_id, zstandard.ZstdDecompressor)
+        return decompressor.decompress(binary)
     elif compress_scheme == NO_COMPRESSION:
         return binary
     else:
@@ -378,7 +1071,15 @@ def _simplify_torch_tensor(tensor: torch.Tensor) -> bin:
         (optinally) is the chain of graident tensors (nested tuple)
     """
 
-    tensor_bin = _serialize_tensor(tensor)
+    if getattr(_serialization_options, "in_process", False):
+        tensor_bin = _copy_tensor(tensor)
+    elif tensor.dtype not in NUMPY_DTYPES:
+        # the raw and numpy strategies can't represent e.g. bfloat16
+        tensor_bin = torch_tensor_serializer(tensor)
+    elif getattr(_serialization_options, "raw_tensors", False):
+        tensor_bin = raw_tensor_serializer(tensor)
+    else:
+        tensor_bin = _serialize_tensor(tensor)
 
     # note we need to do this expicitly because torch.save does not
     # seem to be including .grad by default
@@ -428,7 +1129,18 @@ def _detail_torch_tensor(worker: AbstractWorker, tensor_tuple: tuple) -> torch.T
 
     tensor_id, tensor_bin, chain, grad_chain, tags, description = tensor_tuple
 
-    tensor = _deserialize_tensor(tensor_bin)
+    # tensors serialized with raw_tensor_serializer can be identified by their
+    # format, so they are understood whichever strategy is selected locally
+    if isinstance(tensor_bin, torch.Tensor):
+        # copy passed by reference by serialize_in_process
+        tensor = tensor_bin
+    elif isinstance(tensor_bin, (list, tuple)):
+        tensor = raw_tensor_deserializer(tensor_bin)
+    elif tensor_bin[: len(TORCH_SAVE_MAGIC)] == TORCH_SAVE_MAGIC:
+        # the dtypes numpy can't represent are always serialized by torch.save
+        tensor = torch_tensor_deserializer(tensor_bin)
+    else:
+        tensor = _deserialize_tensor(tensor_bin)
 
     # note we need to do this explicitly because torch.load does not
     # include .grad informatino
@@ -530,124 +1242,70 @@ def _detail_torch_parameter(worker: AbstractWorker, param_tuple: tuple) -> torch
 
 
 # Simplify/Detail Collections (list, set, tuple, etc.)
+#
+# Nested collections are simplified and detailed without recursion by
+# _simplify_nested_collection and _detail_nested_collection, which _simplify
+# and _detail call directly. The functions below are their entries in the
+# simplifiers and detailers tables.
 
 
 def _simplify_collection(my_collection: Collection) -> Collection:
     """
-    This function is designed to search a collection for any objects
-    which may need to be simplified (i.e., torch tensors). It iterates
-    through each object in the collection and calls _simplify on it. Finally,
-    it returns the output collection as the same type as the input collection
-    so that the consuming serialization step knows the correct type info. The
-    reverse function to this function is _detail_collection, which undoes
-    the functionality of this function.
+    Simplifies each object of a tuple, list or set. Sets are returned as
+    lists. The reverse functions are the _detail_collection_* functions.
 
     Args:
         my_collection (Collection): a collection of python objects
 
     Returns:
-        Collection: a collection of the same type as the input of simplified
-            objects.
-
+        Collection: a collection of the simplified objects.
     """
-
-    # Step 0: get collection type for later use and itialize empty list
-    my_type = type(my_collection)
-    pieces = list()
-
-    # Step 1: serialize each part of the collection
-    for part in my_collection:
-        pieces.append(_simplify(part))
-
-    # Step 2: convert back to original type and return serialization
-    if my_type == set:
-        return pieces
-    return my_type(pieces)
+    return _simplify_nested_collection(my_collection)[1]
 
 
 def _detail_collection_list(worker: AbstractWorker, my_collection: Collection) -> Collection:
     """
-    This function is designed to operate in the opposite direction of
-    _simplify_collection. It takes a collection of simple python objects
-    and iterates through it to determine whether objects in the collection
-    need to be converted into more advanced types. In particular, it
-    converts binary objects into torch Tensors where appropriate.
+    Details the objects of a list simplified by _simplify_collection,
+    transforming bytes back to strings.
 
     Args:
         worker: the worker doing the deserialization
         my_collection (Collection): a collection of simple python objects (including binary).
 
     Returns:
-        Collection: a collection of the same type as the input where the objects
-            in the collection have been detailed.
+        list: the detailed objects.
     """
-
-    pieces = list()
-
-    # Step 1: deserialize each part of the collection
-    for part in my_collection:
-        try:
-            pieces.append(_detail(worker, part).decode("utf-8"))  # transform bytes back to string
-        except AttributeError:
-            pieces.append(_detail(worker, part))
-
-    return pieces
+    return _detail_nested_collection(worker, my_collection, _detail_collection_list)
 
 
 def _detail_collection_set(worker: AbstractWorker, my_collection: Collection) -> Collection:
     """
-    This function is designed to operate in the opposite direction of
-    _simplify_collection. It takes a collection of simple python objects
-    and iterates through it to determine whether objects in the collection
-    need to be converted into more advanced types. In particular, it
-    converts binary objects into torch Tensors where appropriate.
+    Details the objects of a set simplified by _simplify_collection,
+    transforming bytes back to strings.
 
     Args:
         worker: the worker doing the deserialization
         my_collection (Collection): a collection of simple python objects (including binary).
 
     Returns:
-        Collection: a collection of the same type as the input where the objects
-            in the collection have been detailed.
+        set: the detailed objects.
     """
-
-    pieces = list()
-
-    # Step 1: deserialize each part of the collection
-    for part in my_collection:
-        try:
-            pieces.append(_detail(worker, part).decode("utf-8"))  # transform bytes back to string
-        except AttributeError:
-            pieces.append(_detail(worker, part))
-    return set(pieces)
+    return _detail_nested_collection(worker, my_collection, _detail_collection_set)
 
 
 def _detail_collection_tuple(worker: AbstractWorker, my_tuple: Tuple) -> Tuple:
     """
-    This function is designed to operate in the opposite direction of
-    _simplify_collection. It takes a tuple of simple python objects
-    and iterates through it to determine whether objects in the collection
-    need to be converted into more advanced types. In particular, it
-    converts binary objects into torch Tensors where appropriate.
-    This is only applicable to tuples. They need special handling because
-    `msgpack` is encoding a tuple as a list.
+    Details the objects of a tuple simplified by _simplify_collection, which
+    `msgpack` encodes as a list.
 
     Args:
         worker: the worker doing the deserialization
         my_tuple (Tuple): a collection of simple python objects (including binary).
 
     Returns:
-        tuple: a collection of the same type as the input where the objects
-            in the collection have been detailed.
+        tuple: the detailed objects.
     """
-
-    pieces = list()
-
-    # Step 1: deserialize each part of the collection
-    for part in my_tuple:
-        pieces.append(_detail(worker, part))
-
-    return tuple(pieces)
+    return _detail_nested_collection(worker, my_tuple, _detail_collection_tuple)
 
 
 # Dictionaries
@@ -655,64 +1313,31 @@ def _detail_collection_tuple(worker: AbstractWorker, my_tuple: Tuple) -> Tuple:
 
 def _simplify_dictionary(my_dict: Dict) -> Dict:
     """
-    This function is designed to search a dict for any objects
-    which may need to be simplified (i.e., torch tensors). It iterates
-    through each key, value in the dict and calls _simplify on it. Finally,
-    it returns the output dict as the same type as the input dict
-    so that the consuming serialization step knows the correct type info. The
-    reverse function to this function is _detail_dictionary, which undoes
-    the functionality of this function.
+    Simplifies both the keys and the values of a dictionary, returned as a
+    list of (key, value) pairs. The reverse function is _detail_dictionary.
 
     Args:
         my_dict (Dict): a dictionary of python objects
 
     Returns:
-        Dict: a dictionary of the same type as the input of simplified
-            objects.
-
+        list: the simplified (key, value) pairs.
     """
-    pieces = list()
-    # for dictionaries we want to simplify both the key and the value
-    for key, value in my_dict.items():
-        pieces.append((_simplify(key), _simplify(value)))
-
-    return pieces
+    return _simplify_nested_collection(my_dict)[1]
 
 
 def _detail_dictionary(worker: AbstractWorker, my_dict: Dict) -> Dict:
     """
-    This function is designed to operate in the opposite direction of
-    _simplify_dictionary. It takes a dictionary of simple python objects
-    and iterates through it to determine whether objects in the collection
-    need to be converted into more advanced types. In particular, it
-    converts binary objects into torch Tensors where appropriate.
+    Details the (key, value) pairs simplified by _simplify_dictionary,
+    transforming bytes back to strings.
 
     Args:
         worker: the worker doing the deserialization
         my_dict (Dict): a dictionary of simple python objects (including binary).
 
     Returns:
-        tuple: a collection of the same type as the input where the objects
-            in the collection have been detailed.
+        dict: the detailed dictionary.
     """
-    pieces = {}
-    # for dictionaries we want to detail both the key and the value
-    for key, value in my_dict:
-        detailed_key = _detail(worker, key)
-        try:
-            detailed_key = detailed_key.decode("utf-8")
-        except AttributeError:
-            pass
-
-        detailed_value = _detail(worker, value)
-        try:
-            detailed_value = detailed_value.decode("utf-8")
-        except AttributeError:
-            pass
-
-        pieces[detailed_key] = detailed_value
-
-    return pieces
+    return _detail_nested_collection(worker, my_dict, _detail_dictionary)
 
 
 # Range
@@ -1100,6 +1725,32 @@ def _detail_multi_pointer_tensor(worker: AbstractWorker, tensor_tuple: tuple) ->
     return tensor
 
 
+def _simplify_tensor_descriptor(descriptor: pointers.TensorDescriptor) -> tuple:
+    """Takes the shape and dtype of a TensorDescriptor and saves them in a tuple.
+
+    Args:
+        descriptor: a TensorDescriptor
+    Returns:
+        tuple: the shape and the name of the dtype (e.g. "float32")
+    """
+    return (tuple(descriptor.shape), _simplify(str(descriptor.dtype).split(".")[-1]))
+
+
+def _detail_tensor_descriptor(
+    worker: AbstractWorker, descriptor_tuple: tuple
+) -> pointers.TensorDescriptor:
+    """This function reconstructs a TensorDescriptor given its shape and dtype name.
+
+    Args:
+        worker: the worker doing the deserialization
+        descriptor_tuple: a tuple holding the shape and the dtype name
+    Returns:
+        TensorDescriptor: a TensorDescriptor
+    """
+    shape, dtype_name = descriptor_tuple
+    return pointers.TensorDescriptor(torch.Size(shape), getattr(torch, _detail(worker, dtype_name)))
+
+
 def _simplify_train_config(train_config: TrainConfig) -> tuple:
     """Takes the attributes of a TrainConfig and saves them in a tuple.
 
@@ -1253,6 +1904,8 @@ def _force_full_detail_worker(worker: AbstractWorker, worker_tuple: tuple) -> tu
     result = sy.VirtualWorker(sy.hook, worker_id, auto_add=auto_add)
     _objects = _detail(worker, _objects)
     result._objects = _objects
+    for obj_id, obj in _objects.items():
+        result.search_index.add(obj_id, obj)
 
     # make sure they weren't accidentally double registered
     for _, obj in _objects.items():
@@ -1360,21 +2013,79 @@ def _simplify(obj: object) -> object:
 
     """
 
-    try:
-        # check to see if there is a simplifier
-        # for this type. If there is, run return
-        # the simplified object
-        current_type = type(obj)
-        result = (simplifiers[current_type][0], simplifiers[current_type][1](obj))
-        return result
+    # check to see if there is a simplifier
+    # for this type. If there is not, then the
+    # object is already a simple python object
+    simplifier = _simplify_table.get(type(obj))
+    if simplifier is None:
+        return obj
 
-    except KeyError:
+    code, simplify_function, is_collection = simplifier
+    if is_collection:
+        return _simplify_nested_collection(obj)
 
-        # if there is not a simplifier for this
-        # object, then the object is already a
-        # simple python object and we can just
-        # return it
-        return obj
+    return (code, simplify_function(obj))
+
+
+def _simplify_nested_collection(obj: object) -> object:
+    """
+    Simplifies nested collections (tuples, lists, sets and dicts) with an
+    explicit stack instead of recursive calls to _simplify.
+
+    Args:
+        obj: a collection which may contain objects to simplify
+
+    Returns:
+        obj: the simplified collection, as a (code, simplified objects) tuple
+    """
+    root = [None]
+    # collections to simplify, with the list and index where their result goes
+    stack = [(obj, root, 0)]
+    # collections containing other collections, in the order they were visited
+    pending = []
+
+    while stack:
+        collection, parent, index = stack.pop()
+        collection_type = type(collection)
+
+        if collection_type is dict:
+            items = [item for key_value in collection.items() for item in key_value]
+        else:
+            items = collection
+
+        pieces = []
+        append = pieces.append
+        has_nested_collection = False
+        for item in items:
+            simplifier = _simplify_table.get(type(item))
+            if simplifier is None:
+                append(item)
+            elif simplifier[2]:
+                # placeholder, filled once the nested collection is simplified
+                stack.append((item, pieces, len(pieces)))
+                append(None)
+                has_nested_collection = True
+            else:
+                append((simplifier[0], simplifier[1](item)))
+
+        if has_nested_collection:
+            pending.append((collection_type, pieces, parent, index))
+        else:
+            parent[index] = _pack_simplified_collection(collection_type, pieces)
+
+    # nested collections were visited after the collections containing them
+    for collection_type, pieces, parent, index in reversed(pending):
+        parent[index] = _pack_simplified_collection(collection_type, pieces)
+
+    return root[0]
+
+
+def _pack_simplified_collection(collection_type: type, pieces: list) -> tuple:
+    if collection_type is tuple:
+        pieces = tuple(pieces)
+    elif collection_type is dict:
+        pieces = list(zip(pieces[::2], pieces[1::2]))
+    return (_simplify_table[collection_type][0], pieces)
 
 
 def _force_full_simplify(obj: object) -> object:
@@ -1417,16 +2128,26 @@ simplifiers = {
     pointers.ObjectWrapper: [19, _simplify_object_wrapper],
     GetNotPermittedError: [20, _simplify_exception],
     ResponseSignatureError: [20, _simplify_exception],
+    QuotaExceededError: [20, _simplify_exception],
     torch.jit.ScriptModule: [21, _simplify_script_module],
     torch.jit.TopLevelTracedModule: [
         21,
         _simplify_script_module,
     ],  # treat as torch.jit.ScriptModule
     TrainConfig: [22, _simplify_train_config],
+    pointers.TensorDescriptor: [23, _simplify_tensor_descriptor],
 }
 
 forced_full_simplifiers = {VirtualWorker: [17, _force_full_simplify_worker]}
 
+# Dispatch table used by _simplify: type -> (code, simplifier, is_collection).
+# Collections are simplified by _simplify_nested_collection. It is built from
+# simplifiers, so it must be rebuilt if simplifiers is modified.
+_simplify_table = {
+    simplifier_type: (code, simplifier, simplifier_type in (tuple, list, set, dict))
+    for simplifier_type, (code, simplifier) in simplifiers.items()
+}
+
 
 def _detail(worker: AbstractWorker, obj: object) -> object:
     """
@@ -1448,11 +2169,93 @@ def _detail(worker: AbstractWorker, obj: object) -> object:
     """
 
     if type(obj) in (list, tuple):
-        return detailers[obj[0]](worker, obj[1])
+        detailer = detailers[obj[0]]
+        if detailer in _iterative_detailers:
+            return _detail_nested_collection(worker, obj[1], detailer)
+        return detailer(worker, obj[1])
     else:
         return obj
 
 
+def _decode_bytes(obj: object) -> object:
+    """Transforms bytes back to string, other objects are returned as they are."""
+    try:
+        return obj.decode("utf-8")
+    except AttributeError:
+        return obj
+
+
+def _detail_nested_collection(
+    worker: AbstractWorker, items: object, collection_detailer: object
+) -> object:
+    """
+    Details nested collections (tuples, lists, sets and dicts) with an explicit
+    stack instead of recursive calls to _detail.
+
+    Args:
+        worker: the worker doing the deserialization
+        items: the simplified objects of the collection
+        collection_detailer: the detailer of the collection type, e.g.
+            _detail_collection_list
+
+    Returns:
+        obj: the detailed collection
+    """
+    root = [None]
+    # collections to detail, with the list and index where their result goes
+    stack = [(items, collection_detailer, root, 0)]
+    # collections containing other collections, in the order they were visited
+    pending = []
+
+    while stack:
+        items, collection_detailer, parent, index = stack.pop()
+
+        if collection_detailer is _detail_dictionary:
+            items = [item for key_value in items for item in key_value]
+
+        pieces = []
+        append = pieces.append
+        has_nested_collection = False
+        for item in items:
+            if type(item) not in (list, tuple):
+                append(item)
+                continue
+
+            detailer = detailers[item[0]]
+            if detailer in _iterative_detailers:
+                # placeholder, filled once the nested collection is detailed
+                stack.append((item[1], detailer, pieces, len(pieces)))
+                append(None)
+                has_nested_collection = True
+            else:
+                append(detailer(worker, item[1]))
+
+        if has_nested_collection:
+            pending.append((collection_detailer, pieces, parent, index))
+        else:
+            parent[index] = _pack_detailed_collection(collection_detailer, pieces)
+
+    # nested collections were visited after the collections containing them
+    for collection_detailer, pieces, parent, index in reversed(pending):
+        parent[index] = _pack_detailed_collection(collection_detailer, pieces)
+
+    return root[0]
+
+
+def _pack_detailed_collection(collection_detailer, pieces: list) -> object:
+    if collection_detailer is _detail_collection_tuple:
+        return tuple(pieces)
+    elif collection_detailer is _detail_collection_list:
+        return [_decode_bytes(piece) for piece in pieces]
+    elif collection_detailer is _detail_collection_set:
+        return set(_decode_bytes(piece) for piece in pieces)
+    else:
+        return {
+            _decode_bytes(key): _decode_bytes(value)
+            for key, value in zip(pieces[::2], pieces[1::2])
+        }
+
+
 detailers = [
     _detail_torch_tensor,
     _detail_torch_parameter,
@@ -1477,4 +2280,13 @@ detailers = [
     _detail_exception,
     _detail_script_module,
     _detail_train_config,
+    _detail_tensor_descriptor,
 ]
+
+# detailers of collections which are run by _detail_nested_collection
+_iterative_detailers = {
+    _detail_collection_tuple,
+    _detail_collection_list,
+    _detail_collection_set,
+    _detail_dictionary,
+}
@@ -4,6 +4,11 @@ from syft.workers.virtual import VirtualWorker  # noqa: F401
 
 from syft.workers.websocket_client import WebsocketClientWorker  # noqa: F401
 from syft.workers.websocket_server import WebsocketServerWorker  # noqa: F401
+from syft.workers.async_websocket_client import AsyncWebsocketClientWorker  # noqa: F401
+from syft.workers.shared_memory_client import SharedMemoryClientWorker  # noqa: F401
+from syft.workers.shared_memory_server import SharedMemoryServerWorker  # noqa: F401
+from syft.workers.socket_client import SocketClientWorker  # noqa: F401
+from syft.workers.socket_server import SocketServerWorker  # noqa: F401
 from syft.workers.tfe import TFEWorker  # noqa: F401
 
 
@@ -0,0 +1,198 @@
+import asyncio
+import concurrent.futures
+import itertools
+import logging
+import ssl
+import struct
+import threading
+import uuid
+from typing import Union
+from typing import List
+
+import torch
+import websockets
+
+import syft as sy
+from syft.codes import MULTIPLEXED_SUBPROTOCOL
+from syft.codes import REQUEST_ID_FORMAT
+from syft.frameworks.torch.tensors.interpreters import AbstractTensor
+from syft.workers import BaseWorker
+from syft.workers.client_mixin import ClientMixin
+
+logger = logging.getLogger(__name__)
+
+REQUEST_ID_SIZE = struct.calcsize(REQUEST_ID_FORMAT)
+
+# event loop running the connections of the clients created without a loop
+_background_loop = None
+_background_loop_lock = threading.Lock()
+
+
+def _get_background_loop() -> asyncio.AbstractEventLoop:
+    """Returns the event loop shared by the clients, running in a daemon thread."""
+    global _background_loop
+    with _background_loop_lock:
+        if _background_loop is None:
+            _background_loop = asyncio.new_event_loop()
+            thread = threading.Thread(
+                target=_background_loop.run_forever, name="syft-websocket-clients", daemon=True
+            )
+            thread.start()
+    return _background_loop
+
+
+class AsyncWebsocketClientWorker(ClientMixin, BaseWorker):
+    def __init__(
+        self,
+        hook,
+        host: str,
+        port: int,
+        secure: bool = False,
+        id: Union[int, str] = 0,
+        is_client_worker: bool = False,
+        log_msgs: bool = False,
+        verbose: bool = False,
+        data: List[Union[torch.Tensor, AbstractTensor]] = None,
+        loop: asyncio.AbstractEventLoop = None,
+    ):
+        """A client forwarding messages to a remote WebsocketServerWorker, which can
+        have many requests in flight on the same connection.
+
+        Each message is prefixed with a request id and the server prefixes its
+        response with the same id, so responses are matched to their request
+        whatever the order they arrive in. The connection is run by an asyncio
+        event loop in a background thread, which is shared by all the clients
+        unless a loop is given.
+
+        Messages are sent as usual through BaseWorker.send_msg, which blocks
+        until the response arrives: several threads can use the same client
+        concurrently. Coroutines running in self.loop can instead await
+        async_send_msg, e.g. to send a message to many workers at once:
+
+            asyncio.run_coroutine_threadsafe(
+                asyncio.gather(*[w.async_send_msg(msg_type, msg) for w in workers]), loop
+            ).result()
+
+        Args:
+            loop: the event loop running the connection, which must run in another
+                thread than the ones sending messages synchronously.
+        """
+        self.port = port
+        self.host = host
+        self.secure = secure
+
+        # identifies this client to the server (see WebsocketServerWorker.client_id)
+        self.client_id = uuid.uuid4().hex
+        self.uri = f"ws://{self.host}:{self.port}/?client_id={self.client_id}"
+        if secure:
+            self.uri = f"wss://{self.host}:{self.port}/?client_id={self.client_id}"
+
+        self.loop = _get_background_loop() if loop is None else loop
+
+        # futures of the requests waiting for their response, by request id
+        self._pending_requests = {}
+        self._request_ids = itertools.count()
+
+        self.ws = self._run(self._connect())
+        self._reader = asyncio.run_coroutine_threadsafe(self._read_responses(), self.loop)
+
+        super().__init__(hook, id, data, is_client_worker, log_msgs, verbose)
+
+        self.use_opcodes = self._send_msg_and_deserialize("opcodes_version") == (
+            sy.torch.opcodes_version
+        )
+
+    def _run(self, coroutine):
+        """Runs a coroutine in self.loop and waits for its result."""
+        try:
+            running_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+        if running_loop is self.loop:
+            coroutine.close()
+            raise RuntimeError(
+                "AsyncWebsocketClientWorker can't block the event loop running its "
+                "connection, use the async_ methods from this loop instead."
+            )
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop).result()
+
+    async def _connect(self):
+        options = {"max_size": None, "ping_timeout": None, "close_timeout": None}
+        if self.secure:
+            ssl_context = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
+            ssl_context.check_hostname = False
+            ssl_context.verify_mode = ssl.CERT_NONE
+            options["ssl"] = ssl_context
+
+        ws = await websockets.connect(self.uri, subprotocols=[MULTIPLEXED_SUBPROTOCOL], **options)
+        if ws.subprotocol != MULTIPLEXED_SUBPROTOCOL:
+            await ws.close()
+            raise RuntimeError(
+                f"{self.uri} doesn't support multiplexed requests, use a WebsocketClientWorker."
+            )
+        return ws
+
+    async def _read_responses(self):
+        """Resolves the futures of the requests as their response arrives."""
+        try:
+            async for response in self.ws:
+                (request_id,) = struct.unpack_from(REQUEST_ID_FORMAT, response)
+                future = self._pending_requests.pop(request_id, None)
+                if future is not None and not future.done():
+                    future.set_result(response[REQUEST_ID_SIZE:])
+        except websockets.ConnectionClosed:
+            pass
+        finally:
+            for future in self._pending_requests.values():
+                if not future.done():
+                    future.set_exception(ConnectionError(f"Connection to {self.uri} closed"))
+            self._pending_requests.clear()
+
+    async def async_recv_msg(self, message: bin) -> bin:
+        """Sends a serialized message to the server and waits for the response,
+        without blocking the other requests. Must be awaited in self.loop."""
+        request_id = next(self._request_ids)
+        future = self.loop.create_future()
+        self._pending_requests[request_id] = future
+
+        header = struct.pack(REQUEST_ID_FORMAT, request_id)
+        try:
+            if isinstance(message, list):
+                # frames of a message serialized out of band, sent as fragments
+                await self.ws.send([header] + message)
+            else:
+                await self.ws.send(header + message)
+        except BaseException:
+            # (no response will come for a request which wasn't sent)
+            self._pending_requests.pop(request_id, None)
+            raise
+
+        return await future
+
+    async def async_send_msg(self, msg_type: int, message: object) -> object:
+        """Coroutine version of BaseWorker.send_msg sending a message to this worker
+        from the local worker. Must be awaited in self.loop."""
+        local_worker = self.hook.local_worker
+        if local_worker._has_msgs_to_send_before(msg_type, self):
+            # the buffered and pipelined messages are sent by a thread which
+            # waits for their responses without blocking the event loop
+            bin_message = await self.loop.run_in_executor(
+                None, local_worker._prepare_msg, msg_type, message, self
+            )
+        else:
+            bin_message = local_worker._prepare_msg(msg_type, message, self)
+        bin_response = await self.async_recv_msg(bin_message)
+        return sy.serde.deserialize(bin_response, worker=self.hook.local_worker)
+
+    def _recv_msg(self, message: bin) -> bin:
+        return self._run(self.async_recv_msg(message))
+
+    def _recv_msg_nowait(self, message: bin) -> concurrent.futures.Future:
+        return asyncio.run_coroutine_threadsafe(self.async_recv_msg(message), self.loop)
+
+    def close(self):
+        """Closes the connection, after sending the deletions buffered for the
+        server, failing the requests still in flight."""
+        self.hook.local_worker.flush_deletions(self)
+        self._run(self.ws.close())
+        self._reader.result()
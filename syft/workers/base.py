@@ -1,6 +1,14 @@
+import asyncio
+import atexit
 import logging
+import threading
+import time
+import weakref
 
 from abc import abstractmethod
+from contextlib import contextmanager
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
 import syft as sy
 
 from syft.frameworks.torch.tensors.interpreters import AbstractTensor
@@ -23,6 +31,50 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+# number of deletions of remote objects buffered for a location reached over a
+# connection before they are sent, by default (see BaseWorker.request_obj_del)
+DELETION_BATCH_SIZE = 64
+
+# marks the threads sending pipelined messages, see BaseWorker._recv_msg_nowait
+_pipeline_thread = threading.local()
+
+
+def _mark_pipeline_thread():
+    _pipeline_thread.active = True
+
+
+def _flush_buffered_deletions(worker_ref: weakref.ref):
+    """Sends the deletions buffered by a worker, if it still exists, at interpreter
+    shutdown (see BaseWorker.request_obj_del)."""
+    worker = worker_ref()
+    if worker is None:
+        return
+    try:
+        worker.flush_deletions()
+    except Exception:  # pragma: no cover
+        # the remote workers might be gone already
+        logger.warning("Couldn't send the deletions buffered by %s", worker)
+
+
+def _in_pipeline_thread() -> bool:
+    """Tells whether the current thread sends pipelined messages. Pointers garbage
+    collected on such a thread must not send messages from it, since it is in the
+    middle of a request to a worker."""
+    return getattr(_pipeline_thread, "active", False)
+
+
+def _in_event_loop_of(location: "BaseWorker") -> bool:
+    """Tells whether the current thread runs the event loop of the connection to
+    a location (see AsyncWebsocketClientWorker), which a blocking request to the
+    location would deadlock."""
+    loop = getattr(location, "loop", None)
+    if loop is None:
+        return False
+    try:
+        return asyncio.get_running_loop() is loop
+    except RuntimeError:
+        return False
+
 
 class BaseWorker(AbstractWorker, ObjectStorage):
     """Contains functionality to all workers.
@@ -65,6 +117,11 @@ class BaseWorker(AbstractWorker, ObjectStorage):
             list of known workers.
     """
 
+    # Whether command names sent to this worker can be replaced by their opcode
+    # (see TorchAttributes.opcodes). Only workers known to share the same opcode
+    # table, because they live in the same process or negotiated it, enable this.
+    use_opcodes = False
+
     def __init__(
         self,
         hook: "sy.TorchHook",
@@ -85,6 +142,45 @@ class BaseWorker(AbstractWorker, ObjectStorage):
         self.verbose = verbose
         self.auto_add = auto_add
         self.msg_history = list()
+        # whether messages sent to this worker should keep the tensors data
+        # out of band (see sy.serde.serialize_out_of_band)
+        self.out_of_band = False
+        # id of the zstd dictionary compressing the messages sent to this worker
+        # (see negotiate_compression_dict)
+        self.compression_dict_id = None
+        # objects being received chunk by chunk, by stream id. Streams which
+        # received no chunk for stream_timeout seconds are dropped
+        self._incoming_streams = {}
+        self.stream_timeout = 600.0
+        # torch functions resolved from their command name, by command name
+        self._command_functions = {}
+        # whether the commands sent to this worker are pipelined (see send_command)
+        self.pipelining = False
+        # responses of the messages pipelined to this worker, checked by flush
+        self._pipelined_requests = []
+        # thread sending the messages pipelined to this worker, in order
+        self._pipeline_executor = None
+        # whether a command, by signature, only returns pointers to its return ids
+        self._command_signatures = {}
+        # commands buffered for this worker while in a batch() block
+        self._batched_commands = None
+        # deletions of remote objects requested by this worker are buffered until
+        # deletion_batch_size of them are pending for a location, or the oldest one
+        # has waited deletion_batch_delay seconds (see request_obj_del). None
+        # batches the deletions for the workers reached over a connection only
+        self.deletion_batch_size = None
+        self.deletion_batch_delay = 1.0
+        # buffered deletions, by location: (ids of the objects, time of the first one)
+        self._pending_deletions = {}
+        self._pending_deletions_lock = threading.Lock()
+        self._flush_deletions_at_exit = False
+        # number of objects deleted, of deletion messages and time spent sending them
+        self.deletion_stats = {"objects": 0, "messages": 0, "time": 0.0, "max_time": 0.0}
+        # maximum number of threads sending a message to several workers at once
+        self.fan_out_max_workers = 32
+        # time (in seconds) each worker took to answer the last message sent to
+        # several workers at once, by worker id (see send_msg_to_many)
+        self.fan_out_timings = {}
 
         # For performance, we cache each
         self._message_router = {
@@ -96,6 +192,9 @@ class BaseWorker(AbstractWorker, ObjectStorage):
             codes.MSGTYPE.GET_SHAPE: self.get_tensor_shape,
             codes.MSGTYPE.SEARCH: self.deserialized_search,
             codes.MSGTYPE.FORCE_OBJ_DEL: self.force_rm_obj,
+            codes.MSGTYPE.OBJ_CHUNK: self.recv_obj_chunk,
+            codes.MSGTYPE.CMD_BATCH: self.execute_command_batch,
+            codes.MSGTYPE.FORCE_OBJ_DEL_BATCH: self.force_rm_objs,
         }
 
         self.load_data(data)
@@ -165,12 +264,56 @@ class BaseWorker(AbstractWorker, ObjectStorage):
         """
         raise NotImplementedError  # pragma: no cover
 
+    def _recv_msg_nowait(self, message: bin) -> Future:
+        """Receives a message without waiting for the response.
+
+        By default, _recv_msg is called by a background thread which receives
+        the messages in order. Workers with an asynchronous transport can
+        override this.
+
+        Args:
+            message: The binary message being received.
+
+        Returns:
+            A future of the binary response.
+        """
+        if self._pipeline_executor is None:
+            self._pipeline_executor = ThreadPoolExecutor(
+                max_workers=1, initializer=_mark_pipeline_thread
+            )
+        return self._pipeline_executor.submit(self._recv_msg, message)
+
+    def flush(self):
+        """Waits for the messages pipelined to this worker.
+
+        Nothing is waited for on the threads sending pipelined messages, whose
+        requests queued behind the current one can't complete before it returns.
+
+        Raises:
+            The first error raised by a pipelined message, if any.
+        """
+        if _in_pipeline_thread():
+            return
+        requests, self._pipelined_requests = self._pipelined_requests, []
+        error = None
+        for request in requests:
+            try:
+                sy.serde.deserialize(request.result(), worker=self.hook.local_worker)
+            except Exception as e:
+                if error is None:
+                    error = e
+        if error is not None:
+            raise error
+
     def remove_worker_from_registry(self, worker_id):
-        """Removes a worker from the dictionary of known workers.
+        """Removes a worker from the dictionary of known workers, and drops the
+        deletions buffered for it.
         Args:
             worker_id: id to be removed
         """
-        del self._known_workers[worker_id]
+        worker = self._known_workers.pop(worker_id)
+        with self._pending_deletions_lock:
+            self._pending_deletions.pop(worker, None)
 
     def remove_worker_from_local_worker_registry(self):
         """Removes itself from the registry of hook.local_worker.
@@ -192,7 +335,9 @@ class BaseWorker(AbstractWorker, ObjectStorage):
                 self.register_obj(tensor)
                 tensor.owner = self
 
-    def send_msg(self, msg_type: int, message: str, location: "BaseWorker") -> object:
+    def send_msg(
+        self, msg_type: int, message: str, location: "BaseWorker", pipelined: bool = False
+    ) -> object:
         """Implements the logic to send messages.
 
         The message is serialized and sent to the specified location. The
@@ -206,20 +351,21 @@ class BaseWorker(AbstractWorker, ObjectStorage):
             message: A string representing the message being received.
             location: A BaseWorker instance that lets you provide the
                 destination to send the message.
+            pipelined: if True, don't wait for the response, which is checked
+                by the next location.flush(). Otherwise, the messages
+                pipelined to the location are flushed before sending this one.
 
         Returns:
             The deserialized form of message from the worker at specified
-            location.
+            location, or None if the message is pipelined.
         """
-        if self.verbose:
-            print(f"worker {self} sending {msg_type} {message} to {location}")
-        # Step 0: combine type and message
-        message = (msg_type, message)
-
-        # Step 1: serialize the message to simple python objects
-        bin_message = sy.serde.serialize(message)
+        # Step 0 and 1: send what must precede the message, and serialize it
+        bin_message = self._prepare_msg(msg_type, message, location, pipelined=pipelined)
 
         # Step 2: send the message and wait for a response
+        if pipelined:
+            location._pipelined_requests.append(location._recv_msg_nowait(bin_message))
+            return None
         bin_response = self._send_msg(bin_message, location)
 
         # Step 3: deserialize the response
@@ -227,6 +373,115 @@ class BaseWorker(AbstractWorker, ObjectStorage):
 
         return response
 
+    def send_msg_to_many(
+        self, msg_type: int, message: object, locations: List["BaseWorker"]
+    ) -> list:
+        """Sends the same message to several locations at once.
+
+        The message is serialized once for all the locations which share the
+        same serialization settings, and is sent to the locations concurrently
+        by threads, so sending to n locations takes about one round trip
+        instead of n. The time each location took to answer is stored in
+        self.fan_out_timings.
+
+        Args:
+            msg_type: A integer representing the message type.
+            message: The message to send.
+            locations: The workers receiving the message.
+
+        Returns:
+            The deserialized responses of the locations, in order.
+
+        Raises:
+            The first error raised by a location, if any.
+        """
+        for location in locations:
+            self._send_buffered_msgs(msg_type, location)
+            if getattr(location, "_pipelined_requests", None):
+                location.flush()
+
+        if self.verbose:
+            print(f"worker {self} sending {msg_type} {message} to {locations}")
+        message = (msg_type, message)
+
+        # locations receiving tensors by reference get their own copies
+        bin_messages = {}
+        for location in locations:
+            key = self._serialization_settings(location)
+            if key not in bin_messages:
+                bin_messages[key] = self._serialize_msg(message, location)
+
+        def send(location):
+            start = time.perf_counter()
+            bin_message = bin_messages[self._serialization_settings(location)]
+            bin_response = self._send_msg(bin_message, location)
+            return bin_response, time.perf_counter() - start
+
+        max_workers = min(len(locations), self.fan_out_max_workers)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(send, locations))
+
+        self.fan_out_timings = {
+            location.id: elapsed for location, (_, elapsed) in zip(locations, results)
+        }
+        return [sy.serde.deserialize(bin_response, worker=self) for bin_response, _ in results]
+
+    def _prepare_msg(
+        self, msg_type: int, message: object, location: "BaseWorker", pipelined: bool = False
+    ) -> bin:
+        """Runs the steps preceding the sending of a message and returns its binary.
+
+        The messages buffered for the location are sent, the messages pipelined
+        to it are flushed unless this one is pipelined too, and the message is
+        serialized with the settings of the location.
+        """
+        self._send_buffered_msgs(msg_type, location)
+        if not pipelined and getattr(location, "_pipelined_requests", None):
+            location.flush()
+
+        if self.verbose:
+            print(f"worker {self} sending {msg_type} {message} to {location}")
+        return self._serialize_msg((msg_type, message), location)
+
+    def _has_msgs_to_send_before(self, msg_type: int, location: "BaseWorker") -> bool:
+        """Tells whether _prepare_msg must send messages to the location (and
+        wait for their response) before a message of type msg_type."""
+        return bool(
+            getattr(location, "_batched_commands", None)
+            or getattr(location, "_pipelined_requests", None)
+            or (msg_type != codes.MSGTYPE.CMD_BATCH and location in self._pending_deletions)
+        )
+
+    def _send_buffered_msgs(self, msg_type: int, location: "BaseWorker"):
+        """Sends the commands batched for the location, then the deletions
+        buffered for it, which go before any other message."""
+        if getattr(location, "_batched_commands", None):
+            commands, location._batched_commands = location._batched_commands, []
+            self._send_batch(commands, location)
+        if msg_type != codes.MSGTYPE.CMD_BATCH and location in self._pending_deletions:
+            self.flush_deletions(location)
+
+    @staticmethod
+    def _serialization_settings(location: "BaseWorker") -> tuple:
+        """Returns what the binary of a message sent to a location depends on."""
+        if getattr(location, "skip_serialization", False):
+            return (location,)
+        return (
+            getattr(location, "out_of_band", False),
+            getattr(location, "compression_dict_id", None),
+        )
+
+    def _serialize_msg(self, message: tuple, location: "BaseWorker") -> bin:
+        """Serializes a message with the settings of the location receiving it."""
+        # (plans receiving messages while they are built have no out_of_band setting)
+        compression_dict_id = getattr(location, "compression_dict_id", None)
+        if getattr(location, "skip_serialization", False):
+            return sy.serde.serialize_in_process(message)
+        elif getattr(location, "out_of_band", False):
+            return sy.serde.serialize_out_of_band(message, compression_dict_id=compression_dict_id)
+        else:
+            return sy.serde.serialize(message, compression_dict_id=compression_dict_id)
+
     def recv_msg(self, bin_message: bin) -> bin:
         """Implements the logic to receive messages.
 
@@ -254,7 +509,17 @@ class BaseWorker(AbstractWorker, ObjectStorage):
         response = self._message_router[msg_type](contents)
 
         # Step 2: Serialize the message to simple python objects
-        bin_response = sy.serde.serialize(response)
+        # (peers sending messages out of band understand responses out of band,
+        # and responses are compressed with the dictionary of the message if any)
+        compression_dict_id = sy.serde.get_compression_dict_id(bin_message)
+        if isinstance(bin_message, sy.serde.InProcessMessage):
+            bin_response = sy.serde.serialize_in_process(response)
+        elif sy.serde.is_out_of_band(bin_message):
+            bin_response = sy.serde.serialize_out_of_band(
+                response, compression_dict_id=compression_dict_id
+            )
+        else:
+            bin_response = sy.serde.serialize(response, compression_dict_id=compression_dict_id)
 
         return bin_response
 
@@ -303,18 +568,10 @@ class BaseWorker(AbstractWorker, ObjectStorage):
 
         assert len(workers) > 0, "Please provide workers to receive the data"
 
-        if len(workers) == 1:
-            worker = workers[0]
-        else:
-            # If multiple workers are provided , you want to send the same tensor
-            # to all the workers. You'll get multiple pointers, or a pointer
-            # with different locations
-            raise NotImplementedError(
-                "Sending to multiple workers is not \
-                                        supported at the moment"
-            )
+        if len(workers) > 1:
+            return self._send_to_many(obj, workers, local_autograd, preinitialize_grad)
 
-        worker = self.get_worker(worker)
+        worker = self.get_worker(workers[0])
 
         if hasattr(obj, "create_pointer"):
             if ptr_id is None:  # Define a remote id if not specified
@@ -336,6 +593,44 @@ class BaseWorker(AbstractWorker, ObjectStorage):
 
         return pointer
 
+    def _send_to_many(
+        self,
+        obj: Union[torch.Tensor, AbstractTensor],
+        workers: List["BaseWorker"],
+        local_autograd=False,
+        preinitialize_grad=False,
+    ) -> object:
+        """Sends the same object to several workers at once (see send_msg_to_many).
+
+        A worker given several times receives the object once: its copies would
+        share the same id.
+
+        Returns:
+            A MultiPointerTensor holding a pointer to each copy of the object,
+            or the object itself if it can't be pointed to.
+        """
+        workers = [self.get_worker(worker) for worker in workers]
+        workers = list({worker.id: worker for worker in workers}.values())
+        self.send_msg_to_many(codes.MSGTYPE.OBJ, obj, workers)
+
+        if not hasattr(obj, "create_pointer"):
+            return obj
+
+        pointers = []
+        for worker in workers:
+            pointer = obj.create_pointer(
+                owner=self,
+                location=worker,
+                id_at_location=obj.id,
+                register=True,
+                ptr_id=sy.ID_PROVIDER.pop(),
+                local_autograd=local_autograd,
+                preinitialize_grad=preinitialize_grad,
+            )
+            pointers.append(pointer.wrap())
+
+        return sy.frameworks.torch.tensors.interpreters.MultiPointerTensor(children=pointers)
+
     def execute_command(self, message: tuple) -> "pointers.PointerTensor":
         """
         Executes commands received from other workers.
@@ -349,12 +644,14 @@ class BaseWorker(AbstractWorker, ObjectStorage):
 
         (command_name, _self, args, kwargs), return_ids = message
 
-        # TODO add kwargs
-        command_name = command_name
+        # Commands can be sent as opcodes, see send_command
+        if type(command_name) == int:
+            command_name = sy.torch.get_command(command_name)
+
         # Handle methods
         if _self is not None:
             if type(_self) == int:
-                _self = self._objects[_self]
+                _self = self.get_obj(_self)
             if type(_self) == str and _self == "self":
                 _self = self
             if sy.torch.is_inplace_method(command_name):
@@ -377,10 +674,14 @@ class BaseWorker(AbstractWorker, ObjectStorage):
 
             sy.torch.command_guard(command_name, "torch_modules")
 
-            paths = command_name.split(".")
-            command = self
-            for path in paths:
-                command = getattr(command, path)
+            try:
+                command = self._command_functions[command_name]
+            except KeyError:
+                paths = command_name.split(".")
+                command = self
+                for path in paths:
+                    command = getattr(command, path)
+                self._command_functions[command_name] = command
 
             response = command(*args, **kwargs)
 
@@ -392,7 +693,7 @@ class BaseWorker(AbstractWorker, ObjectStorage):
                 response = sy.frameworks.torch.hook_args.register_response(
                     command_name, response, list(return_ids), self
                 )
-                return response
+                return self._describe_response(response, return_ids)
             except ResponseSignatureError:
                 return_id_provider = sy.ID_PROVIDER
                 return_id_provider.set_next_ids(return_ids, check_ids=False)
@@ -403,6 +704,79 @@ class BaseWorker(AbstractWorker, ObjectStorage):
                 new_ids = return_id_provider.get_recorded_ids()
                 raise ResponseSignatureError(new_ids)
 
+    def _describe_response(self, response: object, return_ids: List[Union[str, int]]) -> object:
+        """Replaces the registered response of a command which returned a single
+        tensor (None, once the tensor was registered) by the descriptor of the
+        tensor, so that the sender can set the shape and dtype of its pointer.
+
+        Other responses are returned as they are.
+        """
+        if response is None and len(return_ids) == 1:
+            tensor = self._objects.get(return_ids[0])
+            descriptor = sy.frameworks.torch.pointers.TensorDescriptor.describe(tensor)
+            if descriptor is not None:
+                return descriptor
+        return response
+
+    def execute_command_batch(self, commands: List[tuple]) -> list:
+        """
+        Executes, in order, commands received as a single message.
+
+        Args:
+            commands: A list of messages as received by execute_command.
+
+        Returns:
+            The list of the responses of the commands.
+        """
+        return [self.execute_command(command) for command in commands]
+
+    @contextmanager
+    def batch(self):
+        """Buffers the commands sent to this worker and sends them as a single
+        CMD_BATCH message at the end of the block, or before any other message
+        sent to this worker.
+
+        The pointers to the results are created right away, without waiting
+        for the commands to run, so only commands returning tensors should be
+        batched. Errors are raised when the batch is sent. The commands of a
+        block which raises are dropped.
+
+        Example:
+            with bob.batch():
+                y = (x_ptr + 1) * 2 - x_ptr
+        """
+        if self._batched_commands is not None:
+            # already batching
+            yield self
+            return
+
+        self._batched_commands = []
+        try:
+            yield self
+        except BaseException:
+            self._batched_commands = None
+            raise
+
+        commands, self._batched_commands = self._batched_commands, None
+        if commands:
+            self.hook.local_worker._send_batch(commands, self)
+
+    def _send_batch(self, commands: List[tuple], location: "BaseWorker"):
+        """Sends the commands batched for a location as a CMD_BATCH message.
+
+        Raises:
+            ResponseSignatureError: if a command didn't only return tensors, so
+                the pointer created in advance for its result is invalid.
+        """
+        responses = self.send_msg(codes.MSGTYPE.CMD_BATCH, commands, location)
+        for response in responses or []:
+            if not (
+                response is None
+                or type(response) == bytes
+                or isinstance(response, sy.frameworks.torch.pointers.TensorDescriptor)
+            ):
+                raise ResponseSignatureError()
+
     def send_command(
         self, recipient: "BaseWorker", message: str, return_ids: str = None
     ) -> Union[List["pointers.PointerTensor"], "pointers.PointerTensor"]:
@@ -421,13 +795,44 @@ class BaseWorker(AbstractWorker, ObjectStorage):
         if return_ids is None:
             return_ids = [sy.ID_PROVIDER.pop()]
 
+        # When the recipient is pipelining, commands which are known to only return
+        # pointers to their return ids are sent without waiting for the response
+        pipelining = getattr(recipient, "pipelining", False)
+        pipelined = False
+        if pipelining:
+            command_name, _, args, kwargs = message
+            signature = (command_name, len(args), tuple(kwargs or ()))
+            pipelined = self._command_signatures.get(signature, False)
+
+        # Send the command name as a small integer when the recipient shares our opcode table
+        if getattr(recipient, "use_opcodes", False):
+            command_name, *command_args = message
+            message = (sy.torch.get_opcode(command_name), *command_args)
+
         message = (message, return_ids)
 
-        try:
-            ret_val = self.send_msg(codes.MSGTYPE.CMD, message, location=recipient)
-        except ResponseSignatureError as e:
+        # Commands sent to a worker in a batch() block are buffered
+        batched_commands = getattr(recipient, "_batched_commands", None)
+        descriptor = None
+        if batched_commands is not None:
+            batched_commands.append(message)
             ret_val = None
-            return_ids = e.ids_generated
+        else:
+            try:
+                ret_val = self.send_msg(
+                    codes.MSGTYPE.CMD, message, location=recipient, pipelined=pipelined
+                )
+                # the response can describe the shape and dtype of the result
+                if isinstance(ret_val, sy.frameworks.torch.pointers.TensorDescriptor):
+                    descriptor, ret_val = ret_val, None
+            except ResponseSignatureError as e:
+                ret_val = None
+                return_ids = e.ids_generated
+                if pipelining:
+                    self._command_signatures[signature] = False
+            else:
+                if pipelining and not pipelined:
+                    self._command_signatures[signature] = ret_val is None or type(ret_val) == bytes
 
         if ret_val is None or type(ret_val) == bytes:
             responses = []
@@ -437,6 +842,8 @@ class BaseWorker(AbstractWorker, ObjectStorage):
                     id_at_location=return_id,
                     owner=self,
                     id=sy.ID_PROVIDER.pop(),
+                    shape=None if descriptor is None else descriptor.shape,
+                    dtype=None if descriptor is None else descriptor.dtype,
                 )
                 responses.append(response)
 
@@ -463,6 +870,83 @@ class BaseWorker(AbstractWorker, ObjectStorage):
 
         return obj
 
+    def request_obj_del(self, obj_id: Union[str, int], location: "BaseWorker"):
+        """Requests the deletion of a remote object, typically when its pointer
+        is garbage collected.
+
+        If the batch size of the location (see _deletion_batch_size) is more
+        than 1, the deletion is buffered and sent with others in a single
+        message before the next message sent to the location, when the batch
+        size is reached, when a deletion is requested deletion_batch_delay
+        seconds after the first buffered one, on flush_deletions() or at
+        interpreter shutdown. They are all sent by the thread using the
+        location, never in the background. Deletions requested by the threads
+        sending pipelined messages or running the event loop of the connection
+        to the location are always buffered.
+
+        Args:
+            obj_id: A string or integer id of the object to delete.
+            location: The worker holding the object.
+        """
+        can_send = not (_in_pipeline_thread() or _in_event_loop_of(location))
+        batch_size = self._deletion_batch_size(location)
+        if batch_size <= 1 and can_send:
+            self._send_deletions([obj_id], location)
+            return
+
+        if not self._flush_deletions_at_exit:
+            # (a weak reference, so that the handler doesn't keep the worker alive)
+            atexit.register(_flush_buffered_deletions, weakref.ref(self))
+            self._flush_deletions_at_exit = True
+
+        with self._pending_deletions_lock:
+            if location not in self._pending_deletions:
+                self._pending_deletions[location] = ([], time.monotonic())
+            obj_ids, first_deletion_time = self._pending_deletions[location]
+            obj_ids.append(obj_id)
+            due = (
+                len(obj_ids) >= batch_size
+                or time.monotonic() - first_deletion_time >= self.deletion_batch_delay
+            )
+
+        if due and can_send:
+            self.flush_deletions(location)
+
+    def _deletion_batch_size(self, location: "BaseWorker") -> int:
+        """Returns the number of deletions buffered for a location before they are
+        sent: self.deletion_batch_size if set, otherwise DELETION_BATCH_SIZE for
+        the workers reached over a connection (see ClientMixin), whose round
+        trips are costly, and 1 for the others."""
+        if self.deletion_batch_size is not None:
+            return self.deletion_batch_size
+        return DELETION_BATCH_SIZE if getattr(location, "batch_deletions", False) else 1
+
+    def flush_deletions(self, location: "BaseWorker" = None):
+        """Sends the buffered deletions of remote objects.
+
+        Args:
+            location: The worker whose deletions are sent, all of them if None.
+        """
+        with self._pending_deletions_lock:
+            locations = list(self._pending_deletions) if location is None else [location]
+            pending = [(loc, self._pending_deletions.pop(loc, None)) for loc in locations]
+        for location, deletions in pending:
+            if deletions is not None:
+                self._send_deletions(deletions[0], location)
+
+    def _send_deletions(self, obj_ids: List[Union[str, int]], location: "BaseWorker"):
+        start = time.perf_counter()
+        if len(obj_ids) == 1:
+            self.send_msg(codes.MSGTYPE.FORCE_OBJ_DEL, obj_ids[0], location)
+        else:
+            self.send_msg(codes.MSGTYPE.FORCE_OBJ_DEL_BATCH, obj_ids, location)
+        elapsed = time.perf_counter() - start
+
+        self.deletion_stats["objects"] += len(obj_ids)
+        self.deletion_stats["messages"] += 1
+        self.deletion_stats["time"] += elapsed
+        self.deletion_stats["max_time"] = max(self.deletion_stats["max_time"], elapsed)
+
     def respond_to_obj_req(self, obj_id: Union[str, int]):
         """Returns the deregistered object from registry.
 
@@ -495,15 +979,63 @@ class BaseWorker(AbstractWorker, ObjectStorage):
 
     # SECTION: convenience methods for constructing frequently used messages
 
-    def send_obj(self, obj: object, location: "BaseWorker"):
+    def send_obj(self, obj: object, location: "BaseWorker", chunk_size: int = None):
         """Send a torch object to a worker.
 
         Args:
             obj: A torch Tensor or Variable object to be sent.
             location: A BaseWorker instance indicating the worker which should
                 receive the object.
+            chunk_size: If set, the object is sent in several messages of at most
+                chunk_size bytes (see sy.serde.serialize_stream), which bounds the
+                memory needed to send large tensors.
         """
-        return self.send_msg(codes.MSGTYPE.OBJ, obj, location)
+        if chunk_size is None:
+            return self.send_msg(codes.MSGTYPE.OBJ, obj, location)
+
+        stream_id = sy.ID_PROVIDER.pop()
+        # the chunks are compressed along with the messages they are sent in
+        for chunk in sy.serde.serialize_stream(obj, chunk_size=chunk_size, compress=False):
+            self.send_msg(codes.MSGTYPE.OBJ_CHUNK, (stream_id, chunk), location)
+
+    def recv_obj_chunk(self, message: tuple):
+        """Receives a chunk of an object sent with send_obj(..., chunk_size=...).
+
+        The object is stored with set_obj once all its chunks have been received.
+        A stream is dropped if one of its chunks can't be deserialized, and the
+        streams which received no chunk for stream_timeout seconds are dropped
+        when a new one starts.
+
+        Args:
+            message: A tuple (stream_id, chunk).
+        """
+        stream_id, chunk = message
+
+        if stream_id not in self._incoming_streams:
+            self._drop_stale_streams()
+            self._incoming_streams[stream_id] = sy.serde.StreamDeserializer(
+                worker=self, compressed=False
+            )
+        stream = self._incoming_streams[stream_id]
+
+        try:
+            done = stream.feed(chunk)
+            if done:
+                obj = stream.result()
+        except BaseException:
+            del self._incoming_streams[stream_id]
+            raise
+
+        if done:
+            del self._incoming_streams[stream_id]
+            self.set_obj(obj)
+
+    def _drop_stale_streams(self):
+        """Forgets the streams which received no chunk for stream_timeout seconds."""
+        deadline = time.monotonic() - self.stream_timeout
+        for stream_id, stream in list(self._incoming_streams.items()):
+            if stream.last_feed_time < deadline:
+                del self._incoming_streams[stream_id]
 
     def request_obj(self, obj_id: Union[str, int], location: "BaseWorker") -> object:
         """Returns the requested object from specified location.
@@ -679,8 +1211,51 @@ class BaseWorker(AbstractWorker, ObjectStorage):
         """Removes all objects from the worker."""
 
         self._objects = {}
+        self.search_index.clear()
+        if self.memory_budget is not None:
+            self.memory_budget.clear()
+        with self._client_usage_lock:
+            self.client_usage = {}
+            self._object_clients = {}
         return self
 
+    def compression_dict_ids(self, *args) -> List[int]:
+        """Returns the ids of the zstd dictionaries this worker can decompress
+        messages with, see sy.serde.register_compression_dict."""
+        return sy.serde.get_compression_dict_ids()
+
+    def negotiate_compression_dict(self) -> Union[int, None]:
+        """Chooses the zstd dictionary compressing the messages sent to this worker.
+
+        The latest registered dictionary which this worker knows as well is
+        chosen. If there is none, messages are compressed as usual.
+
+        Returns:
+            The id of the chosen dictionary, or None.
+        """
+        known_dict_ids = set(self.compression_dict_ids())
+        self.compression_dict_id = None
+        for dict_id in reversed(sy.serde.get_compression_dict_ids()):
+            if dict_id in known_dict_ids:
+                self.compression_dict_id = dict_id
+                break
+        return self.compression_dict_id
+
+    def train_compression_dict(self, dict_size: int = None) -> int:
+        """Trains and registers a zstd dictionary on the messages received by
+        this worker, which must have been created with log_msgs=True.
+
+        Args:
+            dict_size: maximum size in bytes of the dictionary.
+
+        Returns:
+            The id of the dictionary.
+        """
+        if dict_size is None:
+            dict_size = sy.serde.DEFAULT_DICT_SIZE
+        compression_dict = sy.serde.train_compression_dict(self.msg_history, dict_size)
+        return sy.serde.register_compression_dict(compression_dict)
+
     @staticmethod
     def is_tensor_none(obj):
         return obj is None
@@ -752,7 +1327,8 @@ class BaseWorker(AbstractWorker, ObjectStorage):
         """Search for a match between the query terms and a tensor's Id, Tag, or Description.
 
         Note that the query is an AND query meaning that every item in the list of strings (query*)
-        must be found somewhere on the tensor in order for it to be included in the results.
+        must be found somewhere on the tensor in order for it to be included in the results. An
+        item is found in a description if it is made of whole words of it (see SearchIndex).
 
         Args:
             query: A list of strings to match against.
@@ -761,37 +1337,18 @@ class BaseWorker(AbstractWorker, ObjectStorage):
         Returns:
             A list of PointerTensors.
         """
+        # If deserialization produced bytes objects instead of strings,
+        # make sure they're turned back to strings for a fair comparison.
+        query = [item.decode("ascii") if isinstance(item, bytes) else item for item in query]
+
         results = list()
-        for key, obj in self._objects.items():
-            found_something = True
-            for query_item in query:
-                # If deserialization produced a bytes object instead of a string,
-                # make sure it's turned back to a string or a fair comparison.
-                if isinstance(query_item, bytes):
-                    query_item = query_item.decode("ascii")
-
-                match = False
-                if query_item == str(key):
-                    match = True
-
-                if isinstance(obj, torch.Tensor):
-                    if obj.tags is not None:
-                        if query_item in obj.tags:
-                            match = True
-
-                    if obj.description is not None:
-                        if query_item in obj.description:
-                            match = True
-
-                if not match:
-                    found_something = False
-
-            if found_something:
-                # set garbage_collect_data to False because if we're searching
-                # for a tensor we don't own, then it's probably someone else's
-                # decision to decide when to delete the tensor.
-                ptr = obj.create_pointer(garbage_collect_data=False, owner=sy.local_worker).wrap()
-                results.append(ptr)
+        for key in self.search_index.search(*query):
+            obj = self._objects[key]
+            # set garbage_collect_data to False because if we're searching
+            # for a tensor we don't own, then it's probably someone else's
+            # decision to decide when to delete the tensor.
+            ptr = obj.create_pointer(garbage_collect_data=False, owner=sy.local_worker).wrap()
+            results.append(ptr)
 
         return results
 
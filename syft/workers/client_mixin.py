@@ -0,0 +1,64 @@
+from syft.codes import MSGTYPE
+
+
+class ClientMixin:
+    """The methods shared by the workers which forward all messages to a remote
+    server worker, whatever the transport.
+
+    The messages are sent by the local worker (see BaseWorker.send_msg), so
+    that they go after the messages batched, buffered or pipelined for the
+    server, and are serialized with the settings negotiated with it.
+    """
+
+    # the deletions of the remote objects are sent in batches by default (see
+    # BaseWorker.request_obj_del)
+    batch_deletions = True
+
+    def _send_msg(self, message: bin, location) -> bin:
+        raise RuntimeError(
+            "_send_msg should never get called on a ",
+            f"{type(self).__name__}. Did you accidentally "
+            f"make hook.local_worker a {type(self).__name__}?",
+        )
+
+    def _send_msg_and_deserialize(self, command_name: str, *args, **kwargs):
+        msg_type, message = self.create_message_execute_command(
+            command_name=command_name, command_owner="self", *args, **kwargs
+        )
+
+        # Send the message and return the deserialized response.
+        return self.hook.local_worker.send_msg(msg_type, message, location=self)
+
+    def search(self, *query):
+        # Send a message requesting the server to search among its objects
+        return self.hook.local_worker.send_msg(MSGTYPE.SEARCH, query, location=self)
+
+    def compression_dict_ids(self, *args):
+        return self._send_msg_and_deserialize("compression_dict_ids")
+
+    def list_objects_remote(self):
+        return self._send_msg_and_deserialize("list_objects")
+
+    def objects_count_remote(self):
+        return self._send_msg_and_deserialize("objects_count")
+
+    def memory_usage_remote(self):
+        """Returns the bytes of the objects this client stored on the server and its quota."""
+        return self._send_msg_and_deserialize("memory_usage")
+
+    def __str__(self):
+        """Returns the string representation of a client worker.
+
+        A to-string method for client workers that includes information from the server
+
+        Returns:
+            The Type and ID of the worker
+
+        """
+        out = "<"
+        out += str(type(self)).split("'")[1].split(".")[-1]
+        out += " id:" + str(self.id)
+        out += " #objects local:" + str(len(self._objects))
+        out += " #objects remote: " + str(self.objects_count_remote())
+        out += ">"
+        return out
@@ -0,0 +1,36 @@
+import threading
+
+import syft as sy
+from syft.exceptions import GetNotPermittedError
+from syft.exceptions import QuotaExceededError
+from syft.exceptions import ResponseSignatureError
+
+
+class ServerMixin:
+    """The methods shared by the workers serving remote client workers,
+    whatever the transport.
+
+    The state of a worker is not thread safe: the messages are processed one at
+    a time, whatever the number of threads serving the connections.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self._recv_lock = threading.Lock()
+        super().__init__(*args, **kwargs)
+
+    def _recv_msg(self, message: bin) -> bin:
+        """Processes a message, forwarding the errors meant for the client."""
+        try:
+            with self._recv_lock:
+                return self.recv_msg(message)
+        except (ResponseSignatureError, GetNotPermittedError, QuotaExceededError) as e:
+            return sy.serde.serialize(e)
+
+    def list_objects(self, *args):
+        return str(self._objects)
+
+    def objects_count(self, *args):
+        return len(self._objects)
+
+    def opcodes_version(self, *args):
+        return sy.torch.opcodes_version
@@ -0,0 +1,162 @@
+"""
+Transport of the messages exchanged by SharedMemoryClientWorker and
+SharedMemoryServerWorker, which run in different processes of the same host.
+
+Messages are lists of frames, such as the ones of sy.serde.serialize_out_of_band.
+Small frames are sent inline over a Unix domain socket. Frames of at least
+shm_min_size bytes (the data of large tensors) are written to a memory mapped
+file in /dev/shm and only the name of the file goes through the socket. The
+receiver maps the file and deserializes the tensors on top of the mapping, so
+their data is never copied through the socket.
+
+A message is sent as:
+- the number of frames (4 bytes)
+- for each frame, its kind (1 byte) and size (8 bytes), followed by the length
+  (2 bytes) and the name of its file for frames in shared memory
+- the content of the inline frames
+"""
+import mmap
+import os
+import socket
+import struct
+import tempfile
+from typing import List
+
+# directory of the shared memory segments, which lives in memory on linux
+SHM_DIR = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+# prefix of the names of the segments
+SEGMENT_PREFIX = "syft-"
+# minimum size of the frames sent in shared memory
+SHM_MIN_SIZE = 2 ** 16
+
+# kinds of frame
+INLINE_FRAME = 0
+SHM_FRAME = 1
+
+
+def send_frames(sock: socket.socket, frames: List[bin], shm_min_size: int = SHM_MIN_SIZE):
+    """Sends a message made of frames over a Unix domain socket.
+
+    Args:
+        sock: the connected socket
+        frames: the frames of the message
+        shm_min_size: minimum size of the frames sent in shared memory
+    """
+    table = [struct.pack(">I", len(frames))]
+    inline_frames = []
+    paths = []
+    try:
+        for frame in frames:
+            frame = memoryview(frame).cast("B")
+            if frame.nbytes >= max(shm_min_size, 1):
+                path = _write_segment(frame)
+                paths.append(path)
+                name = os.path.basename(path).encode("utf-8")
+                table.append(struct.pack(">BQH", SHM_FRAME, frame.nbytes, len(name)) + name)
+            else:
+                table.append(struct.pack(">BQ", INLINE_FRAME, frame.nbytes))
+                inline_frames.append(frame)
+
+        sock.sendall(b"".join(table))
+        for frame in inline_frames:
+            sock.sendall(frame)
+    except BaseException:
+        # the receiver won't map the segments which were not announced
+        for path in paths:
+            _unlink(path)
+        raise
+
+
+def recv_frames(sock: socket.socket) -> List[bin]:
+    """Receives a message sent by send_frames.
+
+    The segments in shared memory are unlinked once mapped, the memory is
+    released when the frames referencing it are garbage collected.
+
+    Returns:
+        list: the frames of the message, memoryviews on the shared memory for
+            the frames which were sent in it.
+
+    Raises:
+        ConnectionError: if the connection is closed
+    """
+    (nb_frames,) = struct.unpack(">I", _recv_exactly(sock, 4))
+
+    kinds = []
+    for _ in range(nb_frames):
+        kind, size = struct.unpack(">BQ", _recv_exactly(sock, 9))
+        if kind == SHM_FRAME:
+            (name_size,) = struct.unpack(">H", _recv_exactly(sock, 2))
+            kinds.append((kind, size, _recv_exactly(sock, name_size).decode("utf-8")))
+        else:
+            kinds.append((kind, size, None))
+
+    frames = []
+    try:
+        for kind, size, name in kinds:
+            if kind == SHM_FRAME:
+                frames.append(_read_segment(name, size))
+            else:
+                frames.append(_recv_exactly(sock, size))
+    except BaseException:
+        # nobody else would unlink the segments announced but not mapped yet
+        # (the one which failed, if it was opened, is unlinked already)
+        for kind, _, name in kinds[len(frames) :]:
+            if kind == SHM_FRAME and _is_segment_name(name):
+                _unlink(os.path.join(SHM_DIR, name))
+        raise
+    return frames
+
+
+def _recv_exactly(sock: socket.socket, size: int) -> bytearray:
+    buffer = bytearray(size)
+    view = memoryview(buffer)
+    received = 0
+    while received < size:
+        nbytes = sock.recv_into(view[received:])
+        if nbytes == 0:
+            raise ConnectionError("Connection closed by the peer")
+        received += nbytes
+    return buffer
+
+
+def _write_segment(frame: memoryview) -> str:
+    """Copies a frame to a new shared memory segment and returns its path."""
+    fd, path = tempfile.mkstemp(prefix=SEGMENT_PREFIX, dir=SHM_DIR)
+    try:
+        os.ftruncate(fd, frame.nbytes)
+        with mmap.mmap(fd, frame.nbytes) as segment:
+            segment[:] = frame
+    except BaseException:
+        _unlink(path)
+        raise
+    finally:
+        os.close(fd)
+    return path
+
+
+def _read_segment(name: str, size: int) -> memoryview:
+    """Maps a shared memory segment and unlinks it."""
+    if not _is_segment_name(name):
+        raise ValueError(f"Invalid shared memory segment {name}")
+    path = os.path.join(SHM_DIR, name)
+    fd = os.open(path, os.O_RDWR)
+    try:
+        segment = mmap.mmap(fd, size)
+    finally:
+        os.close(fd)
+        _unlink(path)
+    return memoryview(segment)
+
+
+def _is_segment_name(name: str) -> bool:
+    """Tells whether a name announced by the peer is the one of a segment, rather
+    than e.g. the path of another file."""
+    return name.startswith(SEGMENT_PREFIX) and os.path.basename(name) == name
+
+
+def _unlink(path: str):
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
@@ -0,0 +1,77 @@
+import socket
+import threading
+from typing import Union
+from typing import List
+
+import torch
+
+import syft as sy
+from syft.frameworks.torch.tensors.interpreters import AbstractTensor
+from syft.workers import BaseWorker
+from syft.workers.client_mixin import ClientMixin
+from syft.workers.shared_memory import SHM_MIN_SIZE
+from syft.workers.shared_memory import recv_frames
+from syft.workers.shared_memory import send_frames
+
+
+class SharedMemoryClientWorker(ClientMixin, BaseWorker):
+    def __init__(
+        self,
+        hook,
+        path: str,
+        id: Union[int, str] = 0,
+        is_client_worker: bool = False,
+        log_msgs: bool = False,
+        verbose: bool = False,
+        data: List[Union[torch.Tensor, AbstractTensor]] = None,
+        shm_min_size: int = SHM_MIN_SIZE,
+    ):
+        """A client forwarding messages to a SharedMemoryServerWorker running in
+        another process of the same host.
+
+        Messages go through a Unix domain socket, but the data of the large
+        tensors they hold is sent in shared memory (see syft.workers.shared_memory):
+        the server builds the tensors on top of the shared memory instead of
+        receiving their data through the socket, and so does the client with
+        the responses.
+
+        Args:
+            path: the path of the Unix domain socket the server listens on
+            shm_min_size: minimum size of the tensors data sent in shared memory,
+                smaller binaries are sent through the socket
+        """
+        self.path = path
+        self.shm_min_size = shm_min_size
+
+        # the connection carries one request and its response at a time
+        self._lock = threading.Lock()
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.connect(path)
+
+        super().__init__(hook, id, data, is_client_worker, log_msgs, verbose)
+
+        # the data of the tensors is kept apart from the messages (see
+        # sy.serde.serialize_out_of_band), so that it can be sent in shared memory
+        self.out_of_band = True
+        self.use_opcodes = self._send_msg_and_deserialize("opcodes_version") == (
+            sy.torch.opcodes_version
+        )
+
+    def _recv_msg(self, message: bin) -> bin:
+        """Forwards a message to the SharedMemoryServerWorker"""
+        frames = message if isinstance(message, list) else [message]
+        with self._lock:
+            send_frames(self.sock, frames, self.shm_min_size)
+            response = recv_frames(self.sock)
+
+        # a single frame is a complete binary, either serialized out of band
+        # without any tensor data apart, or with sy.serde.serialize
+        if len(response) == 1:
+            return bytes(response[0])
+        return response
+
+    def close(self):
+        """Closes the connection to the server, after sending the deletions
+        buffered for it."""
+        self.hook.local_worker.flush_deletions(self)
+        self.sock.close()
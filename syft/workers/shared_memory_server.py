@@ -0,0 +1,92 @@
+import os
+import socket
+import threading
+from typing import Union
+from typing import List
+
+import torch
+
+from syft.frameworks.torch.tensors.interpreters import AbstractTensor
+from syft.workers.shared_memory import SHM_MIN_SIZE
+from syft.workers.shared_memory import recv_frames
+from syft.workers.shared_memory import send_frames
+from syft.workers.server_mixin import ServerMixin
+from syft.workers.virtual import VirtualWorker
+from syft.federated import FederatedClient
+
+
+class SharedMemoryServerWorker(ServerMixin, VirtualWorker, FederatedClient):
+    def __init__(
+        self,
+        hook,
+        path: str,
+        id: Union[int, str] = 0,
+        log_msgs: bool = False,
+        verbose: bool = False,
+        data: List[Union[torch.Tensor, AbstractTensor]] = None,
+        shm_min_size: int = SHM_MIN_SIZE,
+    ):
+        """A worker serving SharedMemoryClientWorker objects running in other
+        processes of the same host.
+
+        It listens on a Unix domain socket and exchanges the data of the large
+        tensors in shared memory (see syft.workers.shared_memory).
+
+        Args:
+            hook (sy.TorchHook): a normal TorchHook object
+            path (str): the path of the Unix domain socket to listen on
+            id (str or id): the unique id of the worker (string or int)
+            log_msgs (bool): whether or not all messages should be
+                saved locally for later inspection.
+            verbose (bool): a verbose option - will print all messages
+                sent/received to stdout
+            data (dict): any initial tensors the server should be
+                initialized with (such as datasets)
+            shm_min_size (int): minimum size of the tensors data sent back in
+                shared memory, smaller binaries are sent through the socket
+        """
+        self.path = path
+        self.shm_min_size = shm_min_size
+
+        # call BaseWorker constructor
+        super().__init__(hook=hook, id=id, data=data, log_msgs=log_msgs, verbose=verbose)
+
+    def _handler(self, connection: socket.socket):
+        """Processes the messages of a client, in order, until it disconnects.
+
+        Each connection is served by its own thread. The state of the worker
+        isn't thread safe, so the messages of all the connections are processed
+        one at a time (see ServerMixin).
+
+        Args:
+            connection: the connection to the client
+        """
+        with connection:
+            while True:
+                try:
+                    frames = recv_frames(connection)
+                except ConnectionError:
+                    return
+
+                # a single frame is a complete binary
+                message = bytes(frames[0]) if len(frames) == 1 else frames
+                response = self._recv_msg(message)
+
+                if not isinstance(response, list):
+                    response = [response]
+                send_frames(connection, response, self.shm_min_size)
+
+    def start(self):
+        """Start the server"""
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server.bind(self.path)
+        server.listen()
+
+        with server:
+            while True:
+                connection, _ = server.accept()
+                thread = threading.Thread(target=self._handler, args=(connection,), daemon=True)
+                thread.start()
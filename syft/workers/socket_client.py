@@ -0,0 +1,99 @@
+import socket
+import struct
+import threading
+from typing import Union
+from typing import List
+
+import torch
+
+import syft as sy
+from syft.codes import FRAME_LENGTH_FORMAT
+from syft.frameworks.torch.tensors.interpreters import AbstractTensor
+from syft.workers import BaseWorker
+from syft.workers.client_mixin import ClientMixin
+
+FRAME_LENGTH_SIZE = struct.calcsize(FRAME_LENGTH_FORMAT)
+
+
+class SocketClientWorker(ClientMixin, BaseWorker):
+    def __init__(
+        self,
+        hook,
+        host: str = None,
+        port: int = None,
+        path: str = None,
+        id: Union[int, str] = 0,
+        is_client_worker: bool = False,
+        log_msgs: bool = False,
+        verbose: bool = False,
+        data: List[Union[torch.Tensor, AbstractTensor]] = None,
+    ):
+        """A client forwarding messages to a SocketServerWorker over a plain TCP
+        or Unix domain socket.
+
+        Each message, and each response, is sent as its length followed by the
+        binary: there is no handshake, no text framing and no keep-alive pings,
+        hence less work per message than with a WebsocketClientWorker.
+
+        Args:
+            host: the host of the server, for a TCP connection
+            port: the port of the server, for a TCP connection
+            path: the path of the Unix domain socket of the server, used
+                instead of host and port if given
+        """
+        self.host = host
+        self.port = port
+        self.path = path
+
+        # the connection carries one request and its response at a time
+        self._lock = threading.Lock()
+        self.sock = self._create_connection()
+
+        super().__init__(hook, id, data, is_client_worker, log_msgs, verbose)
+
+        self.use_opcodes = self._send_msg_and_deserialize("opcodes_version") == (
+            sy.torch.opcodes_version
+        )
+
+    def _create_connection(self) -> socket.socket:
+        if self.path is not None:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.connect(self.path)
+        else:
+            sock = socket.create_connection((self.host, self.port))
+            # small messages are sent right away instead of being delayed by
+            # Nagle's algorithm
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        return sock
+
+    def _recv_msg(self, message: bin) -> bin:
+        """Forwards a message to the SocketServerWorker"""
+        # frames of a message serialized out of band are sent one after the
+        # other, without concatenating them
+        frames = message if isinstance(message, list) else [message]
+        size = sum(memoryview(frame).nbytes for frame in frames)
+
+        with self._lock:
+            self.sock.sendall(struct.pack(FRAME_LENGTH_FORMAT, size))
+            for frame in frames:
+                self.sock.sendall(frame)
+
+            (size,) = struct.unpack(FRAME_LENGTH_FORMAT, self._recv_exactly(FRAME_LENGTH_SIZE))
+            return bytes(self._recv_exactly(size))
+
+    def _recv_exactly(self, size: int) -> bytearray:
+        buffer = bytearray(size)
+        view = memoryview(buffer)
+        received = 0
+        while received < size:
+            nbytes = self.sock.recv_into(view[received:])
+            if nbytes == 0:
+                raise ConnectionError("Connection closed by the server")
+            received += nbytes
+        return buffer
+
+    def close(self):
+        """Closes the connection to the server, after sending the deletions
+        buffered for it."""
+        self.hook.local_worker.flush_deletions(self)
+        self.sock.close()
@@ -0,0 +1,122 @@
+from typing import Union
+from typing import List
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import os
+import socket
+import struct
+import torch
+
+from syft.codes import FRAME_LENGTH_FORMAT
+from syft.frameworks.torch.tensors.interpreters import AbstractTensor
+from syft.workers.server_mixin import ServerMixin
+from syft.workers.virtual import VirtualWorker
+from syft.federated import FederatedClient
+
+FRAME_LENGTH_SIZE = struct.calcsize(FRAME_LENGTH_FORMAT)
+
+
+class SocketServerWorker(ServerMixin, VirtualWorker, FederatedClient):
+    def __init__(
+        self,
+        hook,
+        host: str = None,
+        port: int = None,
+        path: str = None,
+        id: Union[int, str] = 0,
+        log_msgs: bool = False,
+        verbose: bool = False,
+        data: List[Union[torch.Tensor, AbstractTensor]] = None,
+        loop=None,
+        max_workers: int = 1,
+    ):
+        """A worker serving SocketClientWorker objects over a plain TCP or Unix
+        domain socket, with asyncio streams.
+
+        Each message, and each response, is sent as its length followed by the
+        binary (see FRAME_LENGTH_FORMAT).
+
+        Args:
+            hook (sy.TorchHook): a normal TorchHook object
+            host (str): the host on which the server should be run
+            port (int): the port on which the server should be run
+            path (str): the path of the Unix domain socket to listen on,
+                instead of host and port
+            id (str or id): the unique id of the worker (string or int)
+            log_msgs (bool): whether or not all messages should be
+                saved locally for later inspection.
+            verbose (bool): a verbose option - will print all messages
+                sent/received to stdout
+            data (dict): any initial tensors the server should be
+                initialized with (such as datasets)
+            loop: the asyncio event loop if you want to pass one in
+                yourself
+            max_workers (int): the number of threads processing messages. The
+                messages of a connection are processed in order. The state of
+                the worker is not thread safe, so the messages of different
+                connections are processed one at a time too: the threads only
+                keep the event loop serving the connections in the meantime.
+        """
+        self.host = host
+        self.port = port
+        self.path = path
+
+        if loop is None:
+            loop = asyncio.new_event_loop()
+
+        # this is the asyncio event loop
+        self.loop = loop
+
+        # messages are processed out of the event loop, so that it keeps
+        # serving the other connections while a long operation runs
+        self.executor = ThreadPoolExecutor(max_workers=max_workers)
+
+        # call BaseWorker constructor
+        super().__init__(hook=hook, id=id, data=data, log_msgs=log_msgs, verbose=verbose)
+
+    async def _handler(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Processes the messages of a client, in order, until it disconnects.
+
+        Args:
+            reader: the stream the messages are read from
+            writer: the stream the responses are written to
+        """
+        sock = writer.get_extra_info("socket")
+        if sock is not None and sock.family in (socket.AF_INET, socket.AF_INET6):
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+        try:
+            while True:
+                try:
+                    header = await reader.readexactly(FRAME_LENGTH_SIZE)
+                except asyncio.IncompleteReadError:
+                    return
+                (size,) = struct.unpack(FRAME_LENGTH_FORMAT, header)
+                message = await reader.readexactly(size)
+
+                # process the message
+                response = await self.loop.run_in_executor(self.executor, self._recv_msg, message)
+
+                # responses serialized out of band are written frame by frame
+                frames = response if isinstance(response, list) else [response]
+                size = sum(memoryview(frame).nbytes for frame in frames)
+                writer.write(struct.pack(FRAME_LENGTH_FORMAT, size))
+                writer.writelines(frames)
+                await writer.drain()
+        finally:
+            writer.close()
+
+    def start(self):
+        """Start the server"""
+        asyncio.set_event_loop(self.loop)
+
+        if self.path is not None:
+            if os.path.exists(self.path):
+                os.unlink(self.path)
+            start_server = asyncio.start_unix_server(self._handler, path=self.path)
+        else:
+            start_server = asyncio.start_server(self._handler, self.host, self.port)
+
+        self.loop.run_until_complete(start_server)
+        self.loop.run_forever()
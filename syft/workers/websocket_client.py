@@ -7,11 +7,15 @@ import websocket
 import time
 import logging
 import ssl
+import threading
+import uuid
 
 import syft as sy
+from syft.codes import BINARY_FRAMING_SUBPROTOCOL
 from syft.codes import MSGTYPE
 from syft.frameworks.torch.tensors.interpreters import AbstractTensor
 from syft.workers import BaseWorker
+from syft.workers.client_mixin import ClientMixin
 
 logger = logging.getLogger(__name__)
 
@@ -19,7 +23,7 @@ logger = logging.getLogger(__name__)
 TIMEOUT_INTERVAL = 9_999_999
 
 
-class WebsocketClientWorker(BaseWorker):
+class WebsocketClientWorker(ClientMixin, BaseWorker):
     def __init__(
         self,
         hook,
@@ -31,87 +35,156 @@ class WebsocketClientWorker(BaseWorker):
         log_msgs: bool = False,
         verbose: bool = False,
         data: List[Union[torch.Tensor, AbstractTensor]] = None,
+        binary_framing: bool = True,
     ):
         """A client which will forward all messages to a remote worker running a
         WebsocketServerWorker and receive all responses back from the server.
+
+        Args:
+            binary_framing: if True (default), offer the server to exchange messages
+                as binary websocket frames. Servers which don't support it make the
+                client fall back to hex-encoded text frames. The framing actually
+                negotiated is available in self.binary_framing.
         """
 
         # TODO get angry when we have no connection params
         self.port = port
         self.host = host
+        self.secure = secure
+        self.request_binary_framing = binary_framing
+        self.binary_framing = False
 
         # creates the connection with the server which gets held open until the
         # WebsocketClientWorker is garbage collected.
 
+        # identifies this client to the server (e.g. for its quota), whatever its
+        # host and across reconnections (see WebsocketServerWorker.client_id)
+        self.client_id = uuid.uuid4().hex
+
         # Secure flag adds a secure layer applying cryptography and authentication
-        self.uri = f"ws://{self.host}:{self.port}"
+        self.uri = f"ws://{self.host}:{self.port}/?client_id={self.client_id}"
         if secure:
-            self.uri = f"wss://{self.host}:{self.port}"
-            ssl_settings = {"cert_reqs": ssl.CERT_NONE}
-            self.ws = websocket.create_connection(
-                self.uri, sslopt=ssl_settings, max_size=None, timeout=TIMEOUT_INTERVAL
-            )
-        else:
-            # Insecure flow
-            # Also avoid the server from timing out on the server-side in case of slow clients
-            self.ws = websocket.create_connection(self.uri, max_size=None, timeout=TIMEOUT_INTERVAL)
+            self.uri = f"wss://{self.host}:{self.port}/?client_id={self.client_id}"
+
+        # the connection carries one request and its response at a time
+        self._lock = threading.Lock()
+        self.ws = self._create_connection()
 
         super().__init__(hook, id, data, is_client_worker, log_msgs, verbose)
 
-    def search(self, *query):
-        # Prepare a message requesting the websocket server to search among its objects
-        message = (MSGTYPE.SEARCH, query)
-        serialized_message = sy.serde.serialize(message)
-        # Send the message and return the deserialized response.
-        response = self._recv_msg(serialized_message)
-        return sy.serde.deserialize(response)
+        self.use_opcodes = self._negotiate_opcodes()
+        self.server_instance_id = self._get_server_instance_id()
 
-    def _send_msg(self, message: bin, location) -> bin:
-        raise RuntimeError(
-            "_send_msg should never get called on a ",
-            "WebsocketClientWorker. Did you accidentally "
-            "make hook.local_worker a WebsocketClientWorker?",
-        )
+    def _create_connection(self) -> websocket.WebSocket:
+        """Opens a websocket connection to the server and negotiates the framing.
+
+        Binary framing is offered as a websocket subprotocol. A server which doesn't
+        know it (older PySyft versions) makes the handshake fail, in which case the
+        connection is opened again without it and messages are hex encoded.
+        """
+        # Avoid the server from timing out on the server-side in case of slow clients
+        options = {"max_size": None, "timeout": TIMEOUT_INTERVAL}
+        if self.secure:
+            options["sslopt"] = {"cert_reqs": ssl.CERT_NONE}
+
+        if self.request_binary_framing:
+            try:
+                ws = websocket.create_connection(
+                    self.uri, subprotocols=[BINARY_FRAMING_SUBPROTOCOL], **options
+                )
+            except websocket.WebSocketException:
+                logger.info("Binary framing refused by %s, using hex-encoded frames", self.uri)
+            else:
+                self.binary_framing = ws.getsubprotocol() == BINARY_FRAMING_SUBPROTOCOL
+                return ws
+
+        self.binary_framing = False
+        # the server might not be the one opcodes and dictionaries were negotiated with
+        self.use_opcodes = False
+        self.compression_dict_id = None
+        return websocket.create_connection(self.uri, **options)
+
+    def _negotiate_opcodes(self) -> bool:
+        """Checks whether the server shares our opcode table.
+
+        Only servers which negotiated binary framing know how to answer the
+        opcodes_version request, older ones keep receiving command names.
+        """
+        if not self.binary_framing:
+            return False
+        return self._send_msg_and_deserialize("opcodes_version") == sy.torch.opcodes_version
 
     def _receive_action(self, message: bin) -> bin:
+        if isinstance(message, list):
+            # frames of a message serialized out of band
+            if self.binary_framing:
+                self._send_fragmented(message)
+                return self.ws.recv()
+            message = b"".join(message)
+
+        if self.binary_framing:
+            self.ws.send_binary(message)
+            return self.ws.recv()
+
         self.ws.send(str(binascii.hexlify(message)))
         response = binascii.unhexlify(self.ws.recv()[2:-1])
         return response
 
-    def _recv_msg(self, message: bin) -> bin:
-        """Forwards a message to the WebsocketServerWorker"""
+    def _send_fragmented(self, frames: List[bin]):
+        """Sends frames as the fragments of a single binary websocket message,
+        without concatenating them."""
+        last = len(frames) - 1
+        for i, frame in enumerate(frames):
+            opcode = websocket.ABNF.OPCODE_BINARY if i == 0 else websocket.ABNF.OPCODE_CONT
+            self.ws.send_frame(websocket.ABNF.create_frame(frame, opcode, fin=int(i == last)))
 
-        response = self._receive_action(message)
-        if not self.ws.connected:
-            logger.warning("Websocket connection closed (worker: %s)", self.id)
-            self.ws.shutdown()
-            time.sleep(0.1)
-            # Avoid timing out on the server-side
-            self.ws = websocket.create_connection(self.uri, max_size=None, timeout=TIMEOUT_INTERVAL)
-            logger.warning("Created new websocket connection")
-            time.sleep(0.1)
-            response = self._receive_action(message)
-            if not self.ws.connected:
-                raise RuntimeError(
-                    "Websocket connection closed and creation of new connection failed."
-                )
-        return response
+    def _get_server_instance_id(self) -> str:
+        """Returns the id of the server process (see WebsocketServerWorker.instance_id).
 
-    def _send_msg_and_deserialize(self, command_name: str, *args, **kwargs):
+        Only servers which negotiated binary framing know this request, None is
+        returned for older ones.
+        """
+        if not self.binary_framing:
+            return None
+        # sent on the connection directly, as it's requested while reconnecting
         message = self.create_message_execute_command(
-            command_name=command_name, command_owner="self", *args, **kwargs
+            command_name="instance_id", command_owner="self"
         )
-
-        # Send the message and return the deserialized response.
-        serialized_message = sy.serde.serialize(message)
-        response = self._recv_msg(serialized_message)
+        response = self._receive_action(sy.serde.serialize(message))
         return sy.serde.deserialize(response)
 
-    def list_objects_remote(self):
-        return self._send_msg_and_deserialize("list_objects")
-
-    def objects_count_remote(self):
-        return self._send_msg_and_deserialize("objects_count")
+    def _recv_msg(self, message: bin) -> bin:
+        """Forwards a message to the WebsocketServerWorker"""
+        with self._lock:
+            response = self._receive_action(message)
+            if not self.ws.connected:
+                logger.warning("Websocket connection closed (worker: %s)", self.id)
+                self.ws.shutdown()
+                time.sleep(0.1)
+                self.ws = self._create_connection()
+                logger.warning("Created new websocket connection")
+                time.sleep(0.1)
+                # the objects of the client are lost if the new connection is served
+                # by another server process, e.g. one sharing the port with reuse_port
+                if self.server_instance_id is not None:
+                    server_instance_id = self._get_server_instance_id()
+                    if server_instance_id != self.server_instance_id:
+                        raise ConnectionError(
+                            f"Reconnected to another server process at {self.uri}, "
+                            "which doesn't hold the objects of the previous connection."
+                        )
+                response = self._receive_action(message)
+                if not self.ws.connected:
+                    raise RuntimeError(
+                        "Websocket connection closed and creation of new connection failed."
+                    )
+            return response
+
+    def compression_dict_ids(self, *args):
+        # only servers which negotiated binary framing know this request
+        if not self.binary_framing:
+            return []
+        return self._send_msg_and_deserialize("compression_dict_ids")
 
     def fit(self, dataset_key, **kwargs):
         # Arguments provided as kwargs as otherwise miss-match
@@ -119,25 +192,5 @@ class WebsocketClientWorker(BaseWorker):
         return_ids = kwargs["return_ids"] if "return_ids" in kwargs else [sy.ID_PROVIDER.pop()]
 
         self._send_msg_and_deserialize("fit", return_ids=return_ids, dataset_key=dataset_key)
-        msg = (MSGTYPE.OBJ_REQ, return_ids[0])
         # Send the message and return the deserialized response.
-        serialized_message = sy.serde.serialize(msg)
-        response = self._recv_msg(serialized_message)
-        return sy.serde.deserialize(response)
-
-    def __str__(self):
-        """Returns the string representation of a Websocket worker.
-
-        A to-string method for websocket workers that includes information from the websocket server
-
-        Returns:
-            The Type and ID of the worker
-
-        """
-        out = "<"
-        out += str(type(self)).split("'")[1].split(".")[-1]
-        out += " id:" + str(self.id)
-        out += " #objects local:" + str(len(self._objects))
-        out += " #objects remote: " + str(self.objects_count_remote())
-        out += ">"
-        return out
+        return self.hook.local_worker.send_msg(MSGTYPE.OBJ_REQ, return_ids[0], location=self)
@@ -3,23 +3,32 @@ from typing import Union
 from typing import List
 
 import asyncio
+from concurrent.futures import ThreadPoolExecutor
 import torch
 import websockets
 import ssl
+import struct
 import sys
+import urllib.parse
+import uuid
 import tblib.pickling_support
 
 tblib.pickling_support.install()
 
-import syft as sy
+from syft.codes import BINARY_FRAMING_SUBPROTOCOL
+from syft.codes import MULTIPLEXED_SUBPROTOCOL
+from syft.codes import REQUEST_ID_FORMAT
 from syft.frameworks.torch.tensors.interpreters import AbstractTensor
+from syft.workers.server_mixin import ServerMixin
 from syft.workers.virtual import VirtualWorker
-from syft.exceptions import GetNotPermittedError
-from syft.exceptions import ResponseSignatureError
 from syft.federated import FederatedClient
 
 
-class WebsocketServerWorker(VirtualWorker, FederatedClient):
+class WebsocketServerWorker(ServerMixin, VirtualWorker, FederatedClient):
+    # maximum number of messages of a connection waiting to be processed, the
+    # next ones are not read from the connection until there's room in its queue
+    max_queued_messages = 16
+
     def __init__(
         self,
         hook,
@@ -32,6 +41,10 @@ class WebsocketServerWorker(VirtualWorker, FederatedClient):
         loop=None,
         cert_path: str = None,
         key_path: str = None,
+        reuse_port: bool = False,
+        memory_budget: int = None,
+        spill_dir: str = None,
+        client_quota: int = None,
     ):
         """This is a simple extension to normal workers wherein
         all messages are passed over websockets. Note that because
@@ -51,71 +64,167 @@ class WebsocketServerWorker(VirtualWorker, FederatedClient):
                 initialized with (such as datasets)
             loop: the asyncio event loop if you want to pass one in
                 yourself
+            reuse_port (bool): if True, the listening socket is opened with
+                SO_REUSEPORT, so that several server processes can listen on the
+                same host and port: the kernel spreads the connections between
+                them. A connection is served by the same process for its whole
+                lifetime, hence the pointers of a client stay valid as long as
+                it stays connected. A client reconnecting after its connection
+                dropped can reach another process, which doesn't know its
+                objects: WebsocketClientWorker detects it (see instance_id) and
+                raises a ConnectionError instead of reconnecting silently.
+            memory_budget (int): if given, the memory (in bytes) the tensors
+                stored can use before the least recently used ones are spilled
+                to disk (see set_memory_budget).
+            spill_dir (str): the directory the tensors are spilled to, required
+                with memory_budget.
+            client_quota (int): if given, the maximum bytes of the tensors each
+                client can store (see set_client_quota). A client is identified
+                by the id it connects with (see client_id).
         """
 
         self.port = port
         self.host = host
         self.cert = cert_path
         self.key = key_path
+        self.reuse_port = reuse_port
+        # identifies this server process, so that clients notice when they
+        # reconnect to another one, which doesn't hold their objects
+        self._instance_id = uuid.uuid4().hex
 
         if loop is None:
             loop = asyncio.new_event_loop()
 
-        # this queue is populated when messages are received
-        # from a client
-        self.broadcast_queue = asyncio.Queue()
-
         # this is the asyncio event loop
         self.loop = loop
 
+        # messages are processed out of the event loop, so that it keeps
+        # receiving and sending frames while a long operation runs. The state of
+        # the worker isn't thread safe, so they are processed one at a time by a
+        # single thread: a long operation delays the messages of all the clients
+        self.executor = ThreadPoolExecutor(max_workers=1)
+
         # call BaseWorker constructor
         super().__init__(hook=hook, id=id, data=data, log_msgs=log_msgs, verbose=verbose)
 
-    async def _consumer_handler(self, websocket: websockets.WebSocketCommonProtocol):
+        if memory_budget is not None:
+            self.set_memory_budget(memory_budget, spill_dir)
+        self.set_client_quota(None, client_quota)
+
+    async def _consumer_handler(
+        self, websocket: websockets.WebSocketCommonProtocol, queue: asyncio.Queue
+    ):
         """This handler listens for messages from WebsocketClientWorker
         objects.
 
         Args:
             websocket: the connection object to receive messages from and
                 add them into the queue.
+            queue: the queue of the messages of this connection.
 
         """
         while True:
             msg = await websocket.recv()
-            await self.broadcast_queue.put(msg)
+            await queue.put(msg)
 
-    async def _producer_handler(self, websocket: websockets.WebSocketCommonProtocol):
+    async def _producer_handler(
+        self, websocket: websockets.WebSocketCommonProtocol, queue: asyncio.Queue
+    ):
         """This handler listens to the queue and processes messages as they
         arrive.
 
         Args:
             websocket: the connection object we use to send responses
                 back to the client.
+            queue: the queue of the messages of this connection.
 
         """
+        # clients which negotiated multiplexed requests prefix their messages
+        # with a request id, which prefixes the response as well
+        multiplexed = websocket.subprotocol == MULTIPLEXED_SUBPROTOCOL
+        request_id_size = struct.calcsize(REQUEST_ID_FORMAT)
+        loop = asyncio.get_event_loop()
+        # the objects stored by the messages of the connection are attributed to it
+        client_id = self.client_id(websocket)
+
         while True:
 
             # get a message from the queue
-            message = await self.broadcast_queue.get()
+            message = await queue.get()
 
-            # convert that string message to the binary it represent
-            message = binascii.unhexlify(message[2:-1])
+            if multiplexed:
+                request_id = message[:request_id_size]
+                message = message[request_id_size:]
 
-            # process the message
-            response = self._recv_msg(message)
+            # clients which negotiated binary framing send bytes frames,
+            # legacy clients send the hex string representation of the binary
+            hex_framing = isinstance(message, str)
+            if hex_framing:
+                message = binascii.unhexlify(message[2:-1])
 
-            # convert the binary to a string representation
-            # (this is needed for the websocket library)
-            response = str(binascii.hexlify(response))
+            # process the message
+            response = await loop.run_in_executor(
+                self.executor, self._recv_client_msg, client_id, message
+            )
 
-            # send the response
+            # answer with the same framing the client used
+            if hex_framing:
+                if isinstance(response, list):
+                    response = b"".join(response)
+                response = str(binascii.hexlify(response))
+            elif multiplexed:
+                if isinstance(response, list):
+                    response = [request_id] + response
+                else:
+                    response = request_id + response
+
+            # send the response (a list of frames, for responses serialized
+            # out of band, is sent as the fragments of a single message)
             await websocket.send(response)
 
-    def _recv_msg(self, message: bin) -> bin:
-        try:
-            return self.recv_msg(message)
-        except (ResponseSignatureError, GetNotPermittedError) as e:
-            return sy.serde.serialize(e)
+    def _recv_client_msg(self, client_id: str, message: bin) -> bin:
+        """Receives a message, attributing the objects it stores to a client."""
+        with self.acting_for(client_id):
+            return self._recv_msg(message)
+
+    @staticmethod
+    def client_id(websocket: websockets.WebSocketCommonProtocol) -> str:
+        """Returns the id of the client of a connection.
+
+        Clients send their id in the query string of the URI they connect to
+        (see WebsocketClientWorker.client_id), the same one when they reconnect,
+        so that they get back the usage of the objects they stored. The id isn't
+        authenticated. Legacy clients, which don't send one, are identified by
+        their host, whose legacy clients share their quota.
+        """
+        # the request is available as websocket.request, or websocket.path for
+        # older websockets versions
+        request = getattr(websocket, "request", None)
+        path = request.path if request is not None else getattr(websocket, "path", "")
+        client_ids = urllib.parse.parse_qs(urllib.parse.urlsplit(path).query).get("client_id")
+        if client_ids:
+            return client_ids[0]
+
+        address = websocket.remote_address
+        if not address:
+            # e.g. a Unix domain socket, whose clients are all local
+            return "localhost"
+        return str(address[0])
+
+    @staticmethod
+    def _select_subprotocol(*args):
+        """Accepts multiplexed requests or binary framing when the client offers it.
+
+        Connections without a subprotocol are accepted as well, so that
+        clients which only speak hex-encoded frames keep working.
+        Depending on the websockets version this is called with either
+        (client_subprotocols, server_subprotocols) or (connection, client_subprotocols).
+        """
+        offered = args[0] if isinstance(args[0], (list, tuple)) else args[1]
+        for subprotocol in (MULTIPLEXED_SUBPROTOCOL, BINARY_FRAMING_SUBPROTOCOL):
+            if subprotocol in offered:
+                return subprotocol
+        return None
 
     async def _handler(self, websocket: websockets.WebSocketCommonProtocol, *unused_args):
         """Setup the consumer and producer response handlers with asyncio.
@@ -126,8 +235,12 @@ class WebsocketServerWorker(VirtualWorker, FederatedClient):
         """
 
         asyncio.set_event_loop(self.loop)
-        consumer_task = asyncio.ensure_future(self._consumer_handler(websocket))
-        producer_task = asyncio.ensure_future(self._producer_handler(websocket))
+
+        # each connection has its own queue, so responses are sent to the
+        # client which sent the message
+        queue = asyncio.Queue(maxsize=self.max_queued_messages)
+        consumer_task = asyncio.ensure_future(self._consumer_handler(websocket, queue))
+        producer_task = asyncio.ensure_future(self._producer_handler(websocket, queue))
 
         done, pending = await asyncio.wait(
             [consumer_task, producer_task], return_when=asyncio.FIRST_COMPLETED
@@ -150,6 +263,9 @@ class WebsocketServerWorker(VirtualWorker, FederatedClient):
                 max_size=None,
                 ping_timeout=None,
                 close_timeout=None,
+                subprotocols=[MULTIPLEXED_SUBPROTOCOL, BINARY_FRAMING_SUBPROTOCOL],
+                select_subprotocol=self._select_subprotocol,
+                reuse_port=self.reuse_port,
             )
         else:
             # Insecure
@@ -160,13 +276,15 @@ class WebsocketServerWorker(VirtualWorker, FederatedClient):
                 max_size=None,
                 ping_timeout=None,
                 close_timeout=None,
+                subprotocols=[MULTIPLEXED_SUBPROTOCOL, BINARY_FRAMING_SUBPROTOCOL],
+                select_subprotocol=self._select_subprotocol,
+                reuse_port=self.reuse_port,
             )
 
         asyncio.get_event_loop().run_until_complete(start_server)
         asyncio.get_event_loop().run_forever()
 
-    def list_objects(self, *args):
-        return str(self._objects)
-
-    def objects_count(self, *args):
-        return len(self._objects)
+    def instance_id(self, *args):
+        """Returns the id of this server process, which changes when the server
+        restarts and differs between the processes sharing a port."""
+        return self._instance_id
@@ -0,0 +1,78 @@
+import pytest
+import torch
+
+
+def test_memory_budget_spills_least_recently_used(workers, tmpdir):
+    bob = workers["bob"]
+    budget = bob.set_memory_budget(2 * 400, spill_dir=str(tmpdir))
+
+    x = torch.rand(100)
+    y = torch.rand(100)
+    z = torch.rand(100)
+    x_ptr, y_ptr, z_ptr = x.send(bob), y.send(bob), z.send(bob)
+
+    # x was the least recently used when z was stored
+    assert budget.stats["spills"] == 1
+    assert budget.stats["resident_bytes"] == 800
+    assert budget.stats["spilled_bytes"] == 400
+    # the spilled tensor is still stored, with its data mapped from disk
+    assert torch.equal(bob._objects[x.id], x)
+
+    # commands transparently bring x back to memory
+    assert torch.equal((x_ptr + z_ptr).get(), x + z)
+    assert budget.stats["misses"] == 1
+    assert budget.stats["hits"] >= 1
+
+    assert torch.equal(x_ptr.get(), x)
+    assert torch.equal(y_ptr.get(), y)
+    assert torch.equal(z_ptr.get(), z)
+    assert budget.stats["resident_bytes"] == 0
+    assert budget.stats["spilled_bytes"] == 0
+
+    bob.set_memory_budget(None)
+    assert bob.memory_budget is None
+
+
+def test_memory_budget_modified_in_place(workers, tmpdir):
+    bob = workers["bob"]
+    bob.set_memory_budget(400, spill_dir=str(tmpdir))
+
+    x_ptr = torch.zeros(100).send(bob)
+    y_ptr = torch.zeros(100).send(bob)
+
+    # x is spilled, then updated in place
+    x_ptr.add_(1)
+    y_ptr.add_(1)
+    assert bob.memory_budget.stats["spills"] >= 2
+
+    assert torch.equal(x_ptr.get(), torch.ones(100))
+    assert torch.equal(y_ptr.get(), torch.ones(100))
+
+    bob.set_memory_budget(None)
+
+
+def test_memory_budget_keeps_unspillable_tensors(workers, tmpdir):
+    bob = workers["bob"]
+    budget = bob.set_memory_budget(400, spill_dir=str(tmpdir.join("missing")))
+
+    x = torch.rand(100)
+    x_ptr = x.send(bob)
+    y_ptr = torch.rand(100).send(bob)
+
+    # x can't be written to a missing directory, so it stays in memory
+    assert budget.stats["spills"] == 0
+    assert budget.stats["resident_bytes"] == 800
+    assert torch.equal(x_ptr.get(), x)
+
+    # numpy doesn't support bfloat16, so such tensors are never spilled
+    budget.spill_dir = str(tmpdir)
+    z_ptr = torch.rand(1000).bfloat16().send(bob)
+    assert budget.stats["spills"] == 0
+    assert z_ptr.get().dtype == torch.bfloat16
+
+    bob.set_memory_budget(None)
+
+
+def test_memory_budget_requires_spill_dir(workers):
+    with pytest.raises(ValueError):
+        workers["bob"].set_memory_budget(400)
@@ -0,0 +1,38 @@
+import pytest
+import torch
+
+from syft.exceptions import QuotaExceededError
+
+
+def test_client_quota(workers):
+    bob = workers["bob"]
+    bob.set_client_quota("carol", 2 * 400)
+
+    with bob.acting_for("carol"):
+        x_ptr = torch.rand(100).send(bob)
+        y_ptr = torch.rand(100).send(bob)
+        assert bob.memory_usage() == {"bytes": 800, "quota": 800}
+
+        with pytest.raises(QuotaExceededError):
+            torch.rand(100).send(bob)
+        assert bob.memory_usage()["bytes"] == 800
+
+        x_ptr.get()
+        assert bob.memory_usage()["bytes"] == 400
+
+    # objects stored on behalf of other clients are not charged to carol
+    z_ptr = torch.rand(100).send(bob)
+    assert bob.client_usage == {"carol": 400}
+
+    with bob.acting_for("dave"):
+        t_ptr = torch.rand(1000).send(bob)
+    assert bob.client_usage["dave"] == 4000
+
+    bob.set_client_quota(None, 100)
+    with bob.acting_for("dave"):
+        with pytest.raises(QuotaExceededError):
+            torch.rand(100).send(bob)
+
+    del y_ptr, z_ptr, t_ptr
+    bob.set_client_quota(None, None)
+    bob.set_client_quota("carol", None)
@@ -0,0 +1,47 @@
+import torch
+
+from syft.generic import SearchIndex
+
+
+def test_search_index():
+    index = SearchIndex()
+    x = torch.tensor([1.0]).tag("#mnist", "#data").describe("The images of the MNIST dataset.")
+    y = torch.tensor([2.0]).tag("#mnist", "#target").describe("The labels of the MNIST dataset.")
+    index.add(1, x)
+    index.add("y", y)
+
+    assert index.search() == [1, "y"]
+    assert index.search("#mnist") == [1, "y"]
+    assert index.search("#mnist", "#data") == [1]
+    assert index.search("1") == [1]
+    assert index.search("labels of the") == ["y"]
+    assert index.search("MNIST dataset.") == [1, "y"]
+    # only whole words of the descriptions are matched
+    assert index.search("MNI") == []
+    assert index.search("the MNIST images") == []
+
+    # re-indexing an object keeps its rank
+    index.add(1, x.tag("#images"))
+    assert index.search("#mnist") == [1, "y"]
+
+    index.remove(1)
+    assert index.search("#mnist") == ["y"]
+    index.clear()
+    assert index.search() == []
+
+
+def test_search_after_retagging(workers):
+    bob = workers["bob"]
+    x_ptr = torch.tensor([1, 2]).tag("#fun").send(bob)
+    x = bob._objects[x_ptr.id_at_location]
+
+    x.tag("#boston")
+    assert len(bob.search("#fun", "#boston")) == 1
+
+    x.tags = {"#housing"}
+    x.describe("Boston housing prices")
+    assert len(bob.search("#fun")) == 0
+    assert len(bob.search("#housing", "housing prices")) == 1
+
+    x_ptr.get()
+    assert len(bob.search("#housing")) == 0
@@ -1,7 +1,13 @@
+import threading
+import time
+from unittest.mock import patch
+
 import pytest
 import torch
 from torch import Tensor
 import syft as sy
+from syft.workers import WebsocketClientWorker
+from syft.workers import WebsocketServerWorker
 
 
 def test_virtual_grid(workers):
@@ -40,3 +46,84 @@ def test_virtual_grid(workers):
     assert len(results["bob"]) == 1
     assert "alice" not in results
     assert len(results["james"]) == 1
+
+
+def test_virtual_grid_search_timeout_and_limit(workers):
+    bob = workers["bob"]
+    alice = workers["alice"]
+    james = workers["james"]
+
+    grid = sy.grid.VirtualGrid(*[bob, alice, james])
+
+    x = torch.tensor([1, 2, 3, 4]).tag("#grid_data").send(bob)
+    y = torch.tensor([1, 2, 3, 4]).tag("#grid_data").send(bob)
+    z = torch.tensor([1, 2, 3, 4]).tag("#grid_data").send(alice)
+
+    def slow_search(*query):
+        time.sleep(1)
+        return []
+
+    with patch.object(james, "search", side_effect=slow_search):
+        # james doesn't answer in time, the results of the others are returned
+        results, _ = grid.search("#grid_data", timeout=0.5)
+        assert len(results["bob"]) == 2
+        assert len(results["alice"]) == 1
+        assert "james" not in results
+
+        answers = list(grid.iter_search("#grid_data", timeout=0.5))
+        assert answers[-1] == (james, None)
+
+    results, _ = grid.search("#grid_data", limit=2)
+    assert sum(len(worker_results) for worker_results in results.values()) == 2
+
+
+def test_virtual_grid_search_failing_worker(workers):
+    bob = workers["bob"]
+    alice = workers["alice"]
+
+    grid = sy.grid.VirtualGrid(*[bob, alice])
+
+    x = torch.tensor([1, 2, 3, 4]).tag("#grid_data").send(bob)
+
+    with patch.object(alice, "search", side_effect=ConnectionError):
+        # the failure of alice doesn't prevent getting the results of bob
+        results, _ = grid.search("#grid_data")
+        assert len(results["bob"]) == 1
+        assert "alice" not in results
+
+        answers = list(grid.iter_search("#grid_data"))
+        assert (alice, None) in answers
+
+
+def test_virtual_grid_search_blocking_transport(hook, start_proc):
+    """Ensures that a search given up on doesn't answer the next request sent
+    to its worker"""
+
+    kwargs = {"id": "grid_fed", "host": "localhost", "port": 8778, "hook": hook}
+    process_remote_worker = start_proc(WebsocketServerWorker, kwargs)
+
+    time.sleep(0.1)
+
+    client = WebsocketClientWorker(**kwargs)
+    x_ptr = torch.tensor([1.0]).tag("#grid_data").send(client)
+
+    grid = sy.grid.VirtualGrid(client)
+    receive_action = client._receive_action
+    unblock = threading.Event()
+
+    def blocking_receive_action(message):
+        unblock.wait()
+        return receive_action(message)
+
+    with patch.object(client, "_receive_action", side_effect=blocking_receive_action):
+        assert list(grid.iter_search("#grid_data", timeout=0.1)) == [(client, None)]
+
+        # the next request waits for the search to end
+        threading.Timer(0.2, unblock.set).start()
+        assert client.objects_count_remote() == 1
+
+    x_ptr.garbage_collect_data = False
+    client.ws.shutdown()
+    time.sleep(0.1)
+    client.remove_worker_from_local_worker_registry()
+    process_remote_worker.terminate()
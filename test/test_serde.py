@@ -99,6 +99,42 @@ def test_dict_simplify():
     assert serde._simplify(input) == target
 
 
+def test_nested_collections_simplify():
+    """This tests our ability to simplify collections nested in
+    other collections, including empty ones."""
+
+    input = {"a": [1, ("b", ())], 2: {"c": []}}
+    target = (
+        5,
+        [
+            ((18, (b"a",)), (3, [1, (2, ((18, (b"b",)), (2, ())))])),
+            (2, (5, [((18, (b"c",)), (3, []))])),
+        ],
+    )
+    assert serde._simplify(input) == target
+    assert serde._detail(syft.hook.local_worker, target) == input
+
+
+def test_deeply_nested_collections_simplify():
+    """Collections nested deeper than the recursion limit can be
+    simplified and detailed."""
+
+    input = []
+    inner = input
+    for _ in range(5000):
+        inner.append([])
+        inner = inner[0]
+
+    simplified = serde._simplify(input)
+    detailed = serde._detail(syft.hook.local_worker, simplified)
+
+    depth = 0
+    while detailed:
+        detailed = detailed[0]
+        depth += 1
+    assert depth == 5000
+
+
 def test_range_simplify():
     """This tests our ability to simplify range objects.
 
@@ -184,6 +220,16 @@ def test_torch_device_simplify():
     assert serde._simplify(device)[1] == "cpu"
 
 
+def test_tensor_descriptor_simplify():
+    descriptor = pointers.TensorDescriptor(torch.Size([3, 2]), torch.float16)
+    output = serde._simplify(descriptor)
+
+    assert output[0] == 23
+    detailed = serde._detail(syft.hook.local_worker, output)
+    assert detailed.shape == torch.Size([3, 2])
+    assert detailed.dtype == torch.float16
+
+
 def test_pointer_tensor_simplify():
     """Test the simplification of PointerTensor"""
 
@@ -319,6 +365,64 @@ def test_compressed_serde(compress_scheme):
     assert numpy.array_equal(arr, arr_serialized_deserialized)
 
 
+@pytest.mark.parametrize(
+    "data, compress_scheme",
+    [
+        (numpy.ones(10), serde.NO_COMPRESSION),
+        (numpy.random.randint(0, 2 ** 62, 1000), serde.NO_COMPRESSION),
+        (numpy.arange(1000), serde.LZ4),
+        (numpy.zeros((100, 100)), serde.ZSTD),
+    ],
+)
+def test_compression_policy(data, compress_scheme):
+    policy = serde.CompressionPolicy(min_size=512, max_entropy=7.0, zstd_max_entropy=1.0)
+    syft.serde._apply_compress_scheme = policy
+
+    data_serialized = serde.serialize(data)
+    data_serialized_deserialized = serde.deserialize(data_serialized)
+
+    syft.serde._apply_compress_scheme = serde.apply_lz4_compression
+
+    assert numpy.array_equal(data, data_serialized_deserialized)
+    assert data_serialized[0] == compress_scheme
+
+    stats = policy.stats[compress_scheme]
+    assert stats["calls"] == 1
+    assert stats["bytes_out"] == len(data_serialized) - 1
+    assert policy.bytes_saved()[compress_scheme] == stats["bytes_in"] - stats["bytes_out"]
+
+
+def test_compression_dict(tmpdir):
+    messages = [(1, (("__add__", i, (i + 1,), {}), [i * 7])) for i in range(100)]
+    samples = [serde.serialize(message) for message in messages]
+
+    # messages which are not plain binaries are skipped
+    other_samples = [
+        serde.serialize_in_process(messages[0]),
+        serde.serialize_out_of_band(messages[0]),
+    ]
+    compression_dict = serde.train_compression_dict(samples + other_samples)
+    dict_id = serde.register_compression_dict(compression_dict)
+    assert dict_id in serde.get_compression_dict_ids()
+
+    message = (1, (("__add__", 1000, (1001,), {}), [7000]))
+    message_serialized = serde.serialize(message, compression_dict_id=dict_id)
+    assert message_serialized[0] == serde.ZSTD_DICT
+    assert len(message_serialized) < len(serde.serialize(message))
+    assert serde.get_compression_dict_id(message_serialized) == dict_id
+    assert serde.deserialize(message_serialized) == message
+
+    path = str(tmpdir.join("commands.dict"))
+    serde.save_compression_dict(compression_dict, path)
+    assert serde.load_compression_dict(path) == dict_id
+
+    # binaries compressed with an unknown dictionary can't be decompressed
+    del serde._compression_dicts[dict_id]
+    serde._compression_dict_contexts.contexts.clear()
+    with pytest.raises(CompressionNotFoundException):
+        serde.deserialize(message_serialized)
+
+
 @pytest.mark.parametrize("compress_scheme", [1, 2, 3, 100])
 def test_invalid_decompression_scheme(compress_scheme):
     # using numpy.ones because numpy.random.random is not compressed.
@@ -571,6 +675,190 @@ def test_numpy_tensor_serde():
     assert torch.eq(tensor_deserialized, tensor).all()
 
 
+@pytest.mark.parametrize(
+    "deserializer",
+    [syft.serde.numpy_tensor_deserializer, syft.serde.numpy_tensor_mmap_deserializer],
+)
+@pytest.mark.parametrize(
+    "tensor", [torch.randn(3, 4).t(), torch.tensor(3.5), torch.arange(10)[::2], torch.zeros(0, 2)]
+)
+def test_numpy_tensor_deserializers(deserializer, tensor):
+    tensor_bin = syft.serde.numpy_tensor_serializer(tensor)
+    tensor_deserialized = deserializer(tensor_bin)
+
+    assert tensor_deserialized.dtype == tensor.dtype
+    assert torch.equal(tensor_deserialized, tensor)
+
+    # the deserialized tensor can be modified in place, without modifying
+    # the immutable binary it was deserialized from
+    tensor_deserialized += 1
+    assert torch.equal(tensor_deserialized, tensor + 1)
+    assert tensor_bin == syft.serde.numpy_tensor_serializer(tensor)
+
+
+@pytest.mark.parametrize(
+    "tensor",
+    [
+        torch.tensor(numpy.random.random((10, 10))),
+        torch.tensor(3.5),
+        torch.zeros(0, 3),
+        torch.randn(3, 4).t(),
+        torch.tensor([1, 2, 3], dtype=torch.int8),
+        torch.randn(4, requires_grad=True),
+    ],
+)
+def test_raw_tensor_serde(tensor):
+    syft.serde._serialize_tensor = syft.serde.raw_tensor_serializer
+    syft.serde._deserialize_tensor = syft.serde.raw_tensor_deserializer
+
+    tensor_serialized = serde.serialize(tensor)
+    tensor_deserialized = serde.deserialize(tensor_serialized)
+
+    # Back to Pytorch serializer
+    syft.serde._serialize_tensor = syft.serde.torch_tensor_serializer
+    syft.serde._deserialize_tensor = syft.serde.torch_tensor_deserializer
+
+    assert tensor_deserialized.dtype == tensor.dtype
+    assert tensor_deserialized.shape == tensor.shape
+    assert tensor_deserialized.requires_grad == tensor.requires_grad
+    assert torch.equal(tensor_deserialized.detach(), tensor.detach())
+
+
+def test_raw_tensor_deserialized_in_place():
+    """Modifying a deserialized tensor doesn't modify the immutable binary it
+    was received in"""
+    tensor = torch.tensor([5], dtype=torch.uint8)
+    dtype, shape, strides, requires_grad, data = syft.serde.raw_tensor_serializer(tensor)
+    binary = bytes(data)
+
+    tensor_deserialized = syft.serde.raw_tensor_deserializer(
+        (dtype, shape, strides, requires_grad, binary)
+    )
+    tensor_deserialized += 1
+
+    assert torch.equal(tensor_deserialized, torch.tensor([6], dtype=torch.uint8))
+    assert binary == b"\x05"
+    assert bytes([5]) == b"\x05"
+
+    # a writable buffer is used without copying it
+    buffer = bytearray(data)
+    tensor_deserialized = syft.serde.raw_tensor_deserializer(
+        (dtype, shape, strides, requires_grad, buffer)
+    )
+    tensor_deserialized += 1
+    assert buffer == bytearray(b"\x06")
+
+
+def test_raw_tensor_detected_with_other_strategy():
+    """A tensor serialized with the raw strategy is understood by a
+    worker using the default Torch strategy"""
+    tensor = torch.tensor([1.0, 2.0, 3.0])
+
+    syft.serde._serialize_tensor = syft.serde.raw_tensor_serializer
+    tensor_serialized = serde.serialize(tensor)
+    syft.serde._serialize_tensor = syft.serde.torch_tensor_serializer
+
+    tensor_deserialized = serde.deserialize(tensor_serialized)
+
+    assert torch.equal(tensor_deserialized, tensor)
+
+
+@pytest.mark.parametrize(
+    "serializer, deserializer",
+    [
+        (syft.serde.raw_tensor_serializer, syft.serde.raw_tensor_deserializer),
+        (syft.serde.numpy_tensor_serializer, syft.serde.numpy_tensor_deserializer),
+    ],
+)
+def test_tensor_unknown_to_numpy_serde(serializer, deserializer):
+    """Tensors of dtypes numpy can't represent are serialized with torch.save,
+    whatever the strategy selected"""
+    tensor = torch.randn(100, 100).bfloat16()
+
+    syft.serde._serialize_tensor = serializer
+    syft.serde._deserialize_tensor = deserializer
+    try:
+        tensor_deserialized = serde.deserialize(serde.serialize(tensor))
+        frames = serde.serialize_out_of_band(tensor)
+        # (the tensor data is not sent out of band)
+        assert len(frames) == 1
+        tensor_out_of_band = serde.deserialize(frames)
+    finally:
+        syft.serde._serialize_tensor = syft.serde.torch_tensor_serializer
+        syft.serde._deserialize_tensor = syft.serde.torch_tensor_deserializer
+
+    assert tensor_deserialized.dtype == torch.bfloat16
+    assert torch.equal(tensor_deserialized, tensor)
+    assert torch.equal(tensor_out_of_band, tensor)
+
+
+def test_serialize_out_of_band():
+    tensor = torch.rand(100, 100)
+    small_tensor = torch.tensor([1, 2, 3])
+    obj = (tensor, small_tensor, "a string")
+
+    frames = serde.serialize_out_of_band(obj)
+    # the data of the large tensor is the only frame sent out of band
+    assert len(frames) == 2
+    assert frames[1].nbytes == tensor.numel() * tensor.element_size()
+
+    obj_deserialized = serde.deserialize(frames)
+    assert torch.equal(obj_deserialized[0], tensor)
+    assert torch.equal(obj_deserialized[1], small_tensor)
+    assert obj_deserialized[2] == obj[2]
+
+    # the tensor is built on top of a frame received in a writable buffer
+    frame = bytearray(frames[1])
+    tensor_deserialized = serde.deserialize([frames[0], frame])[0]
+    frame_address = numpy.frombuffer(frame, dtype=numpy.uint8).ctypes.data
+    assert tensor_deserialized.data_ptr() == frame_address
+    tensor_deserialized += 1
+    assert torch.equal(
+        torch.from_numpy(numpy.frombuffer(frame, dtype=numpy.float32)), (tensor + 1).view(-1)
+    )
+
+    # the data of the concatenated frames is copied, the binary is left unchanged
+    binary = b"".join(frames)
+    tensor_deserialized = serde.deserialize(binary)[0]
+    tensor_deserialized += 1
+    assert binary == b"".join(frames)
+    assert torch.equal(tensor_deserialized, tensor + 1)
+
+
+def test_serialize_in_process():
+    tensor = torch.rand(10, 10, requires_grad=True)
+    obj = (tensor, "a string", [1, 2.5, None])
+
+    message = serde.serialize_in_process(obj)
+    assert len(message.tensors) == 1
+    assert message.tensors[0].data_ptr() != tensor.data_ptr()
+
+    obj_deserialized = serde.deserialize(message)
+    assert torch.equal(obj_deserialized[0], tensor)
+    assert obj_deserialized[0].requires_grad
+    assert obj_deserialized[0].id == tensor.id
+    assert obj_deserialized[1:] == obj[1:]
+
+
+@pytest.mark.parametrize("chunk_size", [100, 10 ** 6])
+def test_serialize_stream(chunk_size):
+    tensor = torch.rand(100, 100)
+    obj = (tensor, "a string", [1, 2.5, None])
+
+    chunks = list(serde.serialize_stream(obj, chunk_size=chunk_size))
+
+    stream = serde.StreamDeserializer()
+    for chunk in chunks[:-1]:
+        assert not stream.feed(chunk)
+        with pytest.raises(RuntimeError):
+            stream.result()
+    assert stream.feed(chunks[-1])
+
+    obj_deserialized = stream.result()
+    assert torch.equal(obj_deserialized[0], tensor)
+    assert obj_deserialized[1:] == obj[1:]
+
+
 @pytest.mark.parametrize("compress", [True, False])
 def test_additive_sharing_tensor_serde(compress, workers):
     alice, bob, james = workers["alice"], workers["bob"], workers["james"]
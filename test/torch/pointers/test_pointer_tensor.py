@@ -285,6 +285,17 @@ def test_get_remote_shape(workers):
     assert y.shape == torch.Size([5])
 
 
+def test_shape_and_dtype_from_response(workers):
+    """Test that pointers to the result of a command know its shape and dtype"""
+    bob = workers["bob"]
+    x = th.tensor([[1, 2, 3], [4, 5, 6]]).send(bob)
+    y = x.t()
+    # no need to request the shape to bob
+    assert y.child._shape == torch.Size([3, 2])
+    assert y.child.dtype == torch.int64
+    assert y.shape == torch.Size([3, 2])
+
+
 def test_remote_function_with_multi_ouput(workers):
     """
     Functions like .split return several tensors, registration and response
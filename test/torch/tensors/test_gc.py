@@ -34,6 +34,84 @@ def test_explicit_garbage_collect_pointer(workers):
     assert x.id not in bob._objects
 
 
+def test_batched_garbage_collect_pointer(workers):
+    """Tests that deletions of remote objects are sent in batches"""
+    me, bob = workers["me"], workers["bob"]
+    me.deletion_batch_size = 3
+    me.deletion_stats["objects"] = me.deletion_stats["messages"] = 0
+    try:
+        x = torch.Tensor([1, 2])
+        y = torch.Tensor([3, 4])
+        x_ptr, y_ptr = x.send(bob), y.send(bob)
+
+        # the deletions are buffered
+        del x_ptr
+        del y_ptr
+        assert x.id in bob._objects and y.id in bob._objects
+
+        # until the next message sent to bob
+        z_ptr = torch.Tensor([5, 6]).send(bob)
+        assert x.id not in bob._objects and y.id not in bob._objects
+
+        # or until the batch is full
+        ptrs = [torch.Tensor([i]).send(bob) for i in range(3)]
+        ids = [ptr.id_at_location for ptr in ptrs]
+        del ptrs
+        assert not any(obj_id in bob._objects for obj_id in ids)
+
+        # or flush_deletions is called
+        z_id = z_ptr.id_at_location
+        del z_ptr
+        assert z_id in bob._objects
+        me.flush_deletions()
+        assert z_id not in bob._objects
+
+        assert me.deletion_stats["objects"] == 6
+        assert me.deletion_stats["messages"] == 3
+    finally:
+        me.deletion_batch_size = None
+
+
+def test_batched_garbage_collect_after_delay(workers):
+    """Tests that buffered deletions are sent with the first deletion requested
+    once their delay expired, by the thread requesting it"""
+    me, bob = workers["me"], workers["bob"]
+    me.deletion_batch_size = 3
+    me.deletion_batch_delay = 0.05
+    try:
+        x, y = torch.Tensor([1, 2]), torch.Tensor([3, 4])
+        x_ptr, y_ptr = x.send(bob), y.send(bob)
+        del x_ptr
+        assert x.id in bob._objects
+
+        # nothing is sent in the background
+        time.sleep(0.1)
+        assert x.id in bob._objects
+
+        del y_ptr
+        assert x.id not in bob._objects and y.id not in bob._objects
+    finally:
+        me.deletion_batch_size = None
+        me.deletion_batch_delay = 1.0
+
+
+def test_batched_garbage_collect_default(workers):
+    """Tests that deletions are only batched by default for the workers reached
+    over a connection"""
+    me, bob = workers["me"], workers["bob"]
+    assert me._deletion_batch_size(bob) == 1
+
+    class Client:
+        batch_deletions = True
+
+    assert me._deletion_batch_size(Client()) > 1
+    me.deletion_batch_size = 1
+    try:
+        assert me._deletion_batch_size(Client()) == 1
+    finally:
+        me.deletion_batch_size = None
+
+
 def test_explicit_garbage_collect_double_pointer(workers):
     """Tests whether deleting a pointer to a pointer garbage collects
     the remote object too"""
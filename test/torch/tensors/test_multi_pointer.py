@@ -1,10 +1,67 @@
 import pytest
+from unittest.mock import patch
 import torch as th
 import syft as sy
+from syft.codes import MSGTYPE
 
 from syft.frameworks.torch.tensors.decorators import LoggingTensor
 
 
+def test_send_to_many(workers):
+    """
+    Ensure that sending to several workers serializes the tensor once and
+    returns a MultiPointerTensor
+    """
+
+    bob = workers["bob"]
+    alice = workers["alice"]
+    james = workers["james"]
+    me = workers["me"]
+
+    x = th.tensor([1, 2, 3, 4, 5])
+    with patch.object(sy.serde, "serialize", wraps=sy.serde.serialize) as serialize:
+        a = x.send(bob, alice, james)
+    # (the workers serialize their responses as well)
+    messages = [args[0] for args, _ in serialize.call_args_list if args[0] is not None]
+    assert len(messages) == 1
+    assert messages[0][0] == MSGTYPE.OBJ
+
+    assert isinstance(a.child, sy.MultiPointerTensor)
+    assert set(a.child.child) == {"bob", "alice", "james"}
+    assert set(me.fan_out_timings) == {"bob", "alice", "james"}
+
+    # each worker received its own copy
+    assert bob._objects[x.id] is not alice._objects[x.id]
+    assert (bob._objects[x.id] == x).all()
+
+    c = a.get(sum_results=True)
+    assert (c == x * 3).all()
+
+
+def test_send_to_many_keeps_tags_and_inplace(workers):
+    """
+    Ensure that sending to several workers copies the tags and description to
+    the pointers, honors inplace and sends once to a repeated worker
+    """
+
+    bob = workers["bob"]
+    alice = workers["alice"]
+
+    x = th.tensor([1, 2, 3]).tag("#data").describe("a tensor")
+    a = x.send(bob, alice, bob)
+    assert set(a.child.child) == {"bob", "alice"}
+    for ptr in a.child.child.values():
+        assert ptr.tags == {"#data"}
+        assert ptr.description == "a tensor"
+    assert (a.get(sum_results=True) == x * 2).all()
+
+    y = th.tensor([1, 2, 3])
+    b = y.send(bob, alice, inplace=True)
+    assert b is y
+    assert isinstance(y.child, sy.MultiPointerTensor)
+    assert (y.get(sum_results=True) == th.tensor([2, 4, 6])).all()
+
+
 def test_multi_pointers(workers):
     """
     Ensure that the sy.combine_pointers works as expected
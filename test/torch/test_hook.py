@@ -25,6 +25,19 @@ def test_torch_attributes():
     syft.torch._command_guard("torch.add", "torch_modules", get_native=False)
 
 
+def test_opcodes():
+    for command in ["torch.add", "torch.nn.functional.relu", "__add__", "share"]:
+        opcode = syft.torch.get_opcode(command)
+        assert isinstance(opcode, int)
+        assert syft.torch.get_command(opcode) == command
+
+    # commands which aren't in the table are kept as is
+    assert syft.torch.get_opcode("list_objects") == "list_objects"
+
+    with pytest.raises(RuntimeError):
+        syft.torch.get_command(len(syft.torch.opcodes))
+
+
 def test_worker_registration(hook, workers):
     boris = syft.VirtualWorker(id="boris", hook=hook, is_client_worker=False)
 
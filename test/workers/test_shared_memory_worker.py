@@ -0,0 +1,63 @@
+import os
+import socket
+import time
+
+import pytest
+import torch
+
+from syft.workers import SharedMemoryClientWorker
+from syft.workers import SharedMemoryServerWorker
+from syft.workers.shared_memory import SEGMENT_PREFIX
+from syft.workers.shared_memory import SHM_DIR
+from syft.workers.shared_memory import recv_frames
+from syft.workers.shared_memory import send_frames
+
+
+def test_shared_memory_worker(hook, start_proc, tmpdir):
+    """Evaluates that you can do basic tensor operations using
+    SharedMemoryServerWorker, with tensors large enough to be sent in shared memory"""
+
+    kwargs = {"id": "shm_fed", "path": str(tmpdir.join("shm_fed.sock")), "hook": hook}
+    process_remote_worker = start_proc(SharedMemoryServerWorker, kwargs)
+
+    time.sleep(0.5)
+    x = torch.rand(100, 1000)
+
+    local_worker = SharedMemoryClientWorker(**kwargs)
+    assert local_worker.use_opcodes
+
+    x_ptr = x.send(local_worker)
+    y_ptr = x_ptr + x_ptr
+    assert local_worker.objects_count_remote() == 2
+
+    y = y_ptr.get()
+    assert torch.equal(y, x + x)
+
+    # the server mapped and unlinked the segments sent by the client, and the
+    # client the segments of the responses
+    segments = [name for name in os.listdir(SHM_DIR) if name.startswith(SEGMENT_PREFIX)]
+    assert not segments
+
+    local_worker.close()
+    local_worker.remove_worker_from_local_worker_registry()
+    process_remote_worker.terminate()
+
+
+def test_shared_memory_segments_unlinked_on_error():
+    """Evaluates that the segments of a message are unlinked when one of them
+    can't be read"""
+
+    sender, receiver = socket.socketpair()
+    with sender, receiver:
+        frames = [bytes([i]) * 16 for i in range(3)]
+        before = set(os.listdir(SHM_DIR))
+        send_frames(sender, frames, shm_min_size=16)
+        segments = [name for name in set(os.listdir(SHM_DIR)) - before]
+        assert len(segments) == 3
+
+        # one of the segments disappeared
+        os.unlink(os.path.join(SHM_DIR, segments[1]))
+        with pytest.raises(FileNotFoundError):
+            recv_frames(receiver)
+
+    assert not set(os.listdir(SHM_DIR)) & set(segments)
@@ -0,0 +1,44 @@
+import time
+
+import pytest
+import torch
+
+from syft.workers import SocketClientWorker
+from syft.workers import SocketServerWorker
+
+
+@pytest.mark.parametrize("unix_socket", [False, True], ids=["tcp", "unix"])
+def test_socket_worker(hook, start_proc, tmpdir, unix_socket):
+    """Evaluates that you can do basic tensor operations using
+    SocketServerWorker, over TCP or a Unix domain socket"""
+
+    if unix_socket:
+        kwargs = {"id": "sock_fed", "path": str(tmpdir.join("sock_fed.sock")), "hook": hook}
+    else:
+        kwargs = {"id": "sock_fed", "host": "localhost", "port": 8773, "hook": hook}
+    process_remote_worker = start_proc(SocketServerWorker, kwargs)
+
+    time.sleep(0.5)
+    x = torch.ones(5)
+
+    local_worker = SocketClientWorker(**kwargs)
+    assert local_worker.use_opcodes
+
+    x_ptr = x.send(local_worker)
+    y = (x_ptr + x_ptr).get()
+    assert (y == torch.ones(5) * 2).all()
+
+    # messages serialized out of band are sent frame by frame
+    local_worker.out_of_band = True
+    z = torch.rand(100, 100)
+    assert torch.equal(z.send(local_worker).get(), z)
+
+    # the deletions for the server are buffered by default, and requests to
+    # the server go after them
+    del x_ptr
+    assert local_worker in hook.local_worker._pending_deletions
+    assert local_worker.objects_count_remote() == 0
+
+    local_worker.close()
+    local_worker.remove_worker_from_local_worker_registry()
+    process_remote_worker.terminate()
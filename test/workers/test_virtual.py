@@ -3,6 +3,7 @@ from unittest.mock import patch
 
 import syft as sy
 from syft.exceptions import GetNotPermittedError
+from syft.exceptions import ResponseSignatureError
 from syft.workers.virtual import VirtualWorker
 from syft.codes import MSGTYPE
 from syft import serde
@@ -39,6 +40,229 @@ def test_send_msg():
     assert obj_id in bob._objects
 
 
+def test_send_obj_in_chunks():
+    """Tests sending a tensor in several messages of bounded size"""
+
+    me = sy.torch.hook.local_worker
+
+    worker_id = sy.ID_PROVIDER.pop()
+    bob = VirtualWorker(sy.torch.hook, id=f"bob{worker_id}", log_msgs=True)
+
+    obj = torch.rand(100, 100)
+    obj_id = obj.id
+
+    me.send_obj(obj, bob, chunk_size=1000)
+
+    assert len(bob.msg_history) > 1
+    assert all(len(message) < 2000 for message in bob.msg_history)
+    assert not bob._incoming_streams
+    assert torch.equal(bob._objects[obj_id], obj)
+
+
+def test_incoming_streams_dropped():
+    """Tests that aborted streams don't stay in the worker forever"""
+
+    worker_id = sy.ID_PROVIDER.pop()
+    bob = VirtualWorker(sy.torch.hook, id=f"bob{worker_id}")
+
+    chunks = list(sy.serde.serialize_stream(torch.rand(100, 100), chunk_size=1000, compress=False))
+
+    # a stream whose chunk can't be deserialized is dropped
+    with pytest.raises(Exception):
+        bob.recv_obj_chunk((1, b"not a chunk" + chunks[0]))
+    assert not bob._incoming_streams
+
+    # a stream which received no chunk for stream_timeout seconds is dropped
+    # when another one starts
+    bob.recv_obj_chunk((2, chunks[0]))
+    assert 2 in bob._incoming_streams
+    bob._incoming_streams[2].last_feed_time -= bob.stream_timeout + 1
+    bob.recv_obj_chunk((3, chunks[0]))
+    assert list(bob._incoming_streams) == [3]
+
+
+def test_send_msg_out_of_band():
+    """Tests exchanging messages serialized out of band"""
+
+    worker_id = sy.ID_PROVIDER.pop()
+    bob = VirtualWorker(sy.torch.hook, id=f"bob{worker_id}")
+    bob.out_of_band = True
+
+    obj = torch.rand(100, 100)
+    obj_ptr = obj.send(bob)
+
+    # bob doesn't share memory with the sender
+    obj_on_bob = bob._objects[obj_ptr.id_at_location]
+    assert obj_on_bob.data_ptr() != obj.data_ptr()
+    assert torch.equal(obj_on_bob, obj)
+
+    result = (obj_ptr + obj_ptr).get()
+    assert torch.equal(result, obj + obj)
+
+
+def test_send_msg_skipping_serialization():
+    """Tests exchanging messages passed by reference between workers of the same process"""
+
+    worker_id = sy.ID_PROVIDER.pop()
+    bob = VirtualWorker(sy.torch.hook, id=f"bob{worker_id}", log_msgs=True)
+    bob.skip_serialization = True
+
+    obj = torch.rand(10, 10)
+    obj_ptr = obj.send(bob)
+    assert isinstance(bob.msg_history[-1], serde.InProcessMessage)
+
+    # bob received a copy of the tensor
+    obj_on_bob = bob._objects[obj_ptr.id_at_location]
+    assert obj_on_bob.data_ptr() != obj.data_ptr()
+    assert obj_on_bob.owner is bob
+    obj.add_(1)
+    assert not torch.equal(obj_on_bob, obj)
+
+    result = (obj_ptr + obj_ptr).get()
+    assert torch.equal(result, obj_on_bob + obj_on_bob)
+
+
+def test_send_command_as_opcode():
+    """Tests that virtual workers exchange commands as opcodes"""
+
+    worker_id = sy.ID_PROVIDER.pop()
+    bob = VirtualWorker(sy.torch.hook, id=f"bob{worker_id}")
+
+    commands = []
+
+    def execute_command(message):
+        commands.append(message[0][0])
+        return bob.execute_command(message)
+
+    bob._message_router[MSGTYPE.CMD] = execute_command
+
+    x_ptr = torch.tensor([1.0, -2.0]).send(bob)
+    y_ptr = x_ptr + x_ptr
+    z_ptr = torch.nn.functional.relu(y_ptr)
+
+    assert commands == [
+        sy.torch.get_opcode("__add__"),
+        sy.torch.get_opcode("torch.nn.functional.relu"),
+    ]
+
+    assert torch.equal(z_ptr.get(), torch.tensor([2.0, 0.0]))
+
+
+def test_send_msg_with_compression_dict():
+    """Tests compressing messages with a dictionary trained on previous messages"""
+
+    worker_id = sy.ID_PROVIDER.pop()
+    bob = VirtualWorker(sy.torch.hook, id=f"bob{worker_id}", log_msgs=True)
+
+    x_ptr = torch.tensor([1.0, 2.0]).send(bob)
+    for _ in range(50):
+        y_ptr = x_ptr + x_ptr
+
+    dict_id = bob.train_compression_dict()
+    assert bob.negotiate_compression_dict() == dict_id
+
+    y_ptr = x_ptr + x_ptr
+    assert bob.msg_history[-1][0] == serde.ZSTD_DICT
+    assert torch.equal(y_ptr.get(), torch.tensor([2.0, 4.0]))
+
+
+def test_send_command_pipelined():
+    """Tests that commands are pipelined once their response is known to be pointers,
+    and that their errors are raised by the next synchronizing operation"""
+
+    worker_id = sy.ID_PROVIDER.pop()
+    bob = VirtualWorker(sy.torch.hook, id=f"bob{worker_id}")
+    bob.pipelining = True
+
+    x_ptr = torch.tensor([1.0, 2.0]).send(bob)
+    bad_ptr = torch.tensor([1.0, 2.0, 3.0]).send(bob)
+
+    # the first __add__ waits for its response, the following ones don't
+    y_ptr = x_ptr + x_ptr
+    assert bob._pipelined_requests == []
+    z_ptr = y_ptr + x_ptr
+    assert len(bob._pipelined_requests) == 1
+
+    # synchronizing operations flush the pipeline
+    assert torch.equal(z_ptr.get(), torch.tensor([3.0, 6.0]))
+    assert bob._pipelined_requests == []
+
+    # errors are deferred
+    _ = x_ptr + bad_ptr
+    with pytest.raises(RuntimeError):
+        bob.flush()
+
+
+def test_deletion_from_pipeline_thread():
+    """Tests that a pointer garbage collected by the thread sending pipelined
+    messages buffers its deletion instead of sending it from that thread"""
+
+    me = sy.torch.hook.local_worker
+    worker_id = sy.ID_PROVIDER.pop()
+    bob = VirtualWorker(sy.torch.hook, id=f"bob{worker_id}")
+    bob.pipelining = True
+
+    x_ptr = torch.tensor([1.0, 2.0]).send(bob)
+    me.send_msg(MSGTYPE.OBJ, torch.tensor([3.0]), bob, pipelined=True)
+
+    def collect():
+        me.request_obj_del(x_ptr.id_at_location, bob)
+        # flushing from the pipeline thread would wait for itself
+        bob.flush()
+
+    bob._pipeline_executor.submit(collect).result(timeout=10)
+    assert x_ptr.id_at_location in bob._objects
+    assert me._pending_deletions[bob][0] == [x_ptr.id_at_location]
+
+    # the deletion is sent before the next message
+    bob.flush()
+    me.send_msg(MSGTYPE.OBJ, torch.tensor([4.0]), bob)
+    assert x_ptr.id_at_location not in bob._objects
+    x_ptr.garbage_collect_data = False
+
+
+def test_send_command_batch():
+    """Tests sending commands in a single CMD_BATCH message"""
+
+    worker_id = sy.ID_PROVIDER.pop()
+    bob = VirtualWorker(sy.torch.hook, id=f"bob{worker_id}")
+
+    msg_types = []
+
+    def recv_msg(bin_message):
+        msg_types.append(serde.deserialize(bin_message, detail=False)[1][0])
+        return VirtualWorker.recv_msg(bob, bin_message)
+
+    x_ptr = torch.tensor([1.0, 2.0]).send(bob)
+    bob.recv_msg = recv_msg
+
+    with bob.batch():
+        y_ptr = x_ptr + 1
+        z_ptr = y_ptr * 2
+        # nothing was sent yet
+        assert msg_types == []
+        assert z_ptr.id_at_location not in bob._objects
+
+    assert msg_types == [MSGTYPE.CMD_BATCH]
+    assert torch.equal(z_ptr.get(), torch.tensor([4.0, 6.0]))
+
+    # the commands of a block which raises are not sent
+    with pytest.raises(ZeroDivisionError):
+        with bob.batch():
+            w_ptr = x_ptr + 1
+            1 / 0
+    assert msg_types == [MSGTYPE.CMD_BATCH, MSGTYPE.OBJ_REQ]
+    assert bob._batched_commands is None
+    assert w_ptr.id_at_location not in bob._objects
+    w_ptr.garbage_collect_data = False
+
+    # a command which didn't return tensors invalidates its pointer
+    me = sy.torch.hook.local_worker
+    with patch.object(me, "send_msg", return_value=[None, 3]):
+        with pytest.raises(ResponseSignatureError):
+            me._send_batch([None, None], bob)
+
+
 def test_send_msg_using_tensor_api():
     """Tests sending a message with a specific ID
 
@@ -1,7 +1,14 @@
+import asyncio
 import time
+from unittest.mock import patch
+from concurrent.futures import ThreadPoolExecutor
 
+import pytest
 import torch
 
+from syft.codes import MSGTYPE
+from syft.exceptions import QuotaExceededError
+from syft.workers import AsyncWebsocketClientWorker
 from syft.workers import WebsocketClientWorker
 from syft.workers import WebsocketServerWorker
 
@@ -155,3 +162,296 @@ def test_websocket_worker_multiple_output_response(hook, start_proc):
     socket_pipe.ws.shutdown()
     time.sleep(0.1)
     server.terminate()
+
+
+def test_websocket_worker_binary_framing(hook, start_proc):
+    """Evaluates that client and server exchange binary frames when both
+    support it and that hex-encoded frames are still understood"""
+
+    kwargs = {"id": "fed_binary", "host": "localhost", "port": 8769, "hook": hook}
+    process_remote_worker = start_proc(WebsocketServerWorker, kwargs)
+
+    time.sleep(0.1)
+
+    binary_worker = WebsocketClientWorker(**kwargs)
+    assert binary_worker.binary_framing
+    assert binary_worker.use_opcodes
+
+    x = torch.tensor([1.0, 2, 3]).send(binary_worker)
+    assert ((x + x).get() == torch.tensor([2.0, 4, 6])).all()
+
+    # (a client with the id of an existing one would share its connection)
+    hex_worker = WebsocketClientWorker(binary_framing=False, **dict(kwargs, id="fed_binary_hex"))
+    assert hex_worker.ws is not binary_worker.ws
+    assert not hex_worker.binary_framing
+    assert not hex_worker.use_opcodes
+
+    y = torch.tensor([4.0, 5, 6]).send(hex_worker)
+    assert (y.get() == torch.tensor([4.0, 5, 6])).all()
+
+    binary_worker.ws.shutdown()
+    hex_worker.ws.shutdown()
+    time.sleep(0.1)
+    binary_worker.remove_worker_from_local_worker_registry()
+    hex_worker.remove_worker_from_local_worker_registry()
+    process_remote_worker.terminate()
+
+
+class LegacyWebsocketServerWorker(WebsocketServerWorker):
+    """A server which, like older PySyft versions, accepts no subprotocol"""
+
+    @staticmethod
+    def _select_subprotocol(*args):
+        return None
+
+
+def test_websocket_worker_binary_framing_refused(hook, start_proc):
+    """Evaluates that a client falls back to hex-encoded frames when the server
+    refuses binary framing"""
+
+    kwargs = {"id": "fed_legacy", "host": "localhost", "port": 8779, "hook": hook}
+    process_remote_worker = start_proc(LegacyWebsocketServerWorker, kwargs)
+
+    time.sleep(0.1)
+
+    client = WebsocketClientWorker(**kwargs)
+    assert not client.binary_framing
+    assert not client.use_opcodes
+    assert client.server_instance_id is None
+    assert client.compression_dict_ids() == []
+
+    x = torch.tensor([1.0, 2, 3])
+    assert torch.equal(x.send(client).get(), x)
+
+    client.ws.shutdown()
+    time.sleep(0.1)
+    client.remove_worker_from_local_worker_registry()
+    process_remote_worker.terminate()
+
+
+def test_async_websocket_worker_multiplexing(hook, start_proc):
+    """Evaluates that many requests can be in flight on the connection of an
+    AsyncWebsocketClientWorker"""
+
+    kwargs = {"id": "fed_async", "host": "localhost", "port": 8770, "hook": hook}
+    process_remote_worker = start_proc(WebsocketServerWorker, kwargs)
+
+    time.sleep(0.1)
+
+    remote_proxy = AsyncWebsocketClientWorker(**kwargs)
+    assert remote_proxy.use_opcodes
+
+    # synchronous facade
+    x = torch.tensor([1.0, 2, 3]).send(remote_proxy)
+    assert ((x + x).get() == torch.tensor([2.0, 4, 6])).all()
+
+    # many requests in flight
+    tensors = [torch.tensor([float(i)]) for i in range(20)]
+    pointers = [t.send(remote_proxy) for t in tensors]
+
+    async def get_all():
+        return await asyncio.gather(
+            *[remote_proxy.async_send_msg(MSGTYPE.OBJ_REQ, ptr.id_at_location) for ptr in pointers]
+        )
+
+    results = asyncio.run_coroutine_threadsafe(get_all(), remote_proxy.loop).result()
+    for tensor, result, ptr in zip(tensors, results, pointers):
+        assert (tensor == result).all()
+        # the remote tensors were removed by the requests
+        ptr.garbage_collect_data = False
+
+    # the commands batched for the worker are sent before an async message
+    y = torch.tensor([1.0, 2]).send(remote_proxy)
+    with remote_proxy.batch():
+        z = y + y
+        result = asyncio.run_coroutine_threadsafe(
+            remote_proxy.async_send_msg(MSGTYPE.OBJ_REQ, z.id_at_location), remote_proxy.loop
+        ).result()
+    assert (result == torch.tensor([2.0, 4])).all()
+    z.garbage_collect_data = False
+
+    # a request which couldn't be sent isn't left pending
+    with pytest.raises(TypeError):
+        asyncio.run_coroutine_threadsafe(
+            remote_proxy.async_recv_msg(object()), remote_proxy.loop
+        ).result()
+    assert not remote_proxy._pending_requests
+
+    # pointers collected on the event loop buffer their deletion, which is sent
+    # before the next message to the worker
+    nb_objects = remote_proxy.objects_count_remote()
+    pointers = [torch.tensor([1.0]).send(remote_proxy)]
+
+    async def drop_pointers():
+        pointers.clear()
+
+    asyncio.run_coroutine_threadsafe(drop_pointers(), remote_proxy.loop).result()
+    assert remote_proxy in hook.local_worker._pending_deletions
+    assert remote_proxy.objects_count_remote() == nb_objects
+
+    remote_proxy.close()
+    time.sleep(0.1)
+    remote_proxy.remove_worker_from_local_worker_registry()
+    process_remote_worker.terminate()
+
+
+def test_websocket_worker_many_clients(hook, start_proc):
+    """Evaluates that the responses of a server with many connected clients are
+    sent back to the client which sent the message"""
+
+    kwargs = {"id": "fed_concurrent", "host": "localhost", "port": 8771, "hook": hook}
+    process_remote_worker = start_proc(WebsocketServerWorker, kwargs)
+
+    time.sleep(0.1)
+
+    # each client has its own id, hence its own connection (a client with the
+    # id of an existing one would share its connection). The commands of such
+    # clients can't name the server in their pointers, so they only send and get
+    clients = [WebsocketClientWorker(**dict(kwargs, id=f"fed_concurrent_{i}")) for i in range(8)]
+    assert len({id(client.ws) for client in clients}) == len(clients)
+
+    def round_trips(i):
+        client = clients[i]
+        for j in range(10):
+            x = torch.tensor([float(i), float(j)])
+            assert torch.equal(x.send(client).get(), x)
+
+    with ThreadPoolExecutor(max_workers=len(clients)) as executor:
+        list(executor.map(round_trips, range(len(clients))))
+
+    for client in clients:
+        client.ws.shutdown()
+    time.sleep(0.1)
+    for client in clients:
+        client.remove_worker_from_local_worker_registry()
+    process_remote_worker.terminate()
+
+
+def test_websocket_worker_processes_messages_one_at_a_time(hook):
+    """Evaluates that the messages are not processed concurrently whatever the
+    number of threads receiving them"""
+
+    server = WebsocketServerWorker(hook=hook, id="fed_one_at_a_time", host="localhost", port=8775)
+    running = []
+    overlaps = []
+
+    def recv_msg(message):
+        running.append(message)
+        overlaps.append(len(running) > 1)
+        time.sleep(0.01)
+        running.remove(message)
+        return message
+
+    with patch.object(server, "recv_msg", side_effect=recv_msg):
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            responses = list(executor.map(server._recv_msg, [bytes([i]) for i in range(8)]))
+
+    assert responses == [bytes([i]) for i in range(8)]
+    assert not any(overlaps)
+    server.remove_worker_from_local_worker_registry()
+
+
+def test_websocket_worker_reconnects_to_same_process(hook, start_proc):
+    """Evaluates that a client raises instead of reconnecting to another server
+    process, which doesn't hold its objects"""
+
+    kwargs = {"id": "fed_reconnect", "host": "localhost", "port": 8776, "hook": hook}
+    process_remote_worker = start_proc(WebsocketServerWorker, kwargs)
+
+    time.sleep(0.1)
+
+    client = WebsocketClientWorker(**kwargs)
+    assert client.server_instance_id is not None
+    x_ptr = torch.tensor([1.0]).send(client)
+
+    receive_action = client._receive_action
+    calls = []
+
+    def drop_first_connection(message):
+        calls.append(message)
+        if len(calls) == 1:
+            client.ws.shutdown()
+            return b""
+        return receive_action(message)
+
+    # reconnecting to the same process is transparent
+    with patch.object(client, "_receive_action", side_effect=drop_first_connection):
+        assert client.objects_count_remote() == 1
+
+    # reconnecting to another process raises instead of resending the message
+    client.server_instance_id = "another process"
+    calls.clear()
+    with patch.object(client, "_receive_action", side_effect=drop_first_connection):
+        with pytest.raises(ConnectionError):
+            client.objects_count_remote()
+
+    x_ptr.garbage_collect_data = False
+    client.ws.shutdown()
+    time.sleep(0.1)
+    client.remove_worker_from_local_worker_registry()
+    process_remote_worker.terminate()
+
+
+def test_websocket_worker_client_quota_survives_reconnection(hook, start_proc):
+    """Evaluates that a client keeps its usage, and its quota, when it reconnects,
+    and that another client of the same host has its own quota"""
+
+    kwargs = {"id": "fed_quota", "host": "localhost", "port": 8774, "hook": hook}
+    process_remote_worker = start_proc(WebsocketServerWorker, dict(kwargs, client_quota=800))
+
+    time.sleep(0.1)
+
+    client = WebsocketClientWorker(**kwargs)
+    x_ptr = torch.rand(100).send(client)
+    assert client.memory_usage_remote() == {"bytes": 400, "quota": 800}
+
+    # the client connects again with the same id
+    client.ws.shutdown()
+    client.ws = client._create_connection()
+    assert client.memory_usage_remote() == {"bytes": 400, "quota": 800}
+    with pytest.raises(QuotaExceededError):
+        torch.rand(200).send(client)
+
+    # (a client with the id of an existing one would share its connection)
+    other_client = WebsocketClientWorker(**dict(kwargs, id="fed_quota_other"))
+    assert other_client.client_id != client.client_id
+    assert other_client.memory_usage_remote() == {"bytes": 0, "quota": 800}
+    y_ptr = torch.rand(200).send(other_client)
+    assert other_client.memory_usage_remote() == {"bytes": 800, "quota": 800}
+
+    x_ptr.garbage_collect_data = False
+    y_ptr.garbage_collect_data = False
+    for worker in (client, other_client):
+        worker.ws.shutdown()
+        worker.remove_worker_from_local_worker_registry()
+    time.sleep(0.1)
+    process_remote_worker.terminate()
+
+
+def test_websocket_worker_processes_sharing_port(hook, start_proc):
+    """Evaluates that several server processes can serve clients on the same port"""
+
+    kwargs = {"id": "fed_reuse_port", "host": "localhost", "port": 8772, "hook": hook}
+    processes = [start_proc(WebsocketServerWorker, dict(kwargs, reuse_port=True)) for _ in range(2)]
+
+    # both processes must listen before the clients connect
+    time.sleep(0.5)
+
+    # each client has its own id, hence its own connection. The kernel spreads
+    # the connections between the processes, 16 of them all reach the same
+    # process with a probability of 2 ** -15
+    clients = [WebsocketClientWorker(**dict(kwargs, id=f"fed_reuse_port_{i}")) for i in range(16)]
+    assert len({client.server_instance_id for client in clients}) == 2
+    pointers = [torch.tensor([float(i)]).send(client) for i, client in enumerate(clients)]
+
+    # each client keeps talking to the process holding its objects
+    for i, ptr in enumerate(pointers):
+        assert (ptr.get() == torch.tensor([float(i)])).all()
+
+    for client in clients:
+        client.ws.shutdown()
+    time.sleep(0.1)
+    for client in clients:
+        client.remove_worker_from_local_worker_registry()
+    for process in processes:
+        process.terminate()